@@ -3,11 +3,15 @@ asdf: Python library for reading and writing Advanced Scientific
 Data Format (ASDF) files
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __all__ = [
     "AsdfFile",
     "ExternalArrayReference",
     "IntegerType",
     "Stream",
+    "StreamWriter",
     "ValidationError",
     "__version__",
     "config_context",
@@ -21,12 +25,59 @@ __all__ = [
 ]
 
 
-from ._asdf import AsdfFile
-from ._asdf import open_asdf as open
-from ._convenience import info
-from ._dump import dump, dumps, load, loads
 from ._version import version as __version__
-from .config import config_context, get_config
-from .exceptions import ValidationError
-from .tags.core import IntegerType, Stream
-from .tags.core.external_reference import ExternalArrayReference
+
+if TYPE_CHECKING:
+    from ._asdf import AsdfFile
+    from ._asdf import open_asdf as open
+    from ._convenience import info
+    from ._dump import dump, dumps, load, loads
+    from .config import config_context, get_config
+    from .exceptions import ValidationError
+    from .tags.core import IntegerType, Stream, StreamWriter
+    from .tags.core.external_reference import ExternalArrayReference
+
+
+# The public API is imported on first use so that "import asdf" does not
+# pay for numpy, yaml, the schema validator and the extension machinery.
+# Map of attribute name to (submodule, attribute in the submodule).
+_lazy_attributes = {
+    "AsdfFile": ("._asdf", "AsdfFile"),
+    "open": ("._asdf", "open_asdf"),
+    "info": ("._convenience", "info"),
+    "dump": ("._dump", "dump"),
+    "dumps": ("._dump", "dumps"),
+    "load": ("._dump", "load"),
+    "loads": ("._dump", "loads"),
+    "config_context": (".config", "config_context"),
+    "get_config": (".config", "get_config"),
+    "ValidationError": (".exceptions", "ValidationError"),
+    "IntegerType": (".tags.core", "IntegerType"),
+    "Stream": (".tags.core", "Stream"),
+    "StreamWriter": (".tags.core", "StreamWriter"),
+    "ExternalArrayReference": (".tags.core.external_reference", "ExternalArrayReference"),
+}
+
+
+def __getattr__(name):
+    if name in _lazy_attributes:
+        module_name, attribute_name = _lazy_attributes[name]
+        value = getattr(importlib.import_module(module_name, __name__), attribute_name)
+        globals()[name] = value
+        return value
+
+    # Submodules (asdf.schema, asdf.treeutil, ...) used to be available
+    # as attributes as a side effect of importing the public API.
+    if not name.startswith("__"):
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as err:
+            if err.name != f"{__name__}.{name}":
+                raise
+
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
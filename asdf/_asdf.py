@@ -26,13 +26,13 @@ from .exceptions import (
     AsdfWarning,
 )
 from .extension import Extension, ExtensionProxy, _serialization_context, get_cached_extension_manager
-from .search import AsdfSearchResult
+from .search import AsdfSearchResult, _SearchIndex
 from .tags.core import AsdfObject, ExtensionMetadata, HistoryEntry, Software
 from .util import NOT_SET
 
 if TYPE_CHECKING:
     from collections import dict_keys
-    from collections.abc import Mapping, MutableMapping, Sequence
+    from collections.abc import Iterator, Mapping, MutableMapping, Sequence
     from typing import Any
 
     from asdf.extension import ExtensionManager, SerializationContext
@@ -142,7 +142,11 @@ class AsdfFile:
 
         # A cache of tagged objects and their converted custom objects used when
         # a file is read with "lazy_tree=True". Used by lazy_nodes.
-        self._tagged_object_cache = lazy_nodes._TaggedObjectCache()
+        self._tagged_object_cache = lazy_nodes._TaggedObjectCache(get_config().lazy_tree_cache_size)
+
+        # Index of the tree used by AsdfFile.search(..., use_index=True),
+        # built on first use and discarded when the tree is modified.
+        self._search_index = None
 
         self._fd: GenericFile | None = None
         self._mode: FileMode | None = None
@@ -499,6 +503,53 @@ class AsdfFile:
 
     __copy__ = __deepcopy__ = copy
 
+    def __getstate__(self):
+        # The file handle, blocks and extensions are not pickled. Arrays
+        # in the tree that were read from a local file are pickled as
+        # references to their blocks (see NDArrayType.__getstate__) and
+        # lazy tree nodes are pickled as the equivalent dict or list.
+        # The block options (storage, compression, save_base) set for
+        # in-memory arrays in the tree are pickled with the arrays. Arrays
+        # read from a file are unpickled without their options.
+        state = self.__dict__.copy()
+        state["_array_options"] = self._get_array_options()
+        state["_fd"] = None
+        state["_closed"] = False
+        state["_external_asdf_by_uri"] = {}
+        state["_extension_manager"] = None
+        state["_search_index"] = None
+        state["_blocks"] = BlockManager(
+            uri=self._blocks._uri,
+            lazy_load=self._blocks._lazy_load,
+            memmap=self._blocks._memmap,
+            validate_checksums=self._blocks._validate_checksums,
+        )
+        del state["_plugin_extensions"]
+        return state
+
+    def __setstate__(self, state):
+        array_options = state.pop("_array_options", [])
+        self.__dict__.update(state)
+        self._plugin_extensions = self._process_plugin_extensions()
+        for array, options in array_options:
+            self._blocks.options.set_options(array, options)
+
+    def _get_array_options(self):
+        """
+        Get (array, options) pairs for the in-memory arrays in the tree
+        that have block options set.
+        """
+        import numpy as np
+
+        array_options = []
+        for node in treeutil.iter_tree(self._tree):
+            if not isinstance(node, np.ndarray):
+                continue
+            options = self._blocks.options.lookup_by_object(util.get_array_base(node))
+            if options is not None:
+                array_options.append((node, options))
+        return array_options
+
     @property
     def uri(self) -> str | None:
         """
@@ -561,6 +612,15 @@ class AsdfFile:
             self._external_asdf_by_uri[resolved_uri] = asdffile
         return asdffile
 
+    @property
+    def deduplicated_bytes(self) -> int:
+        """
+        The number of bytes of array data that the last call to `write_to`
+        or `update` did not write because the data was identical to another
+        block (see the ``deduplicate_blocks`` config option).
+        """
+        return self._blocks.deduplicated_bytes
+
     @property
     def tree(self) -> AsdfObject:
         """
@@ -576,6 +636,7 @@ class AsdfFile:
     @tree.setter
     def tree(self, tree: Mapping[TreeKey, Any]) -> None:
         self._tree = AsdfObject(tree)
+        self._search_index = None
 
     def keys(self) -> dict_keys[TreeKey, Any]:
         return self.tree.keys()
@@ -585,9 +646,11 @@ class AsdfFile:
 
     def __setitem__(self, key: TreeKey, value: Any) -> None:
         self.tree[key] = value
+        self._search_index = None
 
     def __delitem__(self, key: TreeKey) -> None:
         del self.tree[key]
+        self._search_index = None
 
     def __contains__(self, item: TreeKey) -> bool:
         return item in self.tree
@@ -704,6 +767,30 @@ class AsdfFile:
             - ``input``: Use the same compression as in the file read.
               If there is no prior file, acts as None.
 
+            - ``auto``: Choose the compression when the array is written
+              by compressing a sample of the data with each compression
+              type. Incompressible data is not compressed.
+
+            - ``filt``: Use filters (see below) and then another
+              compression (``zlib`` by default). Blocks written with
+              ``filters`` use this compression type.
+
+        **compression_kwargs
+            Keyword arguments passed to the compressor. For ``auto``
+            compression, these are passed to the function that chooses the
+            compression, where ``objective`` is one of ``"size"`` (the
+            smallest size), ``"speed"`` (the fastest decompression) or
+            ``"balanced"`` (the default, the fastest to read at
+            ``bandwidth`` bytes per second and decompress) and
+            ``candidates`` is a list of compression types to try.
+
+            ``filters`` is a list of filters applied (in order) to the
+            array data before it is compressed: ``"shuffle"`` and
+            ``"bitshuffle"`` group the bytes (or bits) of the elements,
+            ``"delta"`` stores the difference between consecutive elements
+            and ``{"name": "truncate", "bits": n}`` keeps only the ``n``
+            most significant mantissa bits of floating point data (which
+            loses precision).
         """
         self._blocks._set_array_compression(arr, compression, **compression_kwargs)
 
@@ -760,7 +847,75 @@ class AsdfFile:
         """
         return self._blocks._get_array_save_base(arr)
 
+    def iter_stream(self, path: str | Sequence[str | int], rows_per_chunk: int = 1) -> Iterator[NDArray]:
+        """
+        Iterate over the rows of a streamed array in chunks without reading
+        the whole streamed block into memory (this also works for files that
+        are not seekable, in which case the streamed block can only be read
+        once).
+
+        Parameters
+        ----------
+        path : str or list of str and int
+            The key (or parts of the path) pointing to the streamed array
+            in the tree.
+
+        rows_per_chunk : int, optional
+            The number of rows in each chunk (the last chunk can contain
+            fewer rows).
+
+        Yields
+        ------
+        chunk : numpy.ndarray
+            Array of shape ``(n, *row_shape)`` where ``n <= rows_per_chunk``.
+            The arrays might be read-only.
+
+        Examples
+        --------
+        >>> import numpy as np
+        >>> import asdf
+        >>> with asdf.StreamWriter("stream.asdf", {"stream": asdf.Stream([3], np.int64)}) as writer:
+        ...     writer.write_array(np.arange(30).reshape((10, 3)))
+        >>> with asdf.open("stream.asdf") as af:
+        ...     [chunk.shape for chunk in af.iter_stream("stream", rows_per_chunk=4)]
+        [(4, 3), (4, 3), (2, 3)]
+        """
+        import numpy as np
+
+        from .tags.core.ndarray import NDArrayType
+        from .tags.core.stream import _iter_rows
+
+        if rows_per_chunk < 1:
+            msg = f"rows_per_chunk must be positive, got {rows_per_chunk}"
+            raise ValueError(msg)
+
+        node = self.tree
+        for key in [path] if isinstance(path, str) else path:
+            node = node[key]
+
+        if isinstance(node, NDArrayType) and node._array is None and node._source == -1:
+            dtype = node._dtype
+            row_shape = tuple(node._shape[1:])
+            row_nbytes = dtype.itemsize * int(np.prod(row_shape))
+            if node._strides is not None and tuple(node._strides) != np.empty((0, *row_shape), dtype).strides:
+                msg = "Iterating a streamed array with strides is not supported"
+                raise ValueError(msg)
+            block = self._blocks.blocks[-1]
+            chunks = block.iter_data(chunk_size=max(row_nbytes * rows_per_chunk, 1))
+            yield from _iter_rows(chunks, dtype, row_shape, rows_per_chunk, node._offset)
+            return
+
+        if not isinstance(node, (np.ndarray, NDArrayType)) or self.get_array_storage(node) != "streamed":
+            msg = f"{path} is not a streamed array"
+            raise ValueError(msg)
+        # the array was already read
+        for i in range(0, len(node), rows_per_chunk):
+            yield node[i : i + rows_per_chunk]
+
     def _write_tree(self, tree: AsdfObject, fd: GenericFile, pad_blocks: float | bool) -> None:
+        # Writing updates the library and extension metadata in the tree
+        self._search_index = None
+
         fd.write(constants.ASDF_MAGIC)
         fd.write(b" ")
         fd.write(f"{self.file_format_version}".encode("ascii"))
@@ -819,7 +974,13 @@ class AsdfFile:
             tree = copy.copy(self._tree)
             tree["asdf_library"] = _io.get_asdf_library_info()
             if "history" in self._tree:
-                tree["history"] = copy.deepcopy(self._tree["history"])
+                # _update_extension_history only replaces the history
+                # mapping and its extensions list, so shallow copies are
+                # enough to leave the history in self._tree untouched
+                history = copy.copy(self._tree["history"])
+                if isinstance(history, (dict, lazy_nodes.AsdfDictNode)) and "extensions" in history:
+                    history["extensions"] = list(history["extensions"])
+                tree["history"] = history
 
             self._write_tree(tree, fd, pad_blocks)
             self._blocks.write(pad_blocks, include_block_index, write_checksums)
@@ -866,6 +1027,9 @@ class AsdfFile:
             - ``input``: Use the same compression as in the file read.
               If there is no prior file, acts as None
 
+            - ``auto``: Choose the compression for each block by compressing
+              a sample of the data (see `asdf.AsdfFile.set_array_compression`).
+
         compression_kwargs : dict, optional
             If provided, set this as the compression keyword arguments
             for all binary blocks in the file.
@@ -898,72 +1062,165 @@ class AsdfFile:
             if compression_kwargs is not NOT_SET:
                 config.all_array_compression_kwargs = compression_kwargs
 
-            fd = self._fd
+            fd = self._get_update_fd()
 
-            if fd is None:
-                msg = "Can not update, since there is no associated file"
-                raise ValueError(msg)
+            if version is not None:
+                self.version = version
 
-            if not fd.writable():
-                msg = (
-                    "Can not update, since associated file is read-only. Make "
-                    "sure that the AsdfFile was opened with mode='rw' and the "
-                    "underlying file handle is writable."
-                )
-                raise OSError(msg)
+            self._update(fd, pad_blocks, include_block_index, write_checksums)
 
-            if not fd.seekable():
-                msg = "Can not update, since associated file is not seekable"
-                raise OSError(msg)
+    def _update(
+        self,
+        fd: GenericFile,
+        pad_blocks: bool | float,
+        include_block_index: bool,
+        write_checksums: bool,
+        pad_tree: bool = False,
+    ) -> None:
+        # flush all pending memmap writes
+        if fd.can_memmap():
+            fd.flush_memmap()
 
-            if version is not None:
-                self.version = version
+        # padding after the tree leaves room for it to grow
+        tree_padding = (pad_blocks or True) if pad_tree else False
 
-            # flush all pending memmap writes
+        def rewrite(fd: GenericFile) -> None:
+            fd.seek(0)
+            self._serial_write(fd, pad_blocks or tree_padding, include_block_index, write_checksums)
+            fd.truncate()
             if fd.can_memmap():
-                fd.flush_memmap()
+                fd.close_memmap()
 
-            def rewrite(fd: GenericFile) -> None:
-                fd.seek(0)
-                self._serial_write(fd, pad_blocks, include_block_index, write_checksums)
-                fd.truncate()
-                if fd.can_memmap():
-                    fd.close_memmap()
+        # if we have no read blocks, we can just call write_to as no internal blocks are reused
+        if len(self._blocks.blocks) == 0:
+            rewrite(fd)
+            return
+
+        # if we have all external blocks, we can just call write_to as no internal blocks are reused
+        if get_config().all_array_storage == "external":
+            rewrite(fd)
+            return
 
-            # if we have no read blocks, we can just call write_to as no internal blocks are reused
-            if len(self._blocks.blocks) == 0:
-                rewrite(fd)
-                return
+        self._tree["asdf_library"] = _io.get_asdf_library_info()
+
+        # prepare block manager for writing
+        with self._blocks.write_context(fd, copy_options=False):
+            # write out tree to temporary buffer
+            tree_fd = generic_io.get_file(io.BytesIO(), mode="rw")
+            self._write_tree(self._tree, tree_fd, tree_padding)
+            new_tree_size = tree_fd.tell()
+
+            # update blocks
+            self._blocks.update(new_tree_size, pad_blocks, include_block_index, write_checksums)
+            end_of_file = fd.tell()
+
+        # now write the tree (and any padding after it)
+        fd.seek(0)
+        tree_fd.seek(0)
+        fd.write(tree_fd.read())
+        fd.clear(new_tree_size - fd.tell())
+        fd.flush()
+
+        # close memmap to trigger arrays to reload themselves
+        fd.seek(end_of_file)
+        fd.truncate()
+        if fd.can_memmap():
+            fd.close_memmap()
+
+    def append_blocks(
+        self,
+        pad_blocks: bool | float = False,
+        include_block_index: bool = True,
+        write_checksums: bool = True,
+    ) -> None:
+        """
+        Update the file on disk in place by appending new blocks.
 
-            # if we have all external blocks, we can just call write_to as no internal blocks are reused
-            if config.all_array_storage == "external":
-                rewrite(fd)
-                return
+        Unlike `update`, blocks already in the file are not moved or
+        rewritten. Arrays that were added to the tree (or whose data
+        or compression changed) are written as new blocks after the
+        last block, the block index is rewritten and the tree is
+        rewritten in the space before the first block. Arrays that
+        were never loaded are not read.
 
-            self._tree["asdf_library"] = _io.get_asdf_library_info()
+        Blocks that are no longer used remain in the file (use `update`
+        or `write_to` to remove them). Data that was read into memory (and
+        not memory mapped) is compared to the block checksum (compressing
+        it again for compressed blocks) and written as a new block if it
+        changed or the block has no checksum.
 
-            # prepare block manager for writing
-            with self._blocks.write_context(fd, copy_options=False):
-                # write out tree to temporary buffer
+        If the new tree does not fit before the first block (write the
+        file with ``pad_blocks`` to leave room for the tree to grow) or the
+        file has no blocks or a streamed block, the file is updated with
+        `update` and padding is added after the tree for later appends.
+
+        Parameters
+        ----------
+        pad_blocks : float or bool, optional
+            Add extra space after the new blocks. See `update`.
+
+        include_block_index : bool, optional
+            If `False`, don't include a block index at the end of the
+            file.  (Default: `True`)
+
+        write_checksums: bool, optional
+            Compute and write checksums for the new blocks.
+        """
+        fd = self._get_update_fd()
+
+        # flush all pending memmap writes
+        if fd.can_memmap():
+            fd.flush_memmap()
+
+        appended = False
+        tree_space = self._blocks.append_tree_space()
+        if tree_space is not None:
+            self._tree["asdf_library"] = _io.get_asdf_library_info()
+            with self._blocks.write_context(fd, copy_options=False, append=True):
                 tree_fd = generic_io.get_file(io.BytesIO(), mode="rw")
                 self._write_tree(self._tree, tree_fd, False)
                 new_tree_size = tree_fd.tell()
+                if new_tree_size <= tree_space:
+                    appended = self._blocks.append(pad_blocks, include_block_index, write_checksums)
+                    end_of_file = fd.tell()
 
-                # update blocks
-                self._blocks.update(new_tree_size, pad_blocks, include_block_index, write_checksums)
-                end_of_file = fd.tell()
+        if not appended:
+            # leave room for the tree to grow so the next append doesn't also need to update
+            self._update(fd, pad_blocks, include_block_index, write_checksums, pad_tree=True)
+            return
 
-            # now write the tree
-            fd.seek(0)
-            tree_fd.seek(0)
-            fd.write(tree_fd.read())
-            fd.flush()
+        # write the tree, filling the rest of the space before the first block
+        fd.seek(0)
+        tree_fd.seek(0)
+        fd.write(tree_fd.read())
+        fd.clear(tree_space - new_tree_size)
+        fd.flush()
+
+        fd.seek(end_of_file)
+        fd.truncate()
+        if fd.can_memmap():
+            fd.close_memmap()
+
+    def _get_update_fd(self) -> GenericFile:
+        fd = self._fd
+
+        if fd is None:
+            msg = "Can not update, since there is no associated file"
+            raise ValueError(msg)
+
+        if not fd.writable():
+            msg = (
+                "Can not update, since associated file is read-only. Make "
+                "sure that the AsdfFile was opened with mode='rw' and the "
+                "underlying file handle is writable."
+            )
+            raise OSError(msg)
 
-            # close memmap to trigger arrays to reload themselves
-            fd.seek(end_of_file)
-            fd.truncate()
-            if fd.can_memmap():
-                fd.close_memmap()
+        if not fd.seekable():
+            msg = "Can not update, since associated file is not seekable"
+            raise OSError(msg)
+
+        return fd
 
     @overload
     def write_to(
@@ -1044,6 +1301,9 @@ class AsdfFile:
             - ``input``: Use the same compression as in the file read.
               If there is no prior file, acts as None.
 
+            - ``auto``: Choose the compression for each block by compressing
+              a sample of the data (see `asdf.AsdfFile.set_array_compression`).
+
         compression_kwargs : dict, optional
             If provided, set this as the compression keyword arguments
             for all binary blocks in the file.
@@ -1186,6 +1446,8 @@ class AsdfFile:
 
             self.tree["history"].append(entry)
 
+        self._search_index = None
+
     def get_history_entries(self) -> list[Any]:
         """
         Get a list of history entries from the file object.
@@ -1316,6 +1578,8 @@ class AsdfFile:
         type_: str | type | NotSetType = NOT_SET,
         value: str | Any | NotSetType = NOT_SET,
         filter_: FilterFn | None = None,
+        *,
+        use_index: bool = False,
     ) -> AsdfSearchResult:
         """
         Search this file's tree.
@@ -1353,14 +1617,39 @@ class AsdfFile:
             and returns True to retain the node, or False to remove it from
             the search results.
 
+        use_index : bool, optional
+            If True, resolve key, type and value queries (including those
+            of chained searches on the result) with an index of the tree
+            instead of traversing every node.  The index is built by the
+            first indexed search and reused by later ones.  It is discarded
+            when the tree is replaced, when top-level keys are set or deleted
+            through this `AsdfFile`, when the file is written, and by
+            `AsdfSearchResult.replace`.  The index does not detect any
+            other modification: after a nested node is changed in place
+            (for example ``af.tree["a"]["b"] = 1``) indexed searches return
+            stale results until `AsdfFile.clear_search_index` is called.
+
         Returns
         -------
         asdf.search.AsdfSearchResult
             the result of the search
         """
-        result = AsdfSearchResult(["root"], self.tree)
+        if use_index:
+            if self._search_index is None or self._search_index.stale or self._search_index.root is not self.tree:
+                self._search_index = _SearchIndex(["root"], self.tree)
+            result = AsdfSearchResult(["root"], self.tree, index=self._search_index)
+        else:
+            result = AsdfSearchResult(["root"], self.tree)
         return result.search(key=key, type_=type_, value=value, filter_=filter_)
 
+    def clear_search_index(self) -> None:
+        """
+        Discard the index of the tree used by ``AsdfFile.search(..., use_index=True)``.
+        The index will be rebuilt by the next indexed search.  Call this
+        after modifying nested nodes of the tree in place.
+        """
+        self._search_index = None
+
     # This function is called from within yamlutil methods to create
     # a context when one isn't explicitly passed in.
     def _create_serialization_context(self, operation=_serialization_context.BlockAccess.NONE):
@@ -15,6 +15,9 @@ Internally, this submodule is broken up into:
         - ``writer``:  ``WriteBlock`` and ``write_blocks``
         - ``callback``: ``DataCallback`` for reading block data
         - ``external``: ``ExternalBlockCache`` for reading external blocks
+        - ``shared``: ``SharedBlock`` for decompressing blocks into shared memory
+        - ``cache``: ``BlockCache`` for limiting the cached block data
+        - ``disk_cache``: ``DiskBlockCache`` for caching decompressed blocks on disk
         - ``options``: ``Options`` controlling block storage
     - high-level:
         - ``manager``: ``Manager`` and associated classes
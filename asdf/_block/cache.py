@@ -0,0 +1,122 @@
+"""
+``BlockCache`` limits the amount of decoded (read and decompressed) block
+data that an `asdf.AsdfFile` keeps in memory. Each ``ReadBlock`` that
+caches its data (see ``ReadBlock.cached_data``) adds itself to the cache
+of the ``Manager`` that read it. When the cached data exceeds the
+``block_cache_size`` config option the least recently used blocks are
+evicted: the block drops its cached data and tells the arrays that use the
+data (see ``ReadBlock._add_consumer``) to release it. The data is read again
+(through the block's lazy data callback) the next time it is used.
+
+Only data that can be read again is cached this way (blocks that were
+lazily loaded and are not memory mapped). To make sure evicting data never
+discards changes, this data is read-only when the cache size is limited.
+"""
+
+from __future__ import annotations
+
+import collections
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from asdf._block.reader import ReadBlock
+
+
+class BlockCache:
+    """
+    Least recently used cache of decoded block data with a size limit
+    (in bytes, `None` for no limit).
+    """
+
+    def __init__(self, max_size: int | None = None):
+        self.max_size = max_size
+        self.size = 0
+        # id(block) -> (block, size of the cached data)
+        self._blocks: collections.OrderedDict[int, tuple[ReadBlock, int]] = collections.OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __getstate__(self):
+        # cached blocks are not copied
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(state["max_size"])
+
+    @property
+    def limited(self) -> bool:
+        """
+        `True` if the cache has a size limit.
+        """
+        return self.max_size is not None
+
+    @property
+    def stats(self) -> dict[str, int | None]:
+        """
+        Cache counters: hits, misses, evictions, the number of cached
+        blocks and the size (and maximum size) of the cached data.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "blocks": len(self._blocks),
+                "size": self.size,
+                "max_size": self.max_size,
+            }
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __contains__(self, block: ReadBlock) -> bool:
+        return id(block) in self._blocks
+
+    def hit(self, block: ReadBlock) -> None:
+        """
+        Record that the cached data for ``block`` was used.
+        """
+        with self._lock:
+            if id(block) in self._blocks:
+                self.hits += 1
+                self._blocks.move_to_end(id(block))
+
+    def add(self, block: ReadBlock, size: int) -> None:
+        """
+        Record that the data for ``block`` (of ``size`` bytes) was read
+        and cached, evicting the least recently used blocks if the cache
+        is over the size limit.
+        """
+        with self._lock:
+            self.misses += 1
+            self._remove(block)
+            self._blocks[id(block)] = (block, size)
+            self.size += size
+            if self.max_size is None:
+                return
+            # evict until the cache fits (the newest block is never evicted)
+            while self.size > self.max_size and len(self._blocks) > 1:
+                _, (evicted, _) = next(iter(self._blocks.items()))
+                self._remove(evicted)
+                self.evictions += 1
+                evicted._evict()
+
+    def discard(self, block: ReadBlock) -> None:
+        """
+        Remove ``block`` from the cache (without evicting its data).
+        """
+        with self._lock:
+            self._remove(block)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._blocks.clear()
+            self.size = 0
+
+    def _remove(self, block: ReadBlock) -> None:
+        item = self._blocks.pop(id(block), None)
+        if item is not None:
+            self.size -= item[1]
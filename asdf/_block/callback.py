@@ -17,10 +17,16 @@ extension code.
 
 from __future__ import annotations
 
+import threading
 import weakref
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+
+from asdf import generic_io
+
+from . import io as bio
 
 if TYPE_CHECKING:
+    from asdf._block.io import BlockHeader
     from asdf._block.manager import ReadBlocks
     from asdf.typing import ByteArray1D
 
@@ -49,3 +55,66 @@ class DataCallback:
     def _reassign(self, index: int, read_blocks: ReadBlocks) -> None:
         self._index = index
         self._read_blocks_ref = weakref.ref(read_blocks)
+
+    def _get_file_data_callback(self) -> FileDataCallback | None:
+        """
+        Get a `FileDataCallback` that reads the same block (or `None`
+        if the block is not in a local file opened read-only).
+        """
+        read_blocks = self._read_blocks_ref()
+        if read_blocks is None:
+            return None
+        return read_blocks[self._index]._get_file_data_callback()
+
+
+class FileDataCallback:
+    """
+    A callable object, like `DataCallback`, that reads data from an
+    ASDF block in a local file by opening the file (by path) when the
+    data is first needed.
+
+    Unlike `DataCallback` this can be pickled, it is used to send arrays
+    to other processes without copying the array data.
+    """
+
+    def __init__(self, path: str, offset: int, header: BlockHeader, memmap: bool, validate_checksum: bool):
+        self._path = path
+        # offset of the block header (after the block magic)
+        self._offset = offset
+        self._header = header
+        self._memmap = memmap
+        self._validate_checksum = validate_checksum
+        self._cached_data = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_cached_data"] = None
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __call__(self, _attr: str | None = None) -> ByteArray1D:
+        if _attr in (None, "data"):
+            return self._read()
+        if _attr == "cached_data":
+            with self._lock:
+                if self._cached_data is None:
+                    self._cached_data = self._read()
+            return self._cached_data
+        if _attr == "header":
+            return self._header  # pyrefly: ignore [bad-return]
+        raise AttributeError(f"_attr {_attr} is not supported")
+
+    def _get_file_data_callback(self) -> FileDataCallback:
+        return self
+
+    def _read(self) -> ByteArray1D:
+        with generic_io.get_file(self._path, mode="r") as fd:
+            if bio.read_block_header(fd, self._offset) != self._header:
+                msg = f"Block at {self._offset} in {self._path} has changed since the array was pickled"
+                raise OSError(msg)
+            return bio.read_block_data_at(fd, self._header, self._validate_checksum, fd.tell(), memmap=self._memmap)
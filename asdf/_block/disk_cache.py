@@ -0,0 +1,165 @@
+"""
+When the ``block_cache_directory`` config option is set, compressed blocks
+read from local files are decompressed into files in that directory and
+memory mapped from there. Later reads of the same block (by any process
+and any `asdf.AsdfFile`) memory map the cached file instead of
+decompressing the block again.
+
+Cached files are named after the identity of the file and block (see
+``io.block_identity``) so a modified file never uses stale data. When
+the total size of the cached files exceeds ``block_cache_directory_size``
+the least recently used files (by modification time, which is updated each
+time a file is used) are deleted.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from asdf import _compression as mcompression
+from asdf.config import get_config
+
+from . import io as bio
+
+if TYPE_CHECKING:
+    from asdf._block.io import BlockHeader
+    from asdf.generic_io import GenericFile
+    from asdf.typing import ByteArray1D
+
+_SUFFIX = ".block"
+
+
+class DiskBlockCache:
+    """
+    A directory of decompressed block data limited to ``max_size`` bytes.
+    """
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"asdf-{key}{_SUFFIX}")
+
+    def load(self, fd: GenericFile, header: BlockHeader, validate_checksum: bool, offset: int) -> ByteArray1D | None:
+        """
+        Memory map the decompressed data for a compressed block from the
+        cache, decompressing the block into the cache if needed.
+
+        Returns `None` if the block can't be cached (``fd`` is not a local
+        file, the block is not compressed or empty, or the cache directory
+        can't be written) in which case the caller should read the block
+        normally.
+        """
+        data_size = header["data_size"]
+        if not mcompression.validate(header["compression"]) or not data_size:
+            return None
+        if (key := bio.block_identity(fd, header, offset)) is None:
+            return None
+        path = self.path(key)
+
+        data = self._open(path, data_size)
+        if data is not None:
+            return data
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        except OSError:
+            return None
+        try:
+            with os.fdopen(tmp_fd, "wb") as f:
+                f.truncate(data_size)
+            out = np.memmap(tmp_path, dtype="uint8", mode="r+", shape=(data_size,))
+            try:
+                bio.read_block_data_at(fd, header, validate_checksum, offset, out=out)
+                out.flush()
+            finally:
+                del out
+            # move the complete file into place so other readers never
+            # see partially written data
+            os.replace(tmp_path, path)
+        except BaseException as err:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            if isinstance(err, OSError):
+                return None
+            raise
+
+        self._evict(keep=path)
+        return self._open(path, data_size)
+
+    def _open(self, path: str, data_size: int) -> ByteArray1D | None:
+        try:
+            if os.path.getsize(path) != data_size:
+                return None
+            # mark the file as recently used
+            os.utime(path)
+            return np.memmap(path, dtype="uint8", mode="r", shape=(data_size,))
+        except OSError:
+            # missing (or just evicted by another process)
+            return None
+
+    def _evict(self, keep: str | None = None) -> None:
+        """
+        Delete the least recently used files until the cache fits.
+        """
+        with self._lock:
+            entries = []
+            try:
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if entry.name.startswith("asdf-") and entry.name.endswith(_SUFFIX):
+                            try:
+                                stat = entry.stat()
+                            except OSError:
+                                continue
+                            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+            except OSError:
+                return
+            size = sum(entry[1] for entry in entries)
+            for _, entry_size, path in sorted(entries):
+                if size <= self.max_size:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError:
+                    # in use (on windows) or removed by another process
+                    continue
+                size -= entry_size
+
+
+_caches: dict[tuple[str, int], DiskBlockCache] = {}
+
+
+def get_disk_cache() -> DiskBlockCache | None:
+    """
+    Get the `DiskBlockCache` for the current config (or `None` if
+    the ``block_cache_directory`` option is not set).
+    """
+    cfg = get_config()
+    if cfg.block_cache_directory is None:
+        return None
+    key = (os.path.abspath(cfg.block_cache_directory), cfg.block_cache_directory_size)
+    if key not in _caches:
+        _caches[key] = DiskBlockCache(*key)
+    return _caches[key]
@@ -12,6 +12,7 @@ from __future__ import annotations
 
 import enum
 import os
+import threading
 import urllib
 import urllib.request
 from typing import TYPE_CHECKING, Final, Literal
@@ -39,10 +40,28 @@ UseInternal: Final = Literal[_USE_INTERNAL_TYPE.USE_INTERNAL]
 
 class ExternalBlockCache:
     def __init__(self):
+        self._lock = threading.RLock()
         self.clear()
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
     def load(
         self, base_uri: str | None, uri: str, memmap: bool = False, validate_checksums: bool = False
+    ) -> ByteArray1D | UseInternal:
+        # hold the lock so an external file loaded by several threads
+        # is only opened once
+        with self._lock:
+            return self._load(base_uri, uri, memmap, validate_checksums)
+
+    def _load(
+        self, base_uri: str | None, uri: str, memmap: bool, validate_checksums: bool
     ) -> ByteArray1D | UseInternal:
         key = util.get_base_uri(uri)
         if key not in self._cache:
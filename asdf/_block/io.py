@@ -13,6 +13,7 @@ import typing
 import weakref
 from typing import TYPE_CHECKING, Any, TypedDict
 
+import numpy as np
 import yaml
 
 from asdf import _compression as mcompression
@@ -59,6 +60,31 @@ def calculate_block_checksum(data: Buffer) -> bytes:
     return m.digest()
 
 
+def block_data_matches(data: ByteArray1D, header: BlockHeader) -> bool:
+    """
+    Check if ``data`` (decompressed block data) matches the checksum in
+    the block ``header``. Compressed data is compressed again (with the
+    default options) to compute the checksum. Returns `False` if the
+    header has no checksum.
+    """
+    if not any(header["checksum"]) or data.nbytes != header["data_size"]:
+        return False
+    compression = mcompression.validate(header["compression"])
+    if compression is None:
+        return calculate_block_checksum(data) == header["checksum"]
+
+    class _ChecksumFile:
+        def __init__(self):
+            self.md5 = hashlib.new("md5", usedforsecurity=False)
+
+        def write(self, data):
+            self.md5.update(data)
+
+    cf = _ChecksumFile()
+    mcompression.compress(cf, data, compression)  # pyrefly: ignore [bad-argument-type]
+    return cf.md5.digest() == header["checksum"]
+
+
 def validate_block_header(header: BlockHeader) -> BlockHeader:
     """
     Check that they key value pairs in header contain consistent
@@ -77,8 +103,8 @@ def validate_block_header(header: BlockHeader) -> BlockHeader:
     """
     compression = mcompression.validate(header["compression"])
     if header["flags"] & constants.BLOCK_FLAG_STREAMED:
-        if compression is not None:
-            msg = "Compression set on a streamed block."
+        if compression is not None and not mcompression.is_framed(compression):
+            msg = f"Compression set on a streamed block must be one of {mcompression.FRAMED_COMPRESSIONS}."
             raise ValueError(msg)
     else:
         if compression is None and header["used_size"] != header["data_size"]:
@@ -183,7 +209,23 @@ def read_block_data(
     compression = mcompression.validate(header["compression"])
     has_checksum = any(b != 0 for b in header["checksum"])
 
-    if compression:
+    if streamed and compression:
+        # the size of a compressed streamed block might not be known
+        # so decompress it one frame at a time
+        # (data_size, if set, is only used to preallocate the array
+        # as frames might have been appended after it was written)
+        data = np.empty(header["data_size"], np.uint8)
+        position = 0
+        extra_frames = []
+        for frame in iter_streamed_block_data(fd, header, validate_checksum):
+            if extra_frames or position + frame.size > data.size:
+                extra_frames.append(frame)
+                continue
+            data[position : position + frame.size] = frame
+            position += frame.size
+        if extra_frames or position != data.size:
+            data = np.concatenate([data[:position], *extra_frames])
+    elif compression:
         if validate_checksum and has_checksum:
             cmp_data = fd.read(header["used_size"])
             # Fast-forward first so if we raise an exception the file pointer is still correct
@@ -221,6 +263,217 @@ def read_block_data(
     return data
 
 
+def read_block_data_at(
+    fd: GenericFile,
+    header: BlockHeader,
+    validate_checksum: bool,
+    offset: int,
+    memmap: bool = False,
+    out: ByteArray1D | None = None,
+) -> ByteArray1D:
+    """
+    Read (or memory map) data for an ASDF block without using (or
+    changing) the file position, so blocks can be read from several
+    threads at once.
+
+    Parameters
+    ----------
+    fd : file or generic_io.GenericIO
+        Seekable file to read.
+
+    header : dict
+        ASDF block header dictionary (as read from `read_block_header`).
+
+    validate_checksum: bool
+        If `True`, raise an exception if the checksum in the block header
+        doesn't match the checksum computed from the block body.
+
+    offset : int
+        Offset within the file where the start of the ASDF block data
+        is located.
+
+    memmap : bool, optional, default False
+        Memory map the block data (see `read_block_data`).
+
+    out : ndarray or None, optional
+        For a compressed block, a one-dimensional uint8 array of
+        ``data_size`` bytes to decompress the data into.
+
+    Returns
+    -------
+    data : ndarray or memmap
+        A one-dimensional ndarray of dtype uint8
+
+    Raises
+    ------
+    ValueError
+        If `validate_checksum` is set and the header checksum doesn't match
+        the checksum computed from the block data.
+    """
+    compression = mcompression.validate(header["compression"])
+    if header["flags"] & constants.BLOCK_FLAG_STREAMED or (memmap and not compression and fd.can_memmap()):
+        # streamed blocks extend to the end of the file and memory mapping
+        # may need to map the file, both use the file position
+        with fd._lock:
+            position = fd.tell()
+            try:
+                data = read_block_data(fd, header, validate_checksum, offset=offset, memmap=memmap)
+            finally:
+                fd.seek(position)
+        if out is not None:
+            # a compressed streamed block
+            if data.size != out.size:
+                msg = "Decompressed data wrong size"
+                raise ValueError(msg)
+            out[:] = data
+            return out
+        return data
+
+    data = fd.read_into_array_at(offset, header["used_size"])
+    if validate_checksum and any(b != 0 for b in header["checksum"]):
+        checksum = calculate_block_checksum(data)
+        if header["checksum"] != checksum:
+            msg = f"Block at {offset} does not match given checksum"
+            raise ValueError(msg)
+
+    if compression:
+        data = mcompression.decompress(
+            generic_io.get_file(io.BytesIO(data)), header["used_size"], header["data_size"], compression, out=out
+        )
+    return data
+
+
+def iter_streamed_block_data(
+    fd: GenericFile,
+    header: BlockHeader,
+    validate_checksum: bool = False,
+    offset: int | None = None,
+    chunk_size: int | None = None,
+) -> Iterator[ByteArray1D]:
+    """
+    Read the data of a streamed block (which extends to the end of the
+    file) in chunks so the block can be processed with bounded memory
+    (this does not require a seekable file). Compressed (framed) data is
+    decompressed one frame at a time.
+
+    Parameters
+    ----------
+    fd : file or generic_io.GenericIO
+        File to read.
+
+    header : dict
+        ASDF block header dictionary (as read from `read_block_header`).
+
+    validate_checksum: bool, optional
+        If `True`, raise an exception (after the last chunk is read) if the
+        checksum in the block header doesn't match the checksum computed
+        from the block body. Has no effect if the header doesn't contain
+        a checksum.
+
+    offset : int, optional
+        Offset within the (seekable) file where the start of the ASDF block
+        data is located. If provided, the data is read without using (or
+        changing) the file position, otherwise reading starts at the
+        current file position.
+
+    chunk_size : int, optional
+        Number of bytes to read at once when ``offset`` is provided,
+        defaults to the file block size.
+
+    Yields
+    ------
+    data : ndarray
+        One-dimensional ndarrays of dtype uint8
+    """
+    compression = mcompression.validate(header["compression"])
+
+    if offset is None:
+        if fd.seekable():
+            offset = fd.tell()
+        blocks = fd.read_blocks(-1)
+    else:
+        blocks = _read_blocks_at(fd, offset, chunk_size or fd.block_size)
+    if validate_checksum and any(b != 0 for b in header["checksum"]):
+        blocks = _validate_blocks_checksum(blocks, header["checksum"], offset)
+
+    if compression:
+        yield from mcompression.decompress_frames(blocks, compression)
+    else:
+        for block in blocks:
+            yield np.frombuffer(block, np.uint8)
+
+
+def _read_blocks_at(fd: GenericFile, offset: int, chunk_size: int) -> Iterator[bytes]:
+    while True:
+        with fd._lock:
+            position = fd.tell()
+            fd.seek(offset)
+            try:
+                block = fd.read(chunk_size)
+            finally:
+                fd.seek(position)
+        if not block:
+            return
+        offset += len(block)
+        yield block
+
+
+def _validate_blocks_checksum(blocks: Iterator[bytes], checksum: bytes, offset: int | None) -> Iterator[bytes]:
+    m = hashlib.new("md5", usedforsecurity=False)
+    for block in blocks:
+        m.update(block)
+        yield block
+    if m.digest() != checksum:
+        msg = f"Block at {offset} does not match given checksum"
+        raise ValueError(msg)
+
+
+def block_identity(fd: GenericFile, header: BlockHeader, offset: int) -> str | None:
+    """
+    Make a key that identifies the data of a block in a local file (for
+    caching decompressed data outside of the `asdf.AsdfFile` that read it).
+
+    The key is a hash of the identity of the file (device, inode, size and
+    modification time), the offset of the block data and the block header
+    so it changes if the file is modified.
+
+    Parameters
+    ----------
+    fd : generic_io.GenericIO
+        File containing the block.
+
+    header : dict
+        ASDF block header dictionary (as read from `read_block_header`).
+
+    offset : int
+        Offset within the file where the start of the ASDF block data
+        is located.
+
+    Returns
+    -------
+    key : str or None
+        Hexadecimal hash or `None` if ``fd`` is not a local file.
+    """
+    if not isinstance(fd, generic_io.RealFile):
+        return None
+    try:
+        stat = os.fstat(fd._fd.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+    key = (
+        stat.st_dev,
+        stat.st_ino,
+        stat.st_size,
+        stat.st_mtime_ns,
+        offset,
+        header["compression"],
+        header["checksum"],
+        header["used_size"],
+        header["data_size"],
+    )
+    return hashlib.sha1(repr(key).encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
 def read_block(
     fd: GenericFile, validate_checksum: bool, offset: int | None = None, memmap: bool = False, lazy_load: bool = False
 ) -> tuple[int | None, BlockHeader, int | None, ByteArray1D | BlockDataCallback]:
@@ -285,21 +538,64 @@ def read_block(
             if fd is None or fd.is_closed():
                 msg = "ASDF file has already been closed. Can not get the data."
                 raise OSError(msg)
-            position = fd.tell()
-            data = read_block_data(fd, header, validate_checksum, offset=data_offset, memmap=memmap)
-            fd.seek(position)
-            return data
+            return read_block_data_at(fd, header, validate_checksum, data_offset, memmap=memmap)
 
         data = callback
         if header["flags"] & constants.BLOCK_FLAG_STREAMED:
             fd.seek(0, os.SEEK_END)
         else:
             fd.fast_forward(header["allocated_size"])
+    elif lazy_load and header["flags"] & constants.BLOCK_FLAG_STREAMED:
+        # a streamed block is the end of the (non-seekable) file so
+        # reading it can wait until the data is needed
+        data = StreamedBlockCallback(fd, header, validate_checksum)
     else:
         data = read_block_data(fd, header, validate_checksum, offset=None, memmap=memmap)
     return offset, header, data_offset, data
 
 
+class StreamedBlockCallback:
+    """
+    A callable that reads the data of a streamed block at the current
+    position of a non-seekable file when the data is first needed.
+
+    As the data can only be read once, the data is either read (and kept)
+    by calling this object or iterated (without keeping it) with `iter_data`.
+    """
+
+    def __init__(self, fd: GenericFile, header: BlockHeader, validate_checksum: bool):
+        self._fd_ref = weakref.ref(fd)
+        self._header = header
+        self._validate_checksum = validate_checksum
+        self._data: ByteArray1D | None = None
+        self._consumed = False
+
+    def _get_fd(self) -> GenericFile:
+        fd = self._fd_ref()
+        if fd is None or fd.is_closed():
+            msg = "ASDF file has already been closed. Can not get the data."
+            raise OSError(msg)
+        if self._consumed:
+            msg = "The streamed block was already iterated and can not be read again"
+            raise OSError(msg)
+        self._consumed = True
+        return fd
+
+    def __call__(self) -> ByteArray1D:
+        if self._data is None:
+            self._data = read_block_data(self._get_fd(), self._header, self._validate_checksum)
+        return self._data
+
+    def iter_data(self) -> Iterator[ByteArray1D]:
+        """
+        Iterate over the block data (see `iter_streamed_block_data`).
+        """
+        if self._data is not None:
+            yield self._data
+            return
+        yield from iter_streamed_block_data(self._get_fd(), self._header, self._validate_checksum)
+
+
 def generate_write_header(
     data: ByteArray1D,
     stream: bool = False,
@@ -307,6 +603,7 @@ def generate_write_header(
     padding: bool | float | None = False,
     fs_block_size: int = 1,
     write_checksum: bool = True,
+    data_checksum: bytes | None = None,
     **header_kwargs: Unpack[BlockHeader],
 ) -> tuple[BlockHeader, io.BytesIO | None, int]:
     """
@@ -344,6 +641,11 @@ def generate_write_header(
         Compute and write the checksum of the block data.
         If disabled then the checksum field is set to 0.
 
+    data_checksum : bytes, optional
+        The checksum of ``data`` (see `calculate_block_checksum`) if it
+        was already computed. Used (instead of computing the checksum
+        again) if the data is not compressed.
+
     **header_kwargs : dict, optional
         Block header settings that will be read, updated, and used
         to generate the binary block header representation by packing
@@ -363,9 +665,41 @@ def generate_write_header(
         The number of padding bytes that must be written after
         the block data.
     """
+    _prepare_write_header(data, stream, header_kwargs)
+
+    if header_kwargs["compression"] == b"\0\0\0\0":
+        used_size = header_kwargs["data_size"]
+        buff = None
+    else:
+        buff = io.BytesIO()
+        mcompression.compress(buff, data, header_kwargs["compression"], config=compression_kwargs)
+        used_size = buff.tell()
+
+    if stream or not write_checksum:
+        checksum = None
+    elif buff is not None:
+        checksum = calculate_block_checksum(buff.getbuffer())
+    elif data_checksum is not None:
+        checksum = data_checksum
+    else:
+        checksum = calculate_block_checksum(data)
+
+    padding_bytes = _finish_write_header(header_kwargs, stream, used_size, checksum, padding, fs_block_size)
+    return header_kwargs, buff, padding_bytes
+
+
+def _prepare_write_header(data: ByteArray1D, stream: bool, header_kwargs: BlockHeader) -> None:
+    """
+    Check the data and compression and set the flags, data_size
+    and compression in ``header_kwargs`` (see `generate_write_header`).
+    """
     if data.ndim != 1 or data.dtype != "uint8":
         msg = "Data must be of ndim==1 and dtype==uint8"
         raise ValueError(msg)
+    compression = header_kwargs.get("compression")
+    if stream and mcompression.validate(compression) is not None and not mcompression.is_framed(compression):
+        msg = f"Compression for a streamed block must be one of {mcompression.FRAMED_COMPRESSIONS}"
+        raise ValueError(msg)
     if stream:
         header_kwargs["flags"] = header_kwargs.get("flags", 0) | constants.BLOCK_FLAG_STREAMED
         header_kwargs["data_size"] = 0
@@ -375,13 +709,20 @@ def generate_write_header(
 
     header_kwargs["compression"] = mcompression.to_compression_header(header_kwargs.get("compression", None))
 
-    if header_kwargs["compression"] == b"\0\0\0\0":
-        used_size = header_kwargs["data_size"]
-        buff = None
-    else:
-        buff = io.BytesIO()
-        mcompression.compress(buff, data, header_kwargs["compression"], config=compression_kwargs)
-        used_size = buff.tell()
+
+def _finish_write_header(
+    header_kwargs: BlockHeader,
+    stream: bool,
+    used_size: int,
+    checksum: bytes | None,
+    padding: bool | float | None,
+    fs_block_size: int,
+) -> int:
+    """
+    Set the sizes and checksum in ``header_kwargs`` once the size of the
+    (compressed) data is known and return the number of padding bytes
+    (see `generate_write_header`).
+    """
     if stream:
         header_kwargs["used_size"] = 0
         header_kwargs["allocated_size"] = 0
@@ -390,12 +731,7 @@ def generate_write_header(
         padding = util.calculate_padding(used_size, padding, fs_block_size)
         header_kwargs["allocated_size"] = header_kwargs.get("allocated_size", used_size + padding)
 
-    if stream or not write_checksum:
-        header_kwargs["checksum"] = b"\0" * 16
-    elif buff is not None:
-        header_kwargs["checksum"] = calculate_block_checksum(buff.getbuffer())
-    else:
-        header_kwargs["checksum"] = calculate_block_checksum(data)
+    header_kwargs["checksum"] = b"\0" * 16 if checksum is None else checksum
 
     if header_kwargs["allocated_size"] < header_kwargs["used_size"]:
         msg = (
@@ -403,8 +739,7 @@ def generate_write_header(
             f"allocated size {header_kwargs['allocated_size']}",
         )
         raise RuntimeError(msg)
-    padding_bytes = header_kwargs["allocated_size"] - header_kwargs["used_size"]
-    return header_kwargs, buff, padding_bytes
+    return header_kwargs["allocated_size"] - header_kwargs["used_size"]
 
 
 def write_block(
@@ -415,11 +750,16 @@ def write_block(
     compression_kwargs: dict[str, Any] | None = None,
     padding: bool | float | None = False,
     write_checksum: bool = True,
+    data_checksum: bytes | None = None,
     **header_kwargs: Unpack[BlockHeader],
 ) -> BlockHeader:
     """
     Write an ASDF block.
 
+    Compressed (non-streamed) blocks written to a seekable file are
+    compressed directly into the file (see ``_write_compressed_block``)
+    so the compressed data is never held in memory.
+
     Parameters
     ----------
     fd : file or generic_io.GenericIO
@@ -442,6 +782,10 @@ def write_block(
         Compute and write the checksum of the block data.
         If disabled then the checksum field is set to 0.
 
+    data_checksum : bytes, optional
+        The checksum of ``data`` if it was already computed.
+        See `generate_write_header`.
+
     **header_kwargs : dict
         Block header settings. See `generate_write_header`.
 
@@ -452,17 +796,28 @@ def write_block(
         The ASDF block header as unpacked from the `BLOCK_HEADER` used
         for writing.
     """
-    header_dict, buff, padding_bytes = generate_write_header(
-        data, stream, compression_kwargs, padding, fd.block_size, write_checksum, **header_kwargs
-    )
-    header_bytes = BLOCK_HEADER.pack(**header_dict)
-
     if offset is not None:
         if fd.seekable():
             fd.seek(offset)
         else:
             msg = "write_block received offset for non-seekable file"
             raise ValueError(msg)
+
+    # compressed data is written directly to seekable files (when the
+    # size of the block is not fixed by allocated_size)
+    if (
+        not stream
+        and mcompression.validate(header_kwargs.get("compression")) is not None
+        and "allocated_size" not in header_kwargs
+        and fd.seekable()
+    ):
+        return _write_compressed_block(fd, data, compression_kwargs, padding, write_checksum, header_kwargs)
+
+    header_dict, buff, padding_bytes = generate_write_header(
+        data, stream, compression_kwargs, padding, fd.block_size, write_checksum, data_checksum, **header_kwargs
+    )
+    header_bytes = BLOCK_HEADER.pack(**header_dict)
+
     fd.write(struct.pack(b">H", len(header_bytes)))
     fd.write(header_bytes)
     if buff is None:  # data is uncompressed
@@ -473,6 +828,60 @@ def write_block(
     return header_dict
 
 
+class _BlockWriter:
+    """
+    File-like object that writes compressed data to a file counting the
+    bytes written and (optionally) computing their checksum.
+    """
+
+    def __init__(self, fd: GenericFile, checksum: bool):
+        self._fd = fd
+        self._md5 = hashlib.new("md5", usedforsecurity=False) if checksum else None
+        self.size = 0
+
+    def write(self, data: Buffer) -> None:
+        self._fd.write(data)
+        if self._md5 is not None:
+            self._md5.update(data)
+        self.size += memoryview(data).nbytes
+
+    def checksum(self) -> bytes | None:
+        return None if self._md5 is None else self._md5.digest()
+
+
+def _write_compressed_block(
+    fd: GenericFile,
+    data: ByteArray1D,
+    compression_kwargs: dict[str, Any] | None,
+    padding: bool | float | None,
+    write_checksum: bool,
+    header_kwargs: BlockHeader,
+) -> BlockHeader:
+    """
+    Write a compressed block to a seekable file without holding the
+    compressed data in memory.
+
+    The compressed data is written after a placeholder header (the
+    header has a fixed size) while its size and checksum are computed,
+    then the header is written over the placeholder.
+    """
+    _prepare_write_header(data, False, header_kwargs)
+    header_offset = fd.tell()
+    fd.write(struct.pack(b">H", BLOCK_HEADER.size))
+    fd.write(b"\0" * BLOCK_HEADER.size)
+
+    writer = _BlockWriter(fd, write_checksum)
+    mcompression.compress(writer, data, header_kwargs["compression"], config=compression_kwargs)
+    padding_bytes = _finish_write_header(header_kwargs, False, writer.size, writer.checksum(), padding, fd.block_size)
+
+    end = fd.tell()
+    fd.seek(header_offset + 2)
+    fd.write(BLOCK_HEADER.pack(**header_kwargs))
+    fd.seek(end)
+    fd.fast_forward(padding_bytes)
+    return header_kwargs
+
+
 def _candidate_offsets(min_offset: int, max_offset: int, block_size: int) -> Iterator[int]:
     offset = (max_offset // block_size) * block_size
     if offset == max_offset:
@@ -5,18 +5,21 @@ import contextlib
 import copy
 from typing import TYPE_CHECKING, Any, overload
 
+import numpy as np
+
+from asdf import _compression as mcompression
 from asdf import config, constants, generic_io, util
 from asdf._block.reader import ReadBlock
 from asdf._block.writer import WriteBlock
 
-from . import external, reader, store, writer
+from . import cache, external, reader, store, writer
 from . import io as bio
 from .callback import DataCallback
 from .key import Key as BlockKey
 from .options import Options
 
 if TYPE_CHECKING:
-    from collections.abc import Generator, Iterator, Sequence
+    from collections.abc import Generator, Iterable, Iterator, Sequence
 
     from asdf._block.key import Key
     from asdf.generic_io import GenericFile
@@ -32,7 +35,26 @@ class ReadBlocks(collections.UserList[ReadBlock]):
     (and it is not possible to generate a weakref to a list).
     """
 
-    pass
+    def __init__(self, initlist: Iterable[ReadBlock] | None = None):
+        super().__init__(initlist)
+        # ids of the blocks in this list (see block_for_data)
+        self._block_ids: set[int] | None = None
+
+    def block_for_data(self, data: Any) -> ReadBlock | None:
+        """
+        Find the block in this list whose loaded (or cached) data
+        is ``data`` without searching every block.
+        """
+        block = reader.block_for_data(data)
+        if block is None:
+            return None
+        # rebuilt when blocks are added
+        ids = self._block_ids
+        if ids is None or len(ids) != len(self.data):
+            ids = self._block_ids = {id(blk) for blk in self.data}
+        if id(block) in ids:
+            return block
+        return None
 
 
 class WriteBlocks(collections.abc.Sequence[WriteBlock]):
@@ -56,6 +78,9 @@ class WriteBlocks(collections.abc.Sequence[WriteBlock]):
         # WriteBlock instances in _blocks
         self._data_store = store.Store()
         self._object_store = store.Store()
+        # indices of blocks by checksum (only for blocks with a known
+        # checksum, see index_for_content)
+        self._indices_by_checksum: dict[bytes, list[int]] = {}
 
     @overload
     def __getitem__(self, index: int) -> WriteBlock: ...
@@ -71,6 +96,27 @@ class WriteBlocks(collections.abc.Sequence[WriteBlock]):
     def index_for_data(self, data: Any) -> Any | None:
         return self._data_store.lookup_by_object(data)
 
+    def index_for_content(self, blk: WriteBlock) -> int | None:
+        """
+        Find a block with the same data, dtype and compression as ``blk``.
+
+        Blocks with the same checksum are compared byte for byte so
+        a checksum collision never combines different data.
+        """
+        for index in self._indices_by_checksum.get(blk.checksum, []):
+            other = self._blocks[index]
+            if (
+                other._dtype == blk._dtype
+                and mcompression.validate(other.compression) == mcompression.validate(blk.compression)
+                and other.compression_kwargs == blk.compression_kwargs
+                and np.array_equal(other.data_bytes, blk.data_bytes)
+            ):
+                return index
+        return None
+
+    def assign_data_to_index(self, data: Any, index: int) -> None:
+        self._data_store.assign_object(data, index)
+
     def assign_object_to_index(self, obj: Any, index: int) -> None:
         self._object_store.assign_object(obj, index)
 
@@ -89,6 +135,8 @@ class WriteBlocks(collections.abc.Sequence[WriteBlock]):
         # assign the block data to this block to allow
         # fast lookup of blocks based on data
         self._data_store.assign_object(blk._data, index)
+        if blk._checksum is not None:
+            self._indices_by_checksum.setdefault(blk._checksum, []).append(index)
 
         # assign the object that created/uses this block
         self._object_store.assign_object(obj, index)
@@ -112,6 +160,14 @@ class OptionsStore(store.Store):
         # ReadBlocks are needed to look up default options
         self._read_blocks = read_blocks
 
+    def __deepcopy__(self, memo):
+        # the ReadBlocks (and their data) are shared with the copy
+        memo[id(self._read_blocks)] = self._read_blocks
+        new = type(self).__new__(type(self))
+        memo[id(self)] = new
+        new.__dict__.update(copy.deepcopy(self.__dict__, memo))
+        return new
+
     def has_options(self, array: NDArray) -> bool:
         """
         Check of Options have been defined for this array
@@ -154,16 +210,19 @@ class OptionsStore(store.Store):
         """
         base = util.get_array_base(array)
         # look up by block with matching _data
-        for block in self._read_blocks:
-            if block._cached_data is base or block._data is base:
-                # init options
-                if block.header["flags"] & constants.BLOCK_FLAG_STREAMED:
-                    storage_type = "streamed"
-                else:
-                    storage_type = "internal"
-                options = Options(storage_type, block.header["compression"])
-                return options
-        return None
+        if isinstance(self._read_blocks, ReadBlocks):
+            block = self._read_blocks.block_for_data(base)
+        else:
+            block = next((blk for blk in self._read_blocks if blk._has_data(base)), None)
+        if block is None:
+            return None
+        # init options
+        if block.header["flags"] & constants.BLOCK_FLAG_STREAMED:
+            storage_type = "streamed"
+        else:
+            storage_type = "internal"
+        options = Options(storage_type, block.header["compression"], _read_compression_kwargs(block))
+        return options
 
     def get_options(self, array: NDArray) -> Options:
         """
@@ -246,13 +305,13 @@ class OptionsStore(store.Store):
                 if blk.header["compression"]:
                     compressions.add(blk.header["compression"])
         else:
-            compressions.add(cfg.all_array_compression)
+            compressions.update(_output_compressions(cfg.all_array_compression, cfg.all_array_compression_kwargs))
         for _, by_key in self._by_id.items():
             for key, opts in by_key.items():
                 if not key._is_valid():
                     continue
                 if opts.compression:
-                    compressions.add(opts.compression)
+                    compressions.update(_output_compressions(opts.compression, opts.compression_kwargs))
         return compressions
 
 
@@ -311,13 +370,20 @@ class Manager:
 
         self._blocks = read_blocks
         self._external_block_cache = external.ExternalBlockCache()
+        # limits the decoded data cached by read blocks
+        self._block_cache = cache.BlockCache(config.get_config().block_cache_size)
         self._data_callbacks = store.Store()
 
         self._write_blocks = WriteBlocks()
         self._external_write_blocks = []
+        # the write blocks hold the data so ids are not reused during a write
+        self._external_write_blocks_by_data_id = {}
         self._streamed_write_block = None
         self._streamed_obj_keys = set()
         self._write_fd: GenericFile | None = None
+        # when appending (see append) the indices of the read blocks
+        # that are written again unchanged
+        self._append_indices: dict[int, int] | None = None
 
         # store the uri of the ASDF file here so that the Manager can
         # resolve and load external blocks without requiring a reference
@@ -329,11 +395,15 @@ class Manager:
         self._memmap = memmap
         self._validate_checksums = validate_checksums
 
+        # bytes not written by the last write because of deduplicate_blocks
+        self.deduplicated_bytes = 0
+
     def close(self) -> None:
         self._external_block_cache.clear()
         self._clear_write()
         for blk in self.blocks:
             blk.close()
+        self._block_cache.clear()
         self.options = OptionsStore(self.blocks)
 
     @property
@@ -354,6 +424,9 @@ class Manager:
         if not isinstance(new_blocks, ReadBlocks):
             new_blocks = ReadBlocks(new_blocks)
         self._blocks = new_blocks
+        self._block_cache.clear()
+        for blk in new_blocks:
+            blk._cache = self._block_cache
         # we propagate these blocks to options so that
         # options lookups can fallback to the new read blocks
         self.options._read_blocks = new_blocks
@@ -384,9 +457,11 @@ class Manager:
     def _clear_write(self) -> None:
         self._write_blocks = WriteBlocks()
         self._external_write_blocks = []
+        self._external_write_blocks_by_data_id = {}
         self._streamed_write_block = None
         self._streamed_obj_keys = set()
         self._write_fd = None
+        self._append_indices = None
 
     def _write_external_blocks(self, write_checksums: bool) -> None:
         from asdf import AsdfFile
@@ -438,13 +513,13 @@ class Manager:
         if options is None:
             options = Options()
         if options.storage_type == "external":
-            for index, blk in enumerate(self._external_write_blocks):
-                if blk._data is data:
-                    # this external uri is already ready to go
-                    return blk._uri
+            blk = self._external_write_blocks_by_data_id.get(id(data))
+            if blk is not None and blk._data is data:
+                # this external uri is already ready to go
+                return blk._uri
             # need to set up new external block
             index = len(self._external_write_blocks)
-            blk = writer.WriteBlock(data, options.compression, options.compression_kwargs)
+            blk = _make_write_block(data, options, obj)
             if self._write_fd is not None:
                 base_uri = self._write_fd.uri or self._uri
             else:
@@ -454,22 +529,82 @@ class Manager:
                 raise ValueError(msg)
             blk._uri = external.relative_uri_for_index(base_uri, index)
             self._external_write_blocks.append(blk)
+            self._external_write_blocks_by_data_id[id(data)] = blk
             return blk._uri
+        # new blocks are written after the read blocks when appending
+        first_index = 0
+        if self._append_indices is not None:
+            if (index := self._unchanged_block_index(data, options)) is not None:
+                return index
+            first_index = len(self.blocks)
         # first, look for an existing block
         index = self._write_blocks.index_for_data(data)
         if index is not None:
             self._write_blocks.assign_object_to_index(obj, index)
-            return index
+            return first_index + index
         # if no block is found, make a new block
-        blk = writer.WriteBlock(data, options.compression, options.compression_kwargs)
+        blk = _make_write_block(data, options, obj)
+        # or use a block with the same content
+        if config.get_config().deduplicate_blocks and not callable(data):
+            # the base array of an array read from a file is the uint8 block data
+            blk._dtype = np.dtype(getattr(obj, "dtype", data.dtype))
+            index = self._write_blocks.index_for_content(blk)
+            if index is not None:
+                self._write_blocks.assign_data_to_index(data, index)
+                self._write_blocks.assign_object_to_index(obj, index)
+                self.deduplicated_bytes += blk.data_bytes.nbytes
+                return first_index + index
         index = self._write_blocks.append_block(blk, obj)
-        return index
+        return first_index + index
 
-    def set_streamed_write_block(self, data: ByteArray1D | BlockDataCallback, obj: Any) -> None:
+    def _unchanged_block_index(self, data: Any, options: Options) -> int | None:
+        """
+        When appending, get the index of the read block that contains
+        ``data`` if the block can be kept as it is (the data and
+        compression did not change).
+        """
+        if self._append_indices is None or callable(data):
+            return None
+        blk = self.blocks.block_for_data(data)
+        if blk is None or blk.header["flags"] & constants.BLOCK_FLAG_STREAMED:
+            return None
+        if options.compression != mcompression.validate(blk.header["compression"]) or options.compression_kwargs:
+            return None
+        # data that was changed in memory must be written again, memory mapped
+        # data is already in the file and read-only data can't have changed
+        if not isinstance(data, np.memmap) and data.flags.writeable and not bio.block_data_matches(data, blk.header):
+            return None
+        return self._append_indices[id(blk)]
+
+    def _unloaded_block_index(self, data_callback: Any) -> int | None:
+        """
+        When appending, get the index of the read block for an array
+        that was never loaded (and so is unchanged) from the array's
+        ``data_callback``.
+        """
+        if self._append_indices is None or not isinstance(data_callback, DataCallback):
+            return None
+        if data_callback._read_blocks_ref() is not self.blocks:
+            return None
+        if self.blocks[data_callback._index].header["flags"] & constants.BLOCK_FLAG_STREAMED:
+            return None
+        return data_callback._index
+
+    def set_streamed_write_block(
+        self,
+        data: ByteArray1D | BlockDataCallback,
+        obj: Any,
+        compression: Compression = None,
+        compression_kwargs: dict[str, Any] | None = None,
+    ) -> None:
         """
         Create a WriteBlock that will be written as an ASDF
         streamed block.
 
+        Only framed compression (see
+        ``asdf._compression.FRAMED_COMPRESSIONS``) can be used for a
+        streamed block, any other compression is ignored.
+
         Parameters
         ----------
         data : ndarray or callable
@@ -481,12 +616,18 @@ class Manager:
             with the new WriteBlock so that `AsdfFile.update` can
             map newly created blocks to blocks read from the original
             file.
+        compression : str, optional
+            Compression to use for the streamed block.
+        compression_kwargs : dict, optional
+            Keyword arguments passed to the compressor.
         """
         if self._streamed_write_block is not None and data is not self._streamed_write_block.data:
             msg = "Can not add second streaming block"
             raise ValueError(msg)
         if self._streamed_write_block is None:
-            self._streamed_write_block = writer.WriteBlock(data)
+            if not mcompression.is_framed(compression):
+                compression, compression_kwargs = None, None
+            self._streamed_write_block = writer.WriteBlock(data, compression, compression_kwargs)
         self._streamed_obj_keys.add(BlockKey(obj))
 
     def _get_data_callback(self, index: int) -> DataCallback:
@@ -507,8 +648,14 @@ class Manager:
             from_block_options = self.options.get_options_from_block(arr)
             if from_block_options is not None:
                 compression = from_block_options.compression
+                compression_kwargs = compression_kwargs or from_block_options.compression_kwargs
         options = self.options.get_options(arr)
         options.compression = compression
+        if "filters" in compression_kwargs:
+            if options.compression is None:
+                msg = "Array filters can only be used with compression"
+                raise ValueError(msg)
+            mcompression.normalize_filters(compression_kwargs["filters"], arr.dtype)
         options.compression_kwargs = compression_kwargs
 
     def _get_array_compression(self, arr):
@@ -540,7 +687,7 @@ class Manager:
         self.options._read_blocks = self.blocks
 
     @contextlib.contextmanager
-    def write_context(self, fd: GenericFile, copy_options: bool = True) -> Generator[None]:
+    def write_context(self, fd: GenericFile, copy_options: bool = True, append: bool = False) -> Generator[None]:
         """
         Context manager that copies block options on
         entrance and restores the options when exited.
@@ -555,9 +702,16 @@ class Manager:
         copy_options : bool, optional, default True
             Copy options on entrance and restore them on
             exit (See `options_context`).
+
+        append : bool, optional, default False
+            Set up writing for `append` where unchanged
+            read blocks keep their index.
         """
         self._clear_write()
         self._write_fd = fd
+        self.deduplicated_bytes = 0
+        if append:
+            self._append_indices = {id(blk): index for index, blk in enumerate(self.blocks)}
         if copy_options:
             with self.options_context():
                 yield
@@ -733,3 +887,171 @@ class Manager:
 
             # update read blocks to reflect new state
             self.blocks = new_read_blocks
+
+    def append_tree_space(self) -> int | None:
+        """
+        Get the number of bytes available for the tree (and header)
+        before the first read block or `None` if blocks can't be
+        appended to the file (see `append`).
+        """
+        if not len(self.blocks):
+            return None
+        last_block = self.blocks[-1]
+        if last_block.offset is None or last_block.header["flags"] & constants.BLOCK_FLAG_STREAMED:
+            return None
+        return self.blocks[0].offset - len(constants.BLOCK_MAGIC)  # pyrefly: ignore [unsupported-operation]
+
+    def append(self, pad_blocks: bool | float | None, include_block_index: bool, write_checksums: bool) -> bool:
+        """
+        Append blocks set up during a `write_context` (with ``append=True``)
+        after the read blocks, which are not moved or rewritten.
+
+        Parameters
+        ----------
+        pad_blocks : bool, None or float
+            If False, add no padding bytes between blocks. If True
+            add some default amount of padding. If a float, add
+            a number of padding bytes based off a ratio of the data
+            size.
+
+        include_block_index : bool
+            If True, write a block index (for all blocks) after
+            the appended blocks.
+
+        write_checksums : bool
+            Compute and write checksums for each appended block.
+
+        Returns
+        -------
+        appended : bool
+            False if the blocks can't be appended (nothing was written).
+
+        Raises
+        ------
+        OSError
+            If called outside a `write_context`.
+        """
+        if self._write_fd is None or self._append_indices is None:
+            msg = "append called outside of valid write_context"
+            raise OSError(msg)
+        if self._streamed_write_block is not None or self.append_tree_space() is None:
+            return False
+
+        # reading the header sets data_offset for lazy loaded blocks
+        last_block = self.blocks[-1]
+        allocated_size = last_block.header["allocated_size"]
+        end_of_blocks = last_block.data_offset + allocated_size  # pyrefly: ignore [unsupported-operation]
+
+        if len(self._external_write_blocks):
+            self._write_external_blocks(write_checksums=write_checksums)
+
+        # write new blocks over the old block index
+        self._write_fd.seek(end_of_blocks)
+        offsets, headers = writer.write_blocks(
+            self._write_fd,
+            self._write_blocks,
+            pad_blocks,
+            write_index=False,
+            write_checksums=write_checksums,
+        )
+        magic_len = len(constants.BLOCK_MAGIC)
+        old_offsets = [blk.offset - magic_len for blk in self.blocks]  # pyrefly: ignore [unsupported-operation]
+        if include_block_index:
+            bio.write_block_index(self._write_fd, old_offsets + offsets)
+
+        # as in update, new read blocks are lazy as any current memmap is invalid
+        new_read_blocks = ReadBlocks()
+        for offset, header in zip(old_offsets + offsets, [blk.header for blk in self.blocks] + headers):
+            new_read_blocks.append(
+                reader.ReadBlock(offset + magic_len, self._write_fd, self._memmap, True, False, header=header)
+            )
+
+        # callbacks for the read blocks keep their index
+        for by_key in list(self._data_callbacks._by_id.values()):
+            for key, cb in by_key.items():
+                if key._is_valid() and cb._read_blocks_ref() is self.blocks:
+                    cb._reassign(cb._index, new_read_blocks)
+
+        # and objects that use the new blocks now use the appended read blocks
+        for i in range(len(self._write_blocks)):
+            for obj_key in self._write_blocks.object_keys_for_index(i):
+                obj = obj_key._ref()  # pyrefly: ignore [not-callable]
+                if obj is None:
+                    continue
+                cb = self._data_callbacks.lookup_by_object(obj)
+                if cb is not None:
+                    cb._reassign(len(self.blocks) + i, new_read_blocks)
+
+        self.blocks = new_read_blocks
+        return True
+
+
+def _output_compressions(compression: Compression, compression_kwargs: dict[str, Any] | None) -> set[Compression]:
+    # "auto" compression can use any of the candidates
+    if compression == "auto":
+        return set((compression_kwargs or {}).get("candidates") or mcompression.AUTO_COMPRESSIONS)
+    return {compression}
+
+
+def _read_compression_kwargs(block: ReadBlock) -> dict[str, Any] | None:
+    """
+    Read the compression options (the compression, filters and dtype)
+    stored in the preamble of a block with "filt" compression so that the
+    block is written again with the same options.
+    """
+    if mcompression.validate(block.header["compression"]) != "filt":
+        return None
+    fd = block._fd()
+    if fd is None or block.data_offset is None or block.header["used_size"] < 2:
+        return None
+    try:
+        buff = fd.read_into_array_at(block.data_offset, 2)
+        size = mcompression.FilterCompressor.preamble_size(buff)
+        return mcompression.FilterCompressor.parse_preamble(fd.read_into_array_at(block.data_offset, size))
+    except (OSError, ValueError):
+        # the file was closed
+        return None
+
+
+def _make_write_block(data: ByteArray1D | BlockDataCallback, options: Options, obj: Any = None) -> WriteBlock:
+    """
+    Make a WriteBlock for data using the compression in options, choosing
+    the compression (see ``asdf._compression.choose_compression``) for
+    "auto" compression and using "filt" compression for data with filters.
+    """
+    compression = options.compression
+    compression_kwargs = options.compression_kwargs
+    if compression not in ("auto", "filt") and "filters" not in compression_kwargs:
+        return writer.WriteBlock(data, compression, compression_kwargs)
+    blk = writer.WriteBlock(data)
+    compression_kwargs = dict(compression_kwargs)
+    if compression == "filt":
+        compression = compression_kwargs.pop("compression", "zlib")
+        compression_kwargs.setdefault("filters", ["shuffle"])
+    filters = compression_kwargs.pop("filters", None)
+    # the filters work on the elements of the array (not the base array
+    # which for arrays read from a file is the uint8 block data)
+    dtype = np.dtype(compression_kwargs.pop("dtype", None) or getattr(obj, "dtype", None) or blk.data_bytes.dtype)
+    if filters:
+        filters = mcompression.normalize_filters(filters, dtype)
+    if compression == "auto":
+        blk.compression = mcompression.choose_compression(
+            blk.data_bytes, filters=filters, dtype=dtype, **compression_kwargs
+        )
+        compression_kwargs = {}
+    else:
+        blk.compression = compression
+    if blk.compression is None or not filters:
+        if filters and compression is None:
+            msg = "Array filters can only be used with compression"
+            raise ValueError(msg)
+        blk.compression_kwargs = compression_kwargs
+        return blk
+    blk.compression_kwargs = {
+        "compression": blk.compression,
+        "filters": filters,
+        "dtype": dtype.str,
+        **compression_kwargs,
+    }
+    blk.compression = "filt"
+    return blk
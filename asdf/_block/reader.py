@@ -1,21 +1,36 @@
 from __future__ import annotations
 
+import os
+import threading
 import typing
 import warnings
 import weakref
 from typing import TYPE_CHECKING
 
-from asdf import constants
+import numpy as np
+
+from asdf import constants, generic_io
+from asdf.config import get_config
 from asdf.exceptions import AsdfBlockIndexWarning, AsdfWarning, DelimiterNotFoundError
 
 from . import io as bio
+from .callback import FileDataCallback
+from .disk_cache import get_disk_cache
 from .exceptions import BlockIndexError
+from .shared import SharedBlock
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from asdf._block.cache import BlockCache
     from asdf._block.io import BlockHeader
     from asdf.generic_io import GenericFile
     from asdf.typing import BlockDataCallback, ByteArray1D
 
+# blocks by the id of their data (see ReadBlock._index_data) which allows
+# finding the block for an array without searching all blocks
+_blocks_by_data_id: weakref.WeakValueDictionary[int, ReadBlock] = weakref.WeakValueDictionary()
+
 
 class ReadBlock:
     """
@@ -39,14 +54,50 @@ class ReadBlock:
         self.data_offset: int | None = data_offset
         self._data = data
         self._cached_data = None
+        self._file_data_callback = None
+        # decompressed data in shared memory (see the shared submodule)
+        # or in the on-disk cache (see the disk_cache submodule), both are
+        # read-only so they're not used for files opened for update
+        read_only = not fd.writable()
+        self._shared_memory = read_only and get_config().shared_memory_blocks
+        self._shared_block = None
+        self._disk_cache = get_disk_cache() if read_only else None
+        self._decoded_data = None
+        self._load_decoded_data = self._shared_memory or self._disk_cache is not None
+        # BlockCache (assigned by the Manager) that limits the cached data
+        # and objects (NDArrayType instances) that use the cached data
+        # and will be told to release it if it is evicted
+        self._cache: BlockCache | None = None
+        self._consumers: weakref.WeakSet = weakref.WeakSet()
         self.memmap: bool = memmap
         self.lazy_load: bool = lazy_load
         self.validate_checksum: bool = validate_checksum
+        # held while loading the header and data so that a block read
+        # by several threads is only read (and decompressed) once
+        self._lock = threading.RLock()
+        self._index_data(data)
         if not lazy_load:
             self.load()
+            self._load_eagerly()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        del state["_consumers"]
+        state["_cache"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+        self._consumers = weakref.WeakSet()
 
     def close(self) -> None:
         self._cached_data = None
+        if self._cache is not None:
+            self._cache.discard(self)
+        if self._shared_block is not None:
+            self._shared_block.release()
 
     @property
     def loaded(self) -> bool:
@@ -63,15 +114,69 @@ class ReadBlock:
         """
         if self.loaded:
             return
-        fd = self._fd()
-        if fd is None or fd.is_closed():
-            msg = "Attempt to load block from closed file"
-            raise OSError(msg)
-        position = fd.tell()
-        _, self._header, self.data_offset, self._data = bio.read_block(
-            fd, self.validate_checksum, offset=self.offset, memmap=self.memmap, lazy_load=self.lazy_load
-        )
-        fd.seek(position)
+        with self._lock:
+            if self.loaded:
+                return
+            fd = self._fd()
+            if fd is None or fd.is_closed():
+                msg = "Attempt to load block from closed file"
+                raise OSError(msg)
+            # blocks decompressed into shared memory or the disk cache are read
+            # with the lazy callback (which is only used if the block can't be)
+            lazy_load = self.lazy_load or self._load_decoded_data
+            with fd._lock:
+                position = fd.tell()
+                _, header, self.data_offset, data = bio.read_block(
+                    fd, self.validate_checksum, offset=self.offset, memmap=self.memmap, lazy_load=lazy_load
+                )
+                fd.seek(position)
+            self._header = header
+            self._data = data
+            self._index_data(data)
+            self._load_eagerly()
+
+    def _load_eagerly(self) -> None:
+        # a block read with a lazy callback (to allow decompressing it into
+        # shared memory or the disk cache) that was not lazy loaded is read now
+        if not self.lazy_load and callable(self._data) and self._load_decoded() is None:
+            self._data = self._data()
+            self._index_data(self._data)
+
+    def _index_data(self, data: typing.Any) -> None:
+        if data is not None and not callable(data):
+            _blocks_by_data_id[id(data)] = self
+
+    def _has_data(self, data: typing.Any) -> bool:
+        """
+        Check if ``data`` is the loaded (or cached) data for this block.
+        """
+        return self._cached_data is data or self._data is data
+
+    def _load_decoded(self) -> ByteArray1D | None:
+        """
+        Decompress the block into (or attach to) shared memory or the
+        disk cache, returns `None` if the block can't be stored in either.
+        """
+        with self._lock:
+            if self._decoded_data is None and self._load_decoded_data and callable(self._data):
+                # only try once
+                self._load_decoded_data = False
+                fd = self._fd()
+                if fd is None or fd.is_closed():
+                    msg = "ASDF file has already been closed. Can not get the data."
+                    raise OSError(msg)
+                if self.header["flags"] & constants.BLOCK_FLAG_STREAMED:
+                    # the size of a streamed block is not fixed
+                    return None
+                if self._shared_memory:
+                    self._shared_block = SharedBlock.load(fd, self.header, self.validate_checksum, self.data_offset)
+                    if self._shared_block is not None:
+                        self._decoded_data = self._shared_block.data
+                if self._decoded_data is None and self._disk_cache is not None:
+                    self._decoded_data = self._disk_cache.load(
+                        fd, self.header, self.validate_checksum, self.data_offset
+                    )
+            return self._decoded_data
 
     @property
     def data(self) -> ByteArray1D:
@@ -85,6 +190,9 @@ class ReadBlock:
         """
         if not self.loaded:
             self.load()
+        if self._load_decoded_data or self._decoded_data is not None:
+            if (data := self._load_decoded()) is not None:
+                return data
         if callable(self._data):
             data = self._data()
         else:
@@ -101,9 +209,115 @@ class ReadBlock:
         (if lazy loaded). Subsequent calls will return the same
         ndarray.
         """
-        if self._cached_data is None:
-            self._cached_data = self.data
-        return self._cached_data
+        cache = self._cache
+        if (data := self._cached_data) is not None:
+            if cache is not None:
+                cache.hit(self)
+            return data
+        with self._lock:
+            if (data := self._cached_data) is not None:
+                if cache is not None:
+                    cache.hit(self)
+                return data
+            data = self.data
+            # data that can be read again is added to the block cache
+            cache_data = (
+                cache is not None
+                and callable(self._data)
+                and self._decoded_data is None
+                and not isinstance(data, np.memmap)
+            )
+            if cache_data and cache.limited:
+                # evicting data must not discard changes to the data
+                data.flags.writeable = False
+            self._cached_data = data
+            self._index_data(data)
+        # adding the block can evict other blocks so this is done
+        # without holding the lock
+        if cache_data:
+            cache.add(self, data.nbytes)
+        return data
+
+    def iter_data(self, chunk_size: int | None = None) -> Iterator[ByteArray1D]:
+        """
+        Iterate over the data of a streamed block in chunks (see
+        ``asdf._block.io.iter_streamed_block_data``) without reading the
+        whole block (unless it was already read).
+
+        Parameters
+        ----------
+        chunk_size : int, optional
+            Number of bytes to read at once (from a seekable file).
+
+        Yields
+        ------
+        data : ndarray
+            One-dimensional ndarrays of dtype uint8
+        """
+        if not self.header["flags"] & constants.BLOCK_FLAG_STREAMED:
+            msg = "Only the data of a streamed block can be iterated"
+            raise ValueError(msg)
+        if (data := self._cached_data) is not None or not callable(self._data):
+            yield self.cached_data if data is None else data
+            return
+        if isinstance(self._data, bio.StreamedBlockCallback):
+            yield from self._data.iter_data()
+            return
+        fd = self._fd()
+        if fd is None or fd.is_closed():
+            msg = "ASDF file has already been closed. Can not get the data."
+            raise OSError(msg)
+        yield from bio.iter_streamed_block_data(
+            fd, self.header, self.validate_checksum, self.data_offset, chunk_size=chunk_size
+        )
+
+    def _add_consumer(self, consumer: typing.Any) -> typing.Callable[[], None] | None:
+        """
+        Register ``consumer`` (an object using the cached data) to be
+        told to release the data (by calling ``consumer._release_block_data``)
+        if the data is evicted from a size limited `BlockCache`.
+
+        Returns a function the consumer should call when it uses the data
+        (to update the cache) or `None` if the data will never be evicted.
+        """
+        cache = self._cache
+        if cache is None or not cache.limited or self not in cache:
+            return None
+        self._consumers.add(consumer)
+        return self._cache_hit
+
+    def _cache_hit(self) -> None:
+        if (cache := self._cache) is not None:
+            cache.hit(self)
+
+    def _evict(self) -> None:
+        """
+        Drop the cached data and tell objects that use it to release it
+        (called by the `BlockCache`).
+        """
+        self._cached_data = None
+        consumers = list(self._consumers)
+        self._consumers.clear()
+        for consumer in consumers:
+            consumer._release_block_data()
+
+    def _get_file_data_callback(self) -> FileDataCallback | None:
+        """
+        Get a (picklable) `FileDataCallback` that reads this block by
+        opening the file by path, or `None` if the block is not in a
+        local file opened read-only.
+        """
+        if self._file_data_callback is None:
+            fd = self._fd()
+            if fd is None or fd.is_closed() or fd.mode != "r" or not isinstance(fd, generic_io.RealFile):
+                return None
+            path = getattr(fd._fd, "name", None)
+            if not isinstance(path, str) or not os.path.isfile(path) or self.offset is None:
+                return None
+            self._file_data_callback = FileDataCallback(
+                os.path.abspath(path), self.offset, self.header, self.memmap, self.validate_checksum
+            )
+        return self._file_data_callback
 
     @property
     def header(self) -> BlockHeader:
@@ -122,6 +336,16 @@ class ReadBlock:
         return typing.cast("BlockHeader", self._header)
 
 
+def block_for_data(data: typing.Any) -> ReadBlock | None:
+    """
+    Find the `ReadBlock` whose loaded (or cached) data is ``data``.
+    """
+    block = _blocks_by_data_id.get(id(data))
+    if block is not None and block._has_data(data):
+        return block
+    return None
+
+
 def _read_blocks_serially(
     fd: GenericFile,
     memmap: bool = False,
@@ -145,10 +369,18 @@ def _read_blocks_serially(
             return blocks
         after_magic = True
 
+    # blocks that might be decompressed into shared memory or the disk cache
+    # are read lazily (ReadBlock reads them now if they can't be stored there
+    # and lazy_load is False)
+    cfg = get_config()
+    read_lazily = lazy_load or (
+        not fd.writable() and (cfg.shared_memory_blocks or cfg.block_cache_directory is not None)
+    )
+
     buff = constants.BLOCK_MAGIC
     while buff == constants.BLOCK_MAGIC:
         # read the block
-        offset, header, data_offset, data = bio.read_block(fd, validate_checksums, memmap=memmap, lazy_load=lazy_load)
+        offset, header, data_offset, data = bio.read_block(fd, validate_checksums, memmap=memmap, lazy_load=read_lazily)
         blocks.append(
             ReadBlock(
                 offset, fd, memmap, lazy_load, validate_checksums, header=header, data_offset=data_offset, data=data
@@ -0,0 +1,335 @@
+"""
+Compressed blocks read with the ``shared_memory_blocks`` config option
+enabled are decompressed into a `multiprocessing.shared_memory` segment
+named after the user and the identity of the file (device, inode, size and
+modification time) and the block (offset and header). Other processes of
+the same user that read the same block attach to the segment instead of
+decompressing the block again.
+
+Each segment starts with a small header containing the state of the
+segment (if the decompressed data is ready). On POSIX systems segments are
+created, attached to and released while holding a lock file in a private
+(per-user) directory in the temporary directory. Every process using a
+segment holds a shared lock on a "users" file for the segment and the
+segment is unlinked when the last process using it releases it. As the
+operating system drops the locks of a process that exits (or crashes) a
+segment left behind by a crashed process is reused (or if it was not
+completely written, replaced) the next time the block is read. Arrays that
+use the data keep the segment mapped (even after it is unlinked) so
+releasing a ``SharedBlock`` never invalidates arrays. On Windows a segment
+is freed by the operating system when it is no longer mapped by any
+process so no locking is needed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+import struct
+import sys
+import tempfile
+import weakref
+from multiprocessing import resource_tracker, shared_memory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from asdf import _compression as mcompression
+
+from . import io as bio
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+if TYPE_CHECKING:
+    from asdf._block.io import BlockHeader
+    from asdf.generic_io import GenericFile
+    from asdf.typing import ByteArray1D
+
+
+# state, padded so the data is aligned
+_HEADER = struct.Struct("<I60x")
+_WRITING = 0
+_READY = 1
+
+_USE_POSIX = os.name == "posix"
+
+# In python < 3.13 attaching to a segment registers it with the resource
+# tracker which unlinks it (and warns) when the process exits.
+_TRACK_KWARGS = {"track": False} if sys.version_info >= (3, 13) else {}
+
+
+class _SharedMemory(shared_memory.SharedMemory):
+    """
+    `multiprocessing.shared_memory.SharedMemory` that is not tracked by
+    the resource tracker (the segments are reference counted instead)
+    and that leaves the memory mapped for as long as any array uses it.
+    """
+
+    def __init__(self, name, create=False, size=0):
+        super().__init__(name, create, size, **_TRACK_KWARGS)
+        if _USE_POSIX:
+            if not _TRACK_KWARGS:
+                resource_tracker.unregister(self._name, "shared_memory")
+            # the mapping does not need the file descriptor
+            os.close(self._fd)
+            self._fd = -1
+
+    def __del__(self):
+        # Closing the mapping here would invalidate arrays that use it, it
+        # is instead closed when the last reference to it is released.
+        pass
+
+    def unlink(self):
+        if _USE_POSIX and not _TRACK_KWARGS:
+            # balance the unregister in SharedMemory.unlink
+            resource_tracker.register(self._name, "shared_memory")
+        super().unlink()
+
+
+def _lock_directory() -> str | None:
+    """
+    Private directory for the lock files of the current user, or `None`
+    if the directory can't be created or is not safe to use (it is not a
+    directory owned by and only accessible to the current user).
+    """
+    path = os.path.join(tempfile.gettempdir(), f"asdf-shared-blocks-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    except OSError:
+        return None
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        return None
+    return path
+
+
+def _open_lock_file(path: str) -> int:
+    return os.open(path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600)
+
+
+class _SegmentLock:
+    """
+    Lock (on POSIX systems) held while creating, attaching to or releasing
+    a segment.  A single lock file (in the per-user lock directory) is
+    shared by all segments.
+    """
+
+    def __init__(self, directory: str):
+        self._path = os.path.join(directory, "lock")
+
+    def __enter__(self):
+        self._fd = _open_lock_file(self._path)
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+
+
+def _users_path(directory: str, name: str) -> str:
+    return os.path.join(directory, f"{name}.users")
+
+
+def _use(directory: str, name: str) -> int:
+    """
+    Open the users file of a segment and take a shared lock on it that
+    is held for as long as this process uses the segment.  Must be called
+    while holding the `_SegmentLock`.
+    """
+    fd = _open_lock_file(_users_path(directory, name))
+    try:
+        # exclusive locks are only taken while holding the _SegmentLock
+        # so this does not block
+        fcntl.flock(fd, fcntl.LOCK_SH)
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+def _is_unused(directory: str, name: str) -> bool:
+    """
+    Check if no process (that is still running) uses a segment.  Must be
+    called while holding the `_SegmentLock`.
+    """
+    fd = _open_lock_file(_users_path(directory, name))
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _unlink(directory: str, name: str, shm: _SharedMemory) -> None:
+    """
+    Unlink a segment and its users file.  Must be called while holding
+    the `_SegmentLock`.
+    """
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+    try:
+        os.remove(_users_path(directory, name))
+    except FileNotFoundError:
+        pass
+
+
+def segment_name(fd: GenericFile, header: BlockHeader, offset: int) -> str | None:
+    """
+    Name of the segment for the block (with data at ``offset``) in ``fd``
+    or `None` if ``fd`` is not a local file.
+    """
+    if (key := bio.block_identity(fd, header, offset)) is None:
+        return None
+    if _USE_POSIX:
+        # segments are only shared by the processes of one user
+        key = hashlib.sha1(f"{os.getuid()}:{key}".encode(), usedforsecurity=False).hexdigest()
+    # short enough for the 31 character limit on macOS
+    return "asdf-" + key[:24]
+
+
+def _release(shm: _SharedMemory, directory: str | None, users_fd: int | None) -> None:
+    if users_fd is None:
+        return
+    with _SegmentLock(directory):
+        os.close(users_fd)
+        if _is_unused(directory, shm.name):
+            _unlink(directory, shm.name, shm)
+
+
+class SharedBlock:
+    """
+    Decompressed data for a block stored in a shared memory segment.
+
+    Use `SharedBlock.load` to create (or attach to) a segment.
+    """
+
+    def __init__(self, shm: _SharedMemory, data_size: int, directory: str | None = None, users_fd: int | None = None):
+        self._shm = shm
+        self._data = np.frombuffer(shm.buf, np.uint8, data_size, _HEADER.size)
+        # release the segment if this is garbage collected (or at exit)
+        self._finalizer = weakref.finalize(self, _release, shm, directory, users_fd)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def data(self) -> ByteArray1D:
+        """
+        A (read-only) one-dimensional uint8 array of the decompressed data.
+        """
+        return self._data
+
+    def release(self) -> None:
+        """
+        Stop using the segment (the segment is unlinked when it is released
+        by every process that uses it).  Arrays that use the data remain
+        valid.
+        """
+        self._finalizer()
+
+    @classmethod
+    def load(cls, fd: GenericFile, header: BlockHeader, validate_checksum: bool, offset: int) -> SharedBlock | None:
+        """
+        Attach to the segment for a compressed block or create the segment
+        and decompress the block into it.
+
+        Returns `None` if the block can't be shared (``fd`` is not a local
+        file, the block is not compressed, the lock directory can't be used
+        or another process is still decompressing the block) in which case
+        the caller should read the block normally.
+        """
+        compression = mcompression.validate(header["compression"])
+        name = segment_name(fd, header, offset)
+        if not compression or name is None:
+            return None
+        if not _USE_POSIX:
+            return cls._load_windows(fd, header, validate_checksum, offset, name)
+        if (directory := _lock_directory()) is None:
+            return None
+        data_size = header["data_size"]
+
+        with _SegmentLock(directory):
+            try:
+                shm = _SharedMemory(name)
+            except FileNotFoundError:
+                shm = None
+            except PermissionError:
+                return None
+
+            if shm is not None:
+                (state,) = _HEADER.unpack_from(shm.buf)
+                if state == _READY:
+                    block = cls(shm, data_size, directory, _use(directory, name))
+                    block._data.flags.writeable = False
+                    return block
+                if not _is_unused(directory, name):
+                    # another process is decompressing the block
+                    shm.close()
+                    return None
+                # the process that created the segment exited before
+                # the data was written, replace the segment
+                _unlink(directory, name, shm)
+                shm.close()
+
+            shm = _SharedMemory(name, create=True, size=_HEADER.size + max(data_size, 1))
+            _HEADER.pack_into(shm.buf, 0, _WRITING)
+            block = cls(shm, data_size, directory, _use(directory, name))
+
+        try:
+            bio.read_block_data_at(fd, header, validate_checksum, offset, out=block._data)
+        except BaseException:
+            # unlink the (incomplete) segment so other processes don't wait on it
+            block.release()
+            raise
+        block._data.flags.writeable = False
+        with _SegmentLock(directory):
+            _HEADER.pack_into(shm.buf, 0, _READY)
+        return block
+
+    @classmethod
+    def _load_windows(cls, fd, header, validate_checksum, offset, name):
+        data_size = header["data_size"]
+        try:
+            shm = _SharedMemory(name)
+        except FileNotFoundError:
+            try:
+                shm = _SharedMemory(name, create=True, size=_HEADER.size + max(data_size, 1))
+            except FileExistsError:
+                # another process created the segment
+                return None
+        else:
+            (state,) = _HEADER.unpack_from(shm.buf)
+            if state != _READY:
+                return None
+            block = cls(shm, data_size)
+            block._data.flags.writeable = False
+            return block
+
+        _HEADER.pack_into(shm.buf, 0, _WRITING)
+        block = cls(shm, data_size)
+        bio.read_block_data_at(fd, header, validate_checksum, offset, out=block._data)
+        block._data.flags.writeable = False
+        _HEADER.pack_into(shm.buf, 0, _READY)
+        return block
@@ -15,11 +15,19 @@ class Store:
         - are not hashable (so any object can be used)
         - when the key is garbage collected, the value
           will be unretrievable
+
+    Keys are also indexed by value so ``keys_for_value`` does not
+    need to search the whole store.
     """
 
     def __init__(self):
         # store contains 2 layers of lookup: id(obj), Key
         self._by_id: dict[int, dict[Key, Any]] = {}
+        # reverse lookup: value (see _value_key) -> Keys (as an ordered set)
+        self._keys_by_value: dict[Any, dict[Key, None]] = {}
+        # keys for objects that were garbage collected are removed
+        # (see _cleanup) when the store doubles in size
+        self._cleanup_size = 64
 
     def lookup_by_object(self, obj: Any, default: Any | None = None) -> Any | None:
         if isinstance(obj, Key):
@@ -68,7 +76,11 @@ class Store:
         if obj_id not in self._by_id:
             if obj_key is None:
                 obj_key = Key(obj)
+            if len(self._by_id) >= self._cleanup_size:
+                self._cleanup()
+                self._cleanup_size = max(64, 2 * len(self._by_id))
             self._by_id[obj_id] = {obj_key: value}
+            self._index_key(obj_key, value)
             return
 
         # if id is known
@@ -78,19 +90,40 @@ class Store:
         if obj_key is None:
             for key in by_key:
                 if key._matches_object(obj):
-                    by_key[key] = value
-                    return
-            # we didn't find a matching key, so make one
-            obj_key = Key(obj)
+                    obj_key = key
+                    break
+            else:
+                # we didn't find a matching key, so make one
+                obj_key = Key(obj)
+                # any other keys are for garbage collected objects
+                # that had the same id
+                for key in [key for key in by_key if not key._is_valid()]:
+                    self._unindex_key(key, by_key.pop(key))
+        else:
+            # use the stored (equal) Key so both lookups hold the same instance
+            obj_key = next((key for key in by_key if key == obj_key), obj_key)
 
-        # if no match was found, add using the key
-        self._by_id[obj_id][obj_key] = value
+        # replace any previous value for the key
+        if obj_key in by_key:
+            self._unindex_key(obj_key, by_key[obj_key])
+        by_key[obj_key] = value
+        self._index_key(obj_key, value)
 
     def keys_for_value(self, value: Any) -> Iterator[Key]:
-        for oid, by_key in self._by_id.items():
-            for key, stored_value in by_key.items():
-                if stored_value == value and key._is_valid():
-                    yield key
+        keys = self._keys_by_value.get(_value_key(value), {})
+        yield from [key for key in keys if key._is_valid()]
+
+    def _index_key(self, key: Key, value: Any) -> None:
+        self._keys_by_value.setdefault(_value_key(value), {})[key] = None
+
+    def _unindex_key(self, key: Key, value: Any) -> None:
+        value_key = _value_key(value)
+        keys = self._keys_by_value.get(value_key)
+        if keys is None:
+            return
+        keys.pop(key, None)
+        if not keys:
+            del self._keys_by_value[value_key]
 
     def _cleanup(self, object_id: int | None = None) -> None:
         if object_id is None:
@@ -100,6 +133,15 @@ class Store:
         by_key = self._by_id[object_id]
         keys_to_remove = [k for k in by_key if not k._is_valid()]
         for key in keys_to_remove:
-            del by_key[key]
+            self._unindex_key(key, by_key.pop(key))
         if not len(by_key):
             del self._by_id[object_id]
+
+
+def _value_key(value: Any) -> Any:
+    # unhashable values are indexed by identity
+    try:
+        hash(value)
+    except TypeError:
+        return (_value_key, id(value))
+    return value
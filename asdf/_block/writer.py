@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import io
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Any
 
 import numpy as np
 
-from asdf import constants
+from asdf import constants, generic_io
+from asdf.config import _use_config, get_config
 
 from . import io as bio
 
@@ -22,6 +27,11 @@ class WriteBlock:
     """
 
     _uri: str | None = None
+    # checksum of data_bytes (see checksum)
+    _checksum: bytes | None = None
+    # dtype of the array written to the block, used to only combine
+    # blocks of arrays of the same type with deduplicate_blocks
+    _dtype: np.dtype | None = None
 
     def __init__(
         self,
@@ -46,6 +56,16 @@ class WriteBlock:
             return np.ndarray(-1, np.uint8, data.ravel(order="K").data)
         return np.ndarray(0, np.uint8)
 
+    @property
+    def checksum(self) -> bytes:
+        """
+        The checksum of ``data_bytes``, computed once and reused
+        when the block is written.
+        """
+        if self._checksum is None:
+            self._checksum = bio.calculate_block_checksum(self.data_bytes)
+        return self._checksum
+
 
 def write_blocks(
     fd: GenericFile,
@@ -54,6 +74,7 @@ def write_blocks(
     streamed_block: WriteBlock | None = None,
     write_index: bool = True,
     write_checksums: bool = True,
+    threads: int | None = None,
 ) -> tuple[list[int | None], list[BlockHeader]]:
     """
     Write a list of WriteBlocks to a file
@@ -88,6 +109,10 @@ def write_blocks(
     write_checksums: bool, optional
         Compute and write block checksums to the file.
 
+    threads : int, optional
+        Number of threads used to write the blocks, defaults to the
+        ``block_write_threads`` config option (see `write_blocks_parallel`).
+
     Returns
     -------
     offsets : list of int
@@ -102,6 +127,16 @@ def write_blocks(
         Headers written for each block (including the streamed_block
         if it was provided).
     """
+    if threads is None:
+        threads = get_config().block_write_threads
+    if threads > 1 and (fileno := _pwrite_fileno(fd)) is not None:
+        offsets, headers = write_blocks_parallel(
+            fd, fileno, blocks, threads, padding, streamed_block=streamed_block, write_checksums=write_checksums
+        )
+        if streamed_block is None and write_index and len(offsets):
+            bio.write_block_index(fd, offsets)
+        return offsets, headers
+
     # some non-seekable files return a valid `tell` result
     # others can raise an exception, others might always
     # return 0. See relevant issues:
@@ -130,12 +165,22 @@ def write_blocks(
                 padding=padding,
                 compression=blk.compression,
                 write_checksum=write_checksums,
+                data_checksum=blk._checksum,
             )
         )
     if streamed_block is not None:
         offsets.append(tell())
         fd.write(constants.BLOCK_MAGIC)
-        headers.append(bio.write_block(fd, streamed_block.data_bytes, stream=True, write_checksum=write_checksums))
+        headers.append(
+            bio.write_block(
+                fd,
+                streamed_block.data_bytes,
+                stream=True,
+                compression_kwargs=streamed_block.compression_kwargs,
+                compression=streamed_block.compression,
+                write_checksum=write_checksums,
+            )
+        )
 
     # os.pipe on windows returns a file-like object
     # that reports as seekable but tell always returns 0
@@ -148,3 +193,109 @@ def write_blocks(
     if streamed_block is None and write_index and len(offsets) and all(o is not None for o in offsets):
         bio.write_block_index(fd, offsets)
     return offsets, headers
+
+
+def _pwrite_fileno(fd: GenericFile) -> int | None:
+    """
+    Get the file descriptor to use for positional writes to ``fd`` (or
+    `None` if ``fd`` is not a local seekable file).
+    """
+    if not hasattr(os, "pwrite") or not isinstance(fd, generic_io.RealFile) or not fd.seekable():
+        return None
+    try:
+        return fd._fd.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
+def _pwrite(fileno: int, data: Any, offset: int) -> None:
+    view = memoryview(data).cast("B")
+    while len(view):
+        n_written = os.pwrite(fileno, view, offset)
+        view = view[n_written:]
+        offset += n_written
+
+
+def write_blocks_parallel(
+    fd: GenericFile,
+    fileno: int,
+    blocks: Sequence[WriteBlock],
+    threads: int,
+    padding: bool | float | None = False,
+    streamed_block: WriteBlock | None = None,
+    write_checksums: bool = True,
+) -> tuple[list[int], list[BlockHeader]]:
+    """
+    Write a list of WriteBlocks to a local file using several threads.
+
+    The blocks are written in two phases. First the header of each block
+    is computed (in parallel), this compresses the data (which is kept
+    in memory until it is written) and computes the checksum. As the size
+    of every block is then known the offset of each block is computed and
+    the blocks are written in parallel (and in any order) with positional
+    writes to ``fileno``.
+
+    Parameters
+    ----------
+    fd : generic_io.RealFile
+        File to write to. Writing will start at the current position and
+        the file position is moved to the end of the written blocks.
+
+    fileno : int
+        File descriptor of ``fd`` used for the positional writes.
+
+    threads : int
+        Number of threads.
+
+    See `write_blocks` for the other parameters and return values.
+    """
+    to_write = [(blk, False) for blk in blocks]
+    if streamed_block is not None:
+        to_write.append((streamed_block, True))
+
+    # the threads use the config of this thread (for compressors from extensions)
+    config = get_config()
+
+    def plan(item):
+        blk, stream = item
+        with _use_config(config):
+            data = blk.data_bytes
+            header, buff, _ = bio.generate_write_header(
+                data,
+                stream,
+                blk.compression_kwargs,
+                padding,
+                fd.block_size,
+                write_checksums,
+                None if stream else blk._checksum,
+                compression=blk.compression,
+            )
+        return header, data if buff is None else buff.getbuffer()
+
+    with ThreadPoolExecutor(threads) as executor:
+        plans = list(executor.map(plan, to_write))
+
+        offsets = []
+        headers = []
+        regions = []
+        position = fd.tell()
+        for header, payload in plans:
+            header_bytes = bio.BLOCK_HEADER.pack(**header)
+            offsets.append(position)
+            headers.append(header)
+            regions.append((position, constants.BLOCK_MAGIC + struct.pack(">H", len(header_bytes)) + header_bytes))
+            position += len(regions[-1][1])
+            regions.append((position, payload))
+            if header["flags"] & constants.BLOCK_FLAG_STREAMED:
+                position += len(payload)
+            else:
+                position += header["allocated_size"]
+
+        # anything buffered (the tree) must be written before the blocks
+        fd.flush()
+        for future in [executor.submit(_pwrite, fileno, data, offset) for offset, data in regions]:
+            future.result()
+
+    # like write_blocks, padding after the last block is skipped (not written)
+    fd.seek(position)
+    return offsets, headers
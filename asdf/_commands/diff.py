@@ -3,11 +3,14 @@ Implementation of command for displaying differences between two ASDF files.
 """
 
 import argparse
+import io
+import math
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import jmespath
 import numpy as np
-from numpy import array_equal
 
 import asdf
 from asdf.extension._serialization_context import BlockAccess
@@ -20,6 +23,9 @@ __all__ = ["diff"]
 
 NDARRAY_TAG = "core/ndarray"
 
+# Upper bound (in bytes) on the size of the array chunks compared at once
+CHUNK_SIZE = 16 * 1024 * 1024
+
 
 class Diff(Command):  # pragma: no cover
     """This class is the plugin implementation for the asdftool runner."""
@@ -64,12 +70,20 @@ JMESPath expressions.
             help="JMESPath expression indicating tree nodes that should be ignored.",
         )
 
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="Number of threads used to compare array contents.",
+        )
+
         parser.set_defaults(func=cls.run)
         return parser
 
     @classmethod
     def run(cls, args):
-        return diff(args.filenames, args.minimal, ignore=args.ignore)
+        return diff(args.filenames, args.minimal, ignore=args.ignore, jobs=args.jobs)
 
 
 class ArrayNode:
@@ -134,6 +148,14 @@ class DiffContext:
         self.minimal = minimal
         self.print_tree = PrintTree()
 
+        # Executor used to compare array contents in the background (see
+        # _start_array_comparisons), the pending comparisons, by the path
+        # of the arrays in the trees, and a semaphore limiting the number
+        # of loaded arrays that are waiting to be compared
+        self.executor = None
+        self.array_comparisons = {}
+        self.array_slots = None
+
         if ignore_ids is None:
             self.ignore_ids = set()
         else:
@@ -269,6 +291,170 @@ def _load_array(asdf_file, array_dict):
     return conv.from_yaml_tree(array_dict, array_dict._tag, sctx)
 
 
+def _summaries_match(array0, array1):
+    """
+    Returns True if the summaries stored with both arrays (see
+    `asdf.tags.core.ndarray.compute_array_summary`) show that the
+    array contents are equal without loading the arrays.
+    """
+    summary0 = array0.get("summary")
+    summary1 = array1.get("summary")
+    if summary0 is None or summary1 is None or "md5" not in summary0:
+        return False
+    # equal bytes only imply equal values for arrays of the same type
+    # and byte order, and NaN values never compare equal
+    return (
+        summary0.get("md5") == summary1.get("md5")
+        and summary0.get("nan_count") == summary1.get("nan_count") == 0
+        and array0.get("byteorder") == array1.get("byteorder")
+    )
+
+
+def _blocks_match(diff_ctx, array0, array1):
+    """
+    Returns True if both arrays are identical views of internal blocks
+    with equal headers and (non-zero) checksums.
+    """
+    source0 = array0.get("source")
+    source1 = array1.get("source")
+    if not (isinstance(source0, int) and isinstance(source1, int)):
+        return False
+    for field in ["shape", "datatype", "byteorder", "offset", "strides"]:
+        if array0.get(field) != array1.get(field):
+            return False
+
+    try:
+        header0 = diff_ctx.asdf0._blocks.blocks[source0].header
+        header1 = diff_ctx.asdf1._blocks.blocks[source1].header
+    except IndexError:
+        return False
+    # the checksum is optional, a block without one is all zeros
+    if not any(header0["checksum"]):
+        return False
+    return all(header0[key] == header1[key] for key in ["checksum", "compression", "used_size", "data_size"])
+
+
+def _iter_chunk_indices(shape, itemsize, chunk_size=CHUNK_SIZE, prefix=()):
+    """
+    Iterate over indices that select consecutive (in C order) chunks
+    of an array of at most ``chunk_size`` bytes (or of one row of the
+    last axis, if that is larger).
+    """
+    if not shape:
+        yield prefix
+        return
+
+    row_size = itemsize * math.prod(shape[1:])
+    if row_size > chunk_size and len(shape) > 1:
+        for i in range(shape[0]):
+            yield from _iter_chunk_indices(shape[1:], itemsize, chunk_size, (*prefix, i))
+        return
+
+    step = max(chunk_size // max(row_size, 1), 1)
+    for start in range(0, shape[0], step):
+        yield (*prefix, slice(start, min(start + step, shape[0])))
+
+
+def _first_difference(value0, value1, chunk_size=CHUNK_SIZE):
+    """
+    Compare two arrays in chunks of at most ``chunk_size`` bytes so
+    that comparing (possibly memory mapped) arrays does not require
+    temporary arrays as large as the inputs.
+
+    Returns
+    -------
+    None or str
+        `None` if the arrays are equal, otherwise the first run of
+        unequal elements along the last axis as a numpy style index
+        (or an empty string if the arrays can not be compared element
+        by element).
+    """
+    if value0.shape != value1.shape:
+        return ""
+
+    itemsize = max(value0.itemsize, value1.itemsize)
+    for index in _iter_chunk_indices(value0.shape, itemsize, chunk_size):
+        equal = np.asarray(value0[index] == value1[index])
+        if equal.all():
+            continue
+        if equal.ndim == 0 or equal.shape != value0[index].shape:
+            return ""
+
+        # convert the position in the chunk to a position in the array
+        position = list(np.unravel_index(np.argmin(equal), equal.shape))
+        chunk_axis = len(index) - 1
+        position[0] += index[chunk_axis].start
+        position = [*index[:chunk_axis], *position]
+
+        # find the end of the run, which may extend past this chunk
+        row0 = value0[tuple(position[:-1])]
+        row1 = value1[tuple(position[:-1])]
+        start = position[-1]
+        stop = start + 1
+        step = max(chunk_size // itemsize, 1)
+        while stop < len(row0):
+            equal = np.asarray(row0[stop : stop + step] == row1[stop : stop + step])
+            if equal.any():
+                stop += int(np.argmax(equal))
+                break
+            stop += len(equal)
+
+        items = [str(i) for i in position]
+        if stop - start > 1:
+            items[-1] = f"{start}:{stop}"
+        return f"[{', '.join(items)}]"
+    return None
+
+
+def _compare_array_contents(diff_ctx, array0, array1, keys):
+    """
+    Compare the contents of two arrays (at the path ``keys`` in the
+    trees), or when the context has an executor, load the arrays and
+    queue the comparison.
+    """
+    # the path identifies the comparison in both traversals of the trees
+    # (inline arrays are compared using temporary wrappers, so the ids
+    # of the array nodes may be reused)
+    key = tuple(("item", k.index) if isinstance(k, ArrayNode) else k for k in keys)
+    if key in diff_ctx.array_comparisons:
+        return diff_ctx.array_comparisons.pop(key).result()
+
+    if diff_ctx.executor is None:
+        value0 = np.asarray(_load_array(diff_ctx.asdf0, array0))
+        value1 = np.asarray(_load_array(diff_ctx.asdf1, array1))
+        return _first_difference(value0, value1)
+
+    # Wait for a slot before loading so that only a few decoded arrays
+    # are held by queued comparisons at any time
+    diff_ctx.array_slots.acquire()
+    try:
+        value0 = np.asarray(_load_array(diff_ctx.asdf0, array0))
+        value1 = np.asarray(_load_array(diff_ctx.asdf1, array1))
+        future = diff_ctx.executor.submit(_first_difference, value0, value1)
+    except BaseException:
+        diff_ctx.array_slots.release()
+        raise
+    future.add_done_callback(lambda _: diff_ctx.array_slots.release())
+    diff_ctx.array_comparisons[key] = future
+    return None
+
+
+def _start_array_comparisons(diff_ctx, executor, jobs):
+    """
+    Traverse the trees without displaying the differences to start
+    comparing the contents of all arrays with the executor.  At most
+    ``2 * jobs`` comparisons are in flight, the traversal waits for
+    earlier comparisons to finish before loading more arrays.
+    """
+    collect_ctx = DiffContext(
+        diff_ctx.asdf0, diff_ctx.asdf1, io.StringIO(), minimal=diff_ctx.minimal, ignore_ids=diff_ctx.ignore_ids
+    )
+    collect_ctx.executor = executor
+    collect_ctx.array_slots = threading.BoundedSemaphore(2 * jobs)
+    collect_ctx.array_comparisons = diff_ctx.array_comparisons
+    compare_trees(collect_ctx, diff_ctx.asdf0.tree, diff_ctx.asdf1.tree)
+
+
 def _human_list(line, separator="and"):
     """
     Formats a list for human readability.
@@ -304,7 +490,7 @@ def compare_ndarrays(diff_ctx, array0, array1, keys):
     if isinstance(array1, list):
         array1 = {"data": array1}
 
-    ignore_keys = {"source", "data"}
+    ignore_keys = {"source", "data", "summary"}
     compare_dicts(diff_ctx, array0, array1, keys, ignore_keys)
 
     differences = []
@@ -312,14 +498,18 @@ def compare_ndarrays(diff_ctx, array0, array1, keys):
         if array0.get(field) != array1.get(field):
             differences.append(field)
 
-    value0 = _load_array(diff_ctx.asdf0, array0)
-    value1 = _load_array(diff_ctx.asdf1, array1)
-
-    if not array_equal(value0, value1):
-        differences.append("contents")
+    first_difference = None
+    if differences or not (_summaries_match(array0, array1) or _blocks_match(diff_ctx, array0, array1)):
+        first_difference = _compare_array_contents(diff_ctx, array0, array1, keys)
+        if diff_ctx.executor is not None:
+            return
+        if first_difference is not None:
+            differences.append("contents")
 
     if differences:
         msg = f"ndarrays differ by {_human_list(differences)}"
+        if first_difference:
+            msg += f" (first difference at {first_difference})"
         print_in_tree(diff_ctx, keys, msg, False, ignore_lwl=True)
         print_in_tree(diff_ctx, keys, msg, True, ignore_lwl=True)
 
@@ -374,7 +564,7 @@ def compare_trees(diff_ctx, tree0, tree1, keys=None):
         compare_objects(diff_ctx, tree0, tree1, keys)
 
 
-def diff(filenames, minimal, iostream=sys.stdout, ignore=None):
+def diff(filenames, minimal, iostream=sys.stdout, ignore=None, jobs=1):
     """
     Compare two ASDF files and write diff output to the stdout
     or the specified I/O stream.
@@ -393,15 +583,20 @@ def diff(filenames, minimal, iostream=sys.stdout, ignore=None):
     ignore : list of str, optional
         List of JMESPath expressions indicating tree nodes that
         should be ignored.
+
+    jobs : int, optional
+        Number of threads used to compare array contents.  Defaults
+        to 1.
     """
     ignore_expressions = [] if ignore is None else [jmespath.compile(e) for e in ignore]
 
     try:
         with (
-            asdf.open(filenames[0], _force_raw_types=True) as asdf0,
+            asdf.open(filenames[0], _force_raw_types=True, memmap=True) as asdf0,
             asdf.open(
                 filenames[1],
                 _force_raw_types=True,
+                memmap=True,
             ) as asdf1,
         ):
             ignore_ids = set()
@@ -418,7 +613,12 @@ def diff(filenames, minimal, iostream=sys.stdout, ignore=None):
                             ignore_ids.add(id(value))
 
             diff_ctx = DiffContext(asdf0, asdf1, iostream, minimal=minimal, ignore_ids=ignore_ids)
-            compare_trees(diff_ctx, asdf0.tree, asdf1.tree)
+            if jobs == 1:
+                compare_trees(diff_ctx, asdf0.tree, asdf1.tree)
+            else:
+                with ThreadPoolExecutor(jobs) as executor:
+                    _start_array_comparisons(diff_ctx, executor, jobs)
+                    compare_trees(diff_ctx, asdf0.tree, asdf1.tree)
 
     except ValueError as err:
         raise RuntimeError(str(err)) from err
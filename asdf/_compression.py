@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import bz2
+import io
+import json
 import struct
+import time
 import typing
 import warnings
 import zlib
@@ -13,12 +16,37 @@ from .config import get_config
 from .exceptions import AsdfWarning
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
     from io import IOBase
 
     from asdf.generic_io import GenericFile
     from asdf.typing import ByteArray1D, Compression
 
 
+# Compression types that write self-delimiting frames which can be decompressed
+# one at a time without knowing the compressed size. Only these can be used
+# for streamed blocks (which can be appended to indefinitely).
+FRAMED_COMPRESSIONS = ("lz4",)
+
+# Compression types tried by "auto" compression (see choose_compression)
+AUTO_COMPRESSIONS = ("zlib", "bzp2", "lz4")
+
+# Objectives used by "auto" compression to pick a compression type
+AUTO_OBJECTIVES = ("size", "speed", "balanced")
+
+# Default read bandwidth (in bytes per second) used by the "balanced" objective
+DEFAULT_AUTO_BANDWIDTH = 500 * 1024**2
+
+# Filters that can be applied to the data before it is compressed (see apply_filters)
+FILTERS = ("shuffle", "bitshuffle", "delta", "truncate")
+
+# Number of bytes passed to the zlib and bz2 compressors at a time
+_COMPRESSION_CHUNK_SIZE = 1 << 22
+
+# Number of elements transposed together by the bitshuffle filter
+_BITSHUFFLE_CHUNK_SIZE = 8192
+
+
 def validate(compression: str | bytes | None) -> str | None:
     """
     Validate the compression string.
@@ -44,7 +72,7 @@ def validate(compression: str | bytes | None) -> str | None:
 
     compression = compression.strip("\0")
 
-    builtin_labels = ["zlib", "bzp2", "lz4", "input"]
+    builtin_labels = ["zlib", "bzp2", "lz4", "filt", "input", "auto"]
     ext_labels = _get_all_compression_extension_labels()
     all_labels = ext_labels + builtin_labels
 
@@ -86,13 +114,16 @@ class Lz4Compressor:
             header = struct.pack("!I", len(_output))
             yield header + _output
 
-    def decompress(self, blocks, out, **kwargs):
+    def decompress_frames(self, blocks, **kwargs):
+        """
+        Decompress the length-prefixed frames (as written by `compress`)
+        in ``blocks`` (an iterable of bytes-like objects), yielding the
+        decompressed data for each frame.
+        """
         _size = 0
         _pos = 0
         _partial_len = b""
         _buffer = None
-        bytesout = 0
-
         for block in blocks:
             cast = "c"
             blk = memoryview(block).cast(cast)  # don't copy on slice
@@ -133,26 +164,44 @@ class Lz4Compressor:
                     blk = blk[newbytes:]
 
                     if _pos == _size:
-                        _out = self._api.decompress(_buffer, return_bytearray=True, **kwargs)
-                        out[bytesout : bytesout + len(_out)] = _out
-                        bytesout += len(_out)
+                        yield self._api.decompress(_buffer, return_bytearray=True, **kwargs)
                         _buffer = None
                         _size = 0
                 else:
                     # We have at least one full block
-                    _out = self._api.decompress(memoryview(blk[:_size]), return_bytearray=True, **kwargs)
-                    out[bytesout : bytesout + len(_out)] = _out
-                    bytesout += len(_out)
+                    yield self._api.decompress(memoryview(blk[:_size]), return_bytearray=True, **kwargs)
                     blk = blk[_size:]
                     _size = 0
 
+        if _size or _partial_len:
+            msg = "Compressed data ends with an incomplete frame"
+            raise ValueError(msg)
+
+    def decompress(self, blocks, out, **kwargs):
+        bytesout = 0
+        for _out in self.decompress_frames(blocks, **kwargs):
+            out[bytesout : bytesout + len(_out)] = _out
+            bytesout += len(_out)
         return bytesout
 
 
+def _compress_chunks(compressor, data):
+    """
+    Compress ``data`` in chunks with a zlib or bz2 style ``compressor``
+    (with ``compress`` and ``flush`` methods) so the compressed data can be
+    written as it is produced.
+    """
+    view = memoryview(data).cast("B")
+    for i in range(0, len(view), _COMPRESSION_CHUNK_SIZE):
+        if comp := compressor.compress(view[i : i + _COMPRESSION_CHUNK_SIZE]):
+            yield comp
+    yield compressor.flush()
+
+
 class ZlibCompressor:
     def compress(self, data, **kwargs):
-        comp = zlib.compress(data, **kwargs)
-        yield comp
+        compressor = zlib.compressobj(**kwargs)
+        yield from _compress_chunks(compressor, data)
 
     def decompress(self, blocks, out, **kwargs):
         decompressor = zlib.decompressobj(**kwargs)
@@ -166,9 +215,9 @@ class ZlibCompressor:
 
 
 class Bzp2Compressor:
-    def compress(self, data, **kwargs):
-        comp = bz2.compress(data, **kwargs)
-        yield comp
+    def compress(self, data, compresslevel=9):
+        compressor = bz2.BZ2Compressor(compresslevel)
+        yield from _compress_chunks(compressor, data)
 
     def decompress(self, blocks, out, **kwargs):
         decompressor = bz2.BZ2Decompressor(**kwargs)
@@ -181,6 +230,212 @@ class Bzp2Compressor:
         return i
 
 
+class FilterCompressor:
+    """
+    Compressor for the "filt" compression type where the data is passed
+    through a chain of filters (see `apply_filters`) before it is
+    compressed with another compression type.
+
+    The compressed data starts with the length (as a big-endian 2 byte
+    integer) of a JSON encoded preamble containing the compression type,
+    the filters and the dtype of the array, which is all that is needed
+    to decompress the data.
+    """
+
+    def compress(self, data, compression="zlib", filters=("shuffle",), dtype="u1", **kwargs):
+        compression = validate(compression)
+        if compression in (None, "filt", "input", "auto"):
+            msg = f"Filtered data can not use '{compression}' compression"
+            raise ValueError(msg)
+        dtype = np.dtype(dtype)
+        filters = normalize_filters(filters, dtype)
+        preamble = json.dumps({"compression": compression, "filters": filters, "dtype": dtype.str}).encode("ascii")
+        yield struct.pack(">H", len(preamble)) + preamble
+        data = apply_filters(np.frombuffer(data, np.uint8), filters, dtype)
+        yield from _get_compressor(compression).compress(data, **kwargs)
+
+    @staticmethod
+    def preamble_size(buff):
+        """
+        Size of the preamble at the start of ``buff`` (which must contain
+        at least 2 bytes).
+        """
+        return 2 + struct.unpack(">H", bytes(buff[:2]))[0]
+
+    @staticmethod
+    def parse_preamble(buff):
+        """
+        Parse the preamble at the start of ``buff`` into the compression
+        options (``compression``, ``filters`` and ``dtype``) used to write
+        the data.
+        """
+        return json.loads(bytes(buff[2 : FilterCompressor.preamble_size(buff)]))
+
+    def decompress(self, blocks, out, **kwargs):
+        blocks = iter(blocks)
+        buff = b""
+        while len(buff) < 2 or len(buff) < self.preamble_size(buff):
+            block = next(blocks, None)
+            if block is None:
+                msg = "Filtered data ends before the end of its preamble"
+                raise ValueError(msg)
+            buff += bytes(block)
+        end = self.preamble_size(buff)
+        config = self.parse_preamble(buff)
+        dtype = np.dtype(config["dtype"])
+
+        def _blocks():
+            yield buff[end:]
+            yield from blocks
+
+        decoder = _get_compressor(config["compression"])
+        n_bytes = decoder.decompress(_blocks(), out=out, **kwargs)
+        data = np.frombuffer(out, np.uint8, n_bytes)
+        data[:] = apply_filters(data, config["filters"], dtype, inverse=True)
+        return n_bytes
+
+
+def normalize_filters(filters: Iterable[str | dict[str, Any]], dtype: np.dtype) -> list[dict[str, Any]]:
+    """
+    Check that the filters can be used for an array of ``dtype`` and
+    convert them to a list of dicts with a ``name`` (one of ``FILTERS``)
+    and any other settings for the filter.
+
+    Parameters
+    ----------
+    filters : list of str or dict
+        The filters (applied in order). Each filter is a name from
+        ``FILTERS`` or a dict with a ``name``:
+
+        - ``shuffle``: Group the first bytes of all elements, then the
+          second bytes and so on.
+
+        - ``bitshuffle``: Like ``shuffle`` but for each bit of the elements
+          (in chunks of 8192 elements).
+
+        - ``delta``: Store the difference between each element (as an
+          unsigned integer) and the previous element. Requires an
+          itemsize of 1, 2, 4 or 8 bytes.
+
+        - ``truncate``: For floating point arrays, keep only the most
+          significant ``bits`` bits of the mantissa (the other bits are set
+          to 0). This filter is lossy.
+
+    dtype : numpy.dtype
+        The dtype of the array.
+
+    Returns
+    -------
+    filters : list of dict
+
+    Raises
+    ------
+    ValueError
+        If a filter is unknown or can't be used for this dtype.
+    """
+    if isinstance(filters, (str, dict)):
+        filters = [filters]
+    normalized = []
+    for filt in filters:
+        filt = {"name": filt} if isinstance(filt, str) else dict(filt)
+        name = filt.get("name")
+        if name not in FILTERS:
+            msg = f"Supported filters are: {list(FILTERS)}, not '{name}'"
+            raise ValueError(msg)
+        if name == "delta" and dtype.itemsize not in (1, 2, 4, 8):
+            msg = f"The delta filter can not be used for dtype {dtype}"
+            raise ValueError(msg)
+        if name == "truncate":
+            if dtype.kind != "f" or dtype.itemsize not in (2, 4, 8):
+                msg = f"The truncate filter can only be used for float16, float32 or float64 arrays, not {dtype}"
+                raise ValueError(msg)
+            bits = filt.get("bits")
+            n_mantissa = np.finfo(dtype).nmant
+            if not isinstance(bits, int) or not 0 <= bits <= n_mantissa:
+                msg = f"The truncate filter requires bits between 0 and {n_mantissa}, not {bits}"
+                raise ValueError(msg)
+        normalized.append(filt)
+    return normalized
+
+
+def apply_filters(
+    data: ByteArray1D, filters: list[dict[str, Any]], dtype: np.dtype, inverse: bool = False
+) -> ByteArray1D:
+    """
+    Apply ``filters`` (see `normalize_filters`) in order to ``data``
+    (a one-dimensional uint8 array containing elements of ``dtype``), or
+    undo them (in reverse order) if ``inverse`` is set. ``data`` is
+    not modified.
+
+    Any bytes after the last complete element are not filtered.
+    """
+    itemsize = dtype.itemsize
+    n_bytes = data.size // itemsize * itemsize
+    result = data[:n_bytes]
+    for filt in reversed(filters) if inverse else filters:
+        name = filt["name"]
+        if name == "shuffle":
+            shape = (itemsize, -1) if inverse else (-1, itemsize)
+            result = result.reshape(shape).T.ravel()
+        elif name == "bitshuffle":
+            result = _bitshuffle(result, itemsize, inverse)
+        else:
+            # these filters use the elements as unsigned integers
+            uint_dtype = np.dtype(f"u{itemsize}").newbyteorder(dtype.byteorder)
+            values = result.view(uint_dtype)
+            if name == "delta":
+                if inverse:
+                    values = np.cumsum(values, dtype=uint_dtype.newbyteorder("="))
+                else:
+                    values = np.diff(values, prepend=np.zeros(1, uint_dtype))
+            elif not inverse:  # truncate, which can't be undone
+                n_zeroed = np.finfo(dtype).nmant - filt["bits"]
+                values = values & ~np.array((1 << n_zeroed) - 1, uint_dtype.newbyteorder("="))
+            result = values.astype(uint_dtype, copy=False).view(np.uint8)
+    if result is data[:n_bytes]:
+        result = result.copy()
+    if n_bytes == data.size:
+        return result
+    return np.concatenate([result, data[n_bytes:]])
+
+
+def _bitshuffle(data: ByteArray1D, itemsize: int, inverse: bool) -> ByteArray1D:
+    """
+    Transpose the bits of the elements in ``data`` (in chunks of
+    ``_BITSHUFFLE_CHUNK_SIZE`` elements to limit the memory used).
+    """
+    out = np.empty_like(data)
+    chunk_size = _BITSHUFFLE_CHUNK_SIZE * itemsize
+    for start in range(0, data.size, chunk_size):
+        chunk = data[start : start + chunk_size]
+        n_elements = chunk.size // itemsize
+        if inverse:
+            bits = np.unpackbits(chunk).reshape(8 * itemsize, n_elements)
+            out[start : start + chunk.size] = np.packbits(bits.T, axis=1).ravel()
+        else:
+            bits = np.unpackbits(chunk.reshape(n_elements, itemsize), axis=1)
+            out[start : start + chunk.size] = np.packbits(bits.T)
+    return out
+
+
+def is_framed(compression: str | bytes | None) -> bool:
+    """
+    Check if the compression writes self-delimiting frames (see
+    ``FRAMED_COMPRESSIONS``) which is required for compressed streamed blocks.
+    A builtin compression overridden by an extension is not considered framed.
+
+    Parameters
+    ----------
+    compression : str, bytes or None
+
+    Returns
+    -------
+    framed : bool
+    """
+    compression = validate(compression)
+    return compression in FRAMED_COMPRESSIONS and _get_compressor_from_extensions(compression) is None
+
+
 def _get_compressor_from_extensions(compression, return_extension=False):
     """
     Look at the loaded ASDF extensions and return the first one (if any)
@@ -227,6 +482,8 @@ def _get_compressor(label: str) -> Any:
         comp = Bzp2Compressor()
     elif label == "lz4":
         comp = Lz4Compressor()
+    elif label == "filt":
+        comp = FilterCompressor()
     else:
         msg = f"Unknown compression type: '{label}'"
         raise ValueError(msg)
@@ -249,7 +506,12 @@ def to_compression_header(compression: Compression) -> bytes:
 
 
 def decompress(
-    fd: GenericFile, used_size: int, data_size: int, compression: str, config: dict[Any, Any] | None = None
+    fd: GenericFile,
+    used_size: int,
+    data_size: int,
+    compression: str,
+    config: dict[Any, Any] | None = None,
+    out: ByteArray1D | None = None,
 ) -> ByteArray1D:
     """
     Decompress binary data in a file
@@ -272,12 +534,16 @@ def decompress(
         Any kwarg parameters to pass to the underlying decompression
         function
 
+    out : numpy.array or None, optional
+        A flat uint8 array of ``data_size`` bytes to decompress the data
+        into. If not provided a new array is allocated.
+
     Returns
     -------
     array : numpy.array
          A flat uint8 containing the decompressed data.
     """
-    buffer = np.empty((data_size,), np.uint8)
+    buffer = np.empty((data_size,), np.uint8) if out is None else out
 
     compression = typing.cast("str", validate(compression))
     decoder = _get_compressor(compression)
@@ -294,6 +560,40 @@ def decompress(
     return buffer
 
 
+def decompress_frames(
+    blocks: Iterable[bytes],
+    compression: str | bytes,
+    config: dict[Any, Any] | None = None,
+) -> Iterator[ByteArray1D]:
+    """
+    Decompress framed compressed data one frame at a time.
+
+    Parameters
+    ----------
+    blocks : iterable of bytes
+        The compressed data (split at arbitrary positions), for example
+        as returned by `asdf.generic_io.GenericFile.read_blocks`.
+
+    compression : str
+        The compression type used, must be one of ``FRAMED_COMPRESSIONS``.
+
+    config : dict or None, optional
+        Any kwarg parameters to pass to the underlying decompression
+        function
+
+    Yields
+    ------
+    array : numpy.array
+         A flat uint8 array containing the decompressed data for one frame.
+    """
+    if not is_framed(compression):
+        msg = f"Compression type '{validate(compression)}' does not support decompressing frames"
+        raise ValueError(msg)
+    decoder = _get_compressor(typing.cast("str", validate(compression)))
+    for frame in decoder.decompress_frames(blocks, **(config or {})):
+        yield np.frombuffer(frame, np.uint8)
+
+
 def compress(
     fd: GenericFile | IOBase,
     data: ByteArray1D | bytes | bytearray,
@@ -375,3 +675,118 @@ def get_compressed_size(
     compress(bcf, data, compression, config=config)  # pyrefly: ignore [bad-argument-type]
 
     return bcf.count
+
+
+def _sample(data: ByteArray1D, sample_size: int, n_chunks: int = 8) -> ByteArray1D:
+    """
+    Take ``n_chunks`` evenly spaced chunks (totalling ``sample_size`` bytes)
+    from ``data``.
+    """
+    if data.nbytes <= sample_size:
+        return data
+    chunk_size = sample_size // n_chunks
+    # keep the chunks aligned to preserve the structure of the data
+    starts = np.linspace(0, data.nbytes - chunk_size, n_chunks).astype(int) // 8 * 8
+    return np.concatenate([data[start : start + chunk_size] for start in starts])
+
+
+def choose_compression(
+    data: ByteArray1D,
+    objective: str = "balanced",
+    candidates: Iterable[str] | None = None,
+    bandwidth: float = DEFAULT_AUTO_BANDWIDTH,
+    sample_size: int = 1 << 20,
+    min_ratio: float = 0.9,
+    filters: list[dict[str, Any]] | None = None,
+    dtype: np.dtype | None = None,
+) -> str | None:
+    """
+    Choose the compression type for ``data`` (used for ``"auto"``
+    compression).
+
+    A sample of ``data`` is compressed and decompressed with each
+    candidate compression type, and the best one for the objective
+    is returned.
+
+    Parameters
+    ----------
+    data : numpy.ndarray
+        A one-dimensional ndarray of dtype uint8.
+
+    objective : str, optional
+        One of:
+
+        - ``size``: the smallest compressed size.
+
+        - ``speed``: the fastest decompression.
+
+        - ``balanced``: the shortest time to read (at ``bandwidth``) and
+          decompress the data. This can be no compression.
+
+    candidates : iterable of str, optional
+        The compression types to try. Defaults to the available
+        compression types in ``AUTO_COMPRESSIONS``.
+
+    bandwidth : float, optional
+        The read bandwidth (in bytes per second) assumed by the
+        ``balanced`` objective.
+
+    sample_size : int, optional
+        The number of bytes of ``data`` that are compressed to
+        compare the compression types.
+
+    min_ratio : float, optional
+        Compression that does not reduce the size of the sample to
+        at most this fraction is never used, so incompressible data
+        is not compressed.
+
+    filters : list of dict, optional
+        Filters (see `normalize_filters`) applied to the sample
+        before it is compressed.
+
+    dtype : numpy.dtype, optional
+        The dtype of the array, used by the filters.
+
+    Returns
+    -------
+    compression : str or None
+        The chosen compression type or `None` for no compression.
+    """
+    if objective not in AUTO_OBJECTIVES:
+        msg = f"Compression objective must be one of {AUTO_OBJECTIVES}, not '{objective}'"
+        raise ValueError(msg)
+    if not data.nbytes:
+        return None
+    if candidates is None:
+        candidates = AUTO_COMPRESSIONS
+    sample = _sample(data, sample_size)
+    if filters:
+        sample = apply_filters(sample, filters, np.dtype(dtype))
+
+    results = []
+    for label in candidates:
+        label = typing.cast("str", validate(label))
+        try:
+            decoder = _get_compressor(label)
+        except ImportError:
+            # an optional library (like lz4) is not installed
+            continue
+        buff = io.BytesIO()
+        compress(buff, sample, label)
+        if buff.tell() > min_ratio * sample.nbytes:
+            continue
+        out = np.empty(sample.nbytes, np.uint8)
+        start = time.perf_counter()
+        decoder.decompress([buff.getvalue()], out=out.data)
+        results.append((label, buff.tell(), time.perf_counter() - start))
+
+    if not results:
+        return None
+    if objective == "size":
+        return min(results, key=lambda result: result[1:])[0]
+    if objective == "speed":
+        return min(results, key=lambda result: result[2])[0]
+    label, size, seconds = min(results, key=lambda result: result[1] / bandwidth + result[2])
+    if size / bandwidth + seconds >= sample.nbytes / bandwidth:
+        return None
+    return label
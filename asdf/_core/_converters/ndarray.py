@@ -23,14 +23,20 @@ class NDArrayConverter(Converter):
 
         from asdf import config, util
         from asdf._block.options import Options
-        from asdf.tags.core.ndarray import NDArrayType, numpy_array_to_list, numpy_dtype_to_asdf_datatype
+        from asdf.tags.core.ndarray import (
+            NDArrayType,
+            _InlineNumericArray,
+            compute_array_summary,
+            numpy_array_to_list,
+            numpy_dtype_to_asdf_datatype,
+        )
         from asdf.tags.core.stream import Stream
 
         data = obj
 
         if isinstance(obj, Stream):
             # previously, stream never passed on data, we can do that here
-            ctx._blocks.set_streamed_write_block(data._array, data)
+            ctx._blocks.set_streamed_write_block(data._array, data, data._compression, data._compression_kwargs)
 
             result = {}
             result["source"] = -1
@@ -41,6 +47,29 @@ class NDArrayConverter(Converter):
                 result["strides"] = data._strides
             return result
 
+        cfg = config.get_config()
+
+        # when appending, an array that was never loaded keeps its block (and is not read)
+        if (
+            isinstance(obj, NDArrayType)
+            and obj._array is None
+            and obj._mask is None
+            and cfg.all_array_storage is None
+            and cfg.all_array_compression == "input"
+            and cfg.array_inline_threshold is None
+            and (not cfg.array_summary or obj._summary is not None)
+            and (source := ctx._blocks._unloaded_block_index(obj._data_callback)) is not None
+        ):
+            dtype, byteorder = numpy_dtype_to_asdf_datatype(obj._dtype)
+            result = {"shape": list(obj._shape), "source": source, "datatype": dtype, "byteorder": byteorder}
+            if obj._offset:
+                result["offset"] = obj._offset
+            if obj._strides is not None:
+                result["strides"] = list(obj._strides)
+            if cfg.array_summary:
+                result["summary"] = obj._summary
+            return result
+
         # sort out block writing options
         if isinstance(obj, NDArrayType) and isinstance(obj._source, str):
             # this is an external block, if we have no other settings, keep it as external
@@ -58,7 +87,6 @@ class NDArrayConverter(Converter):
 
         # Use the base array if that option is set or if the option
         # is unset and the AsdfConfig default is set
-        cfg = config.get_config()
         if options.save_base or (options.save_base is None and cfg.default_array_save_base):
             base = util.get_array_base(data)
         else:
@@ -105,8 +133,11 @@ class NDArrayConverter(Converter):
             result["shape"][0] = "*"
 
         if options.storage_type == "inline":
-            listdata = numpy_array_to_list(data)
-            result["data"] = listdata
+            array = data._make_array() if isinstance(data, NDArrayType) else data
+            if _InlineNumericArray.supports(array):
+                result["data"] = _InlineNumericArray(np.asarray(array))
+            else:
+                result["data"] = numpy_array_to_list(data)
             result["datatype"] = dtype
 
         else:
@@ -114,7 +145,7 @@ class NDArrayConverter(Converter):
             if options.storage_type == "streamed":
                 result["shape"][0] = "*"
                 result["source"] = -1
-                ctx._blocks.set_streamed_write_block(base, data)
+                ctx._blocks.set_streamed_write_block(base, data, options.compression, options.compression_kwargs)
             else:
                 result["source"] = ctx._blocks.make_write_block(base, options, obj)
             result["datatype"] = dtype
@@ -126,6 +157,9 @@ class NDArrayConverter(Converter):
             if strides is not None:
                 result["strides"] = list(strides)
 
+            if cfg.array_summary and options.storage_type != "streamed" and not isinstance(data, ma.MaskedArray):
+                result["summary"] = compute_array_summary(np.asarray(data))
+
         if isinstance(data, ma.MaskedArray):
             if options.storage_type == "inline":
                 ctx._blocks._set_array_storage(data.mask, "inline")
@@ -163,11 +197,12 @@ class NDArrayConverter(Converter):
             offset = node.get("offset", 0)
             strides = node.get("strides", None)
             mask = node.get("mask", None)
+            summary = node.get("summary", None)
 
             if isinstance(source, int):
                 # internal block
                 data_callback = ctx.get_block_data_callback(source)
-                instance = NDArrayType(source, shape, dtype, offset, strides, "A", mask, data_callback)
+                instance = NDArrayType(source, shape, dtype, offset, strides, "A", mask, data_callback, summary)
             elif isinstance(source, str):
                 # external
                 def data_callback(_attr=None, _ref=weakref.ref(ctx._blocks)):
@@ -181,7 +216,7 @@ class NDArrayConverter(Converter):
                     blks._set_array_storage(array, "external")
                     return array
 
-                instance = NDArrayType(source, shape, dtype, offset, strides, "A", mask, data_callback)
+                instance = NDArrayType(source, shape, dtype, offset, strides, "A", mask, data_callback, summary)
             else:
                 # inline
                 instance = NDArrayType(source, shape, dtype, offset, strides, "A", mask)
@@ -195,4 +230,10 @@ class NDArrayConverter(Converter):
         raise TypeError(msg)
 
     def to_info(self, obj):
-        return {"shape": obj.shape, "dtype": obj.dtype}
+        from asdf.tags.core import NDArrayType
+
+        info = {"shape": obj.shape, "dtype": obj.dtype}
+        # the summary is only available for arrays read from a file
+        if isinstance(obj, NDArrayType) and obj.summary is not None:
+            info["summary"] = obj.summary
+        return info
@@ -62,21 +62,26 @@ def render_tree(
     """
     Render a tree as text with indents showing depth.
     """
+    renderer = _TreeRenderer(
+        max_rows,
+        max_cols,
+        show_values,
+    )
+
+    # Only build (and for lazy trees, convert) the part of the
+    # tree that fits in max_rows.
+    renderer._reset_rows()
     info = create_tree(
         key="title",
         node=node,
         identifier=identifier,
         filters=[] if filters is None else filters,
         extension_manager=extension_manager,
+        expand=renderer._count_visible_children,
     )
     if info is None:
         return []
 
-    renderer = _TreeRenderer(
-        max_rows,
-        max_cols,
-        show_values,
-    )
     return renderer.render(info)
 
 
@@ -129,79 +134,60 @@ class _TreeRenderer:
         Select nodes to display, respecting max_rows.  Nodes at lower
         depths will be prioritized.
         """
-        if isinstance(self._max_rows, tuple):
-            self._mark_visible_tuple(root_info)
-        else:
-            self._mark_visible_int(root_info)
-
-    def _mark_visible_int(self, root_info):
-        """
-        Select nodes to display, obeying max_rows as an overall limit on
-        the number of lines returned.
-        """
-        if self._max_rows is None:
-            return
-
-        if self._max_rows < 2:
+        if isinstance(self._max_rows, int) and self._max_rows < 2:
             root_info.visible = False
             return
 
+        self._reset_rows()
         current_infos = [root_info]
-        # Reserve one row for the root node, and another for the
-        # "Some nodes not shown." message.
-        rows_left = self._max_rows - 2
         while True:
             next_infos = []
 
             for info in current_infos:
-                if rows_left >= len(info.children):
-                    rows_left -= len(info.children)
-                    next_infos.extend(info.children)
-                elif rows_left > 1:
-                    for child in info.children[rows_left - 1 :]:
-                        child.visible = False
-                    next_infos.extend(info.children[0 : rows_left - 1])
-                    rows_left = 0
-                else:
-                    for child in info.children:
-                        child.visible = False
+                num_visible = self._count_visible_children(info, len(info.children))
+                for child in info.children[num_visible:]:
+                    child.visible = False
+                next_infos.extend(info.children[:num_visible])
 
             if len(next_infos) == 0:
                 break
 
             current_infos = next_infos
 
-    def _mark_visible_tuple(self, root_info):
+    def _reset_rows(self):
+        if isinstance(self._max_rows, int):
+            # Reserve one row for the root node, and another for the
+            # "Some nodes not shown." message.
+            self._rows_left = self._max_rows - 2
+
+    def _count_visible_children(self, info, num_children):
         """
-        Select nodes to display, obeying the per-node max_rows value for
-        each tree depth.
+        Get the number of the first children of a node to display.
+        Must be called for each node in breadth-first order (after
+        `_reset_rows`) since, for an int max_rows, the rows are allotted
+        to the nodes at lower depths first.
         """
-        max_rows = (None, *self._max_rows)
-
-        current_infos = [root_info]
-        while True:
-            next_infos = []
-
-            for info in current_infos:
-                if info.depth + 1 < len(max_rows):
-                    rows_left = max_rows[info.depth + 1]
-                    if rows_left is None or rows_left >= len(info.children):
-                        next_infos.extend(info.children)
-                    elif rows_left > 1:
-                        for child in info.children[rows_left - 1 :]:
-                            child.visible = False
-                        next_infos.extend(info.children[0 : rows_left - 1])
-                    else:
-                        for child in info.children:
-                            child.visible = False
-                else:
-                    for child in info.children:
-                        child.visible = False
-
-            if len(next_infos) == 0:
-                break
+        if self._max_rows is None:
+            return num_children
 
-            current_infos = next_infos
+        if isinstance(self._max_rows, tuple):
+            # Obey the per-node max_rows value for each tree depth
+            if info.depth >= len(self._max_rows):
+                return 0
+            rows_left = self._max_rows[info.depth]
+            if rows_left is None or rows_left >= num_children:
+                return num_children
+            return rows_left - 1 if rows_left > 1 else 0
+
+        # Obey max_rows as an overall limit on the number of lines returned
+        if self._rows_left >= num_children:
+            self._rows_left -= num_children
+            return num_children
+        if self._rows_left > 1:
+            num_visible = self._rows_left - 1
+            self._rows_left = 0
+            return num_visible
+        return 0
 
     def _render(self, info, active_depths, is_tail):
         """
@@ -220,10 +206,10 @@ class _TreeRenderer:
 
         lines.append(self._render_node(info, active_depths, is_tail))
 
-        elided = len(info.visible_children) < len(info.children)
+        elided = len(info.visible_children) < info.num_children
 
         for i, child in enumerate(info.visible_children):
-            if i == len(info.children) - 1:
+            if i == info.num_children - 1:
                 child_is_tail = True
                 child_active_depths = active_depths
             else:
@@ -235,8 +221,8 @@ class _TreeRenderer:
             elided = elided or child_elided
 
         num_visible_children = len(info.visible_children)
-        if num_visible_children > 0 and num_visible_children != len(info.children):
-            hidden_count = len(info.children) - num_visible_children
+        if num_visible_children > 0 and num_visible_children != info.num_children:
+            hidden_count = info.num_children - num_visible_children
             prefix = self._make_prefix(info.depth + 1, active_depths, True)
             message = self.format_faint(self.format_italic(str(hidden_count) + " not shown"))
             lines.append(f"{prefix}{message}")
@@ -256,7 +242,7 @@ class _TreeRenderer:
         if info.info is not None:
             line = line + self.format_faint(self.format_italic(" # " + info.info))
         visible_children = info.visible_children
-        if len(visible_children) == 0 and len(info.children) > 0:
+        if len(visible_children) == 0 and info.num_children > 0:
             line = line + self.format_italic(" ...")
 
         if info.recursive:
@@ -271,7 +257,7 @@ class _TreeRenderer:
     def _render_node_value(self, info):
         rendered_type = type(info.node).__name__
 
-        if not info.children and self._show_values:
+        if not info.num_children and self._show_values:
             try:
                 s = f"{info.node}"
             except Exception:
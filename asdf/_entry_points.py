@@ -1,9 +1,18 @@
+import functools
+import hashlib
+import json
+import os
 import sys
+import threading
 import warnings
 
+from ._version import version as asdf_package_version
 from .exceptions import AsdfWarning
 from .extension import ExtensionProxy
-from .resource import ResourceMappingProxy
+from .extension._extension import _LazyExtensionProxy
+from .extension._manager import _resolve_type
+from .resource import ResourceMappingProxy, _LazyResourceMappingProxy
+from .util import get_class_name
 
 # The standard library importlib.metadata returns duplicate entrypoints
 # for all python versions up to and including 3.11
@@ -19,59 +28,337 @@ else:
 RESOURCE_MAPPINGS_GROUP = "asdf.resource_mappings"
 EXTENSIONS_GROUP = "asdf.extensions"
 
+# Bump when the layout of the cached metadata changes
+_CACHE_FORMAT_VERSION = 1
 
-def get_resource_mappings():
-    return _list_entry_points(RESOURCE_MAPPINGS_GROUP, ResourceMappingProxy)
+_cache_lock = threading.Lock()
 
 
-def get_extensions():
-    extensions = _list_entry_points(EXTENSIONS_GROUP, ExtensionProxy)
+def get_resource_mappings(cache=True):
+    return _list_entry_points(RESOURCE_MAPPINGS_GROUP, ResourceMappingProxy, cache=cache)
+
+
+def get_extensions(cache=True):
+    extensions = _list_entry_points(EXTENSIONS_GROUP, ExtensionProxy, cache=cache)
     return extensions
 
 
-def _list_entry_points(group, proxy_class):
-    results = []
+def get_cache_path():
+    """
+    Get the path of the entry point discovery cache.
 
-    points = entry_points(group=group)
+    The cache is stored in ``$ASDF_CACHE_DIR`` if set, otherwise in an
+    ``asdf`` subdirectory of ``$XDG_CACHE_HOME`` (``~/.cache`` by default).
+    The file name includes a hash of the interpreter prefix so that
+    several environments can share one cache directory.
 
-    # The order of plugins may be significant, since in the case of
-    # duplicate functionality the first plugin in the list takes
-    # precedence.  It's not clear if entry points are ordered
-    # in a consistent way across systems so we explicitly sort
-    # by package name.  Plugins from this package are placed
-    # at the end so that other packages can override them.
-    asdf_entry_points = [e for e in points if e.dist.name == "asdf"]
-    other_entry_points = sorted((e for e in points if e.dist.name != "asdf"), key=lambda e: e.dist.name)
+    Returns
+    -------
+    str
+    """
+    cache_dir = os.environ.get("ASDF_CACHE_DIR")
+    if not cache_dir:
+        cache_dir = os.path.join(
+            os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "asdf"
+        )
+    prefix_hash = hashlib.sha1(sys.prefix.encode("utf-8"), usedforsecurity=False).hexdigest()[:16]
+    return os.path.join(cache_dir, f"entry-points-{prefix_hash}.json")
 
-    for entry_point in other_entry_points + asdf_entry_points:
-        package_name = entry_point.dist.name
-        package_version = entry_point.dist.version
-
-        def _handle_error(e):
-            warnings.warn(
-                f"{group} plugin from package {package_name}=={package_version} failed to load:\n\n"
-                f"{e.__class__.__name__}: {e}",
-                AsdfWarning,
+
+def _entry_point_key(entry_point):
+    """
+    Key identifying an entry point and the installed distribution
+    that provides it.  Only public distribution metadata is used: the
+    package version and a digest of its entry point declarations.
+    """
+    dist = entry_point.dist
+    declarations = dist.read_text("entry_points.txt") or ""
+    digest = hashlib.sha1(declarations.encode("utf-8"), usedforsecurity=False).hexdigest()
+    return json.dumps([entry_point.name, entry_point.value, dist.name, dist.version, digest])
+
+
+def _read_cache(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if (
+        not isinstance(cache, dict)
+        or cache.get("format") != _CACHE_FORMAT_VERSION
+        or cache.get("asdf") != asdf_package_version
+        or cache.get("python") != sys.version
+    ):
+        return {}
+    return cache.get("groups", {})
+
+
+def _write_cache(path, group, records):
+    with _cache_lock:
+        groups = _read_cache(path)
+        if groups.get(group) == records:
+            return
+        groups[group] = records
+        cache = {
+            "format": _CACHE_FORMAT_VERSION,
+            "asdf": asdf_package_version,
+            "python": sys.version,
+            "groups": groups,
+        }
+        # Write to a temporary file and move it into place so that
+        # concurrent processes never see a partially written cache.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # The cache is only an optimization, an unwritable cache
+            # directory should not prevent asdf from working.
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+
+def _type_path(typ):
+    """
+    Get a class path for a converter type that resolves back to the same
+    type, or `None` if the type cannot be described by a path.
+    """
+    if isinstance(typ, str):
+        return typ
+    path = get_class_name(typ, instance=False)
+    if _resolve_type(path) is not typ:
+        return None
+    return path
+
+
+def _describe_extension(proxy):
+    """
+    Describe an `ExtensionProxy` with JSON-compatible values, or
+    return `None` if the extension can't be cached.
+    """
+    yaml_tag_handles = proxy.yaml_tag_handles
+    if not isinstance(yaml_tag_handles, dict) or not all(
+        isinstance(k, str) and isinstance(v, str) for k, v in yaml_tag_handles.items()
+    ):
+        return None
+
+    converters = []
+    for converter in proxy.converters:
+        types = [_type_path(typ) for typ in converter.types]
+        if None in types:
+            return None
+        converters.append(
+            {
+                "class_name": converter.class_name,
+                "tags": converter.tags,
+                "types": types,
+            }
+        )
+
+    tags = []
+    for tag in proxy.tags:
+        if not all(isinstance(v, (str, type(None))) for v in (tag.title, tag.description)):
+            return None
+        tags.append(
+            {
+                "tag_uri": tag.tag_uri,
+                "schema_uris": list(tag.schema_uris),
+                "title": tag.title,
+                "description": tag.description,
+            }
+        )
+
+    extension_uri = proxy.extension_uri
+    if not isinstance(extension_uri, (str, type(None))):
+        return None
+
+    return {
+        "class_name": proxy.class_name,
+        "extension_uri": extension_uri,
+        "legacy_class_names": sorted(proxy.legacy_class_names),
+        "asdf_standard_requirement": str(proxy.asdf_standard_requirement),
+        "tags": tags,
+        "yaml_tag_handles": yaml_tag_handles,
+        "converters": converters,
+        "has_compressors": bool(proxy.compressors),
+        "has_validators": bool(proxy.validators),
+    }
+
+
+def _describe_resource_mapping(proxy):
+    """
+    Describe a `ResourceMappingProxy` with JSON-compatible values, or
+    return `None` if the mapping can't be cached.
+    """
+    uris = list(proxy)
+    if not all(isinstance(uri, str) for uri in uris):
+        return None
+    return {"class_name": proxy.class_name, "uris": uris}
+
+
+# Map of proxy class to (function describing a proxy, lazy proxy class)
+_CACHEABLE_PROXY_CLASSES = {
+    ExtensionProxy: (_describe_extension, _LazyExtensionProxy),
+    ResourceMappingProxy: (_describe_resource_mapping, _LazyResourceMappingProxy),
+}
+
+
+class _EntryPointLoader:
+    """
+    Load the elements of a cached entry point the first time one of
+    its lazy proxies needs the real plugin.
+    """
+
+    def __init__(self, group, entry_point, proxy_class, cache_path):
+        self._group = group
+        self._entry_point = entry_point
+        self._proxy_class = proxy_class
+        self._cache_path = cache_path
+        self._proxies = None
+        self._lock = threading.Lock()
+
+    def __call__(self, index, class_name):
+        with self._lock:
+            if self._proxies is None:
+                self._proxies, _ = _load_entry_point(self._group, self._entry_point, self._proxy_class)
+
+        proxy = self._proxies[index] if index < len(self._proxies) else None
+        if proxy is None or proxy.class_name != class_name:
+            # The installed plugin no longer matches the cache, drop the
+            # cache so the next session rediscovers everything.
+            try:
+                os.remove(self._cache_path)
+            except OSError:
+                pass
+            msg = (
+                f"{self._group} plugin from package "
+                f"{self._entry_point.dist.name}=={self._entry_point.dist.version} "
+                "does not match the cached entry point metadata"
             )
+            raise RuntimeError(msg)
+        return proxy
+
 
+def _load_entry_point(group, entry_point, proxy_class):
+    """
+    Import an entry point and wrap the elements it returns.
+
+    Returns
+    -------
+    proxies : list
+        One item per element returned by the entry point, `None`
+        for elements that failed to load.
+    failed : bool
+        `True` if any part of the entry point failed to load.
+    """
+    package_name = entry_point.dist.name
+    package_version = entry_point.dist.version
+
+    def _handle_error(e):
+        warnings.warn(
+            f"{group} plugin from package {package_name}=={package_version} failed to load:\n\n"
+            f"{e.__class__.__name__}: {e}",
+            AsdfWarning,
+        )
+
+    def _load():
         # Catch errors loading entry points and warn instead of raising
         try:
-            with warnings.catch_warnings():
-                elements = entry_point.load()()
-
+            elements = entry_point.load()()
         except Exception as e:
             _handle_error(e)
-            continue
+            return [], True
 
         # Process the elements returned by the entry point
         if not isinstance(elements, list):
             elements = [elements]
 
+        proxies = []
+        failed = False
         for element in elements:
             # Catch errors instantiating the proxy class and warn instead of raising
             try:
-                results.append(proxy_class(element, package_name=package_name, package_version=package_version))
+                proxies.append(proxy_class(element, package_name=package_name, package_version=package_version))
             except Exception as e:
                 _handle_error(e)
+                proxies.append(None)
+                failed = True
+        return proxies, failed
+
+    # Record the warnings issued while loading the plugin and re-issue
+    # them so they are subject to the caller's filters.  A plugin that
+    # warns is treated as failed so it is never cached and the warnings
+    # are reported every session.
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        proxies, failed = _load()
+
+    for warning in caught:
+        warnings.warn_explicit(
+            warning.message, warning.category, warning.filename, warning.lineno, source=warning.source
+        )
+
+    return proxies, failed or bool(caught)
+
+
+def _list_entry_points(group, proxy_class, cache=True):
+    results = []
+
+    points = entry_points(group=group)
+
+    # The order of plugins may be significant, since in the case of
+    # duplicate functionality the first plugin in the list takes
+    # precedence.  It's not clear if entry points are ordered
+    # in a consistent way across systems so we explicitly sort
+    # by package name.  Plugins from this package are placed
+    # at the end so that other packages can override them.
+    asdf_entry_points = [e for e in points if e.dist.name == "asdf"]
+    other_entry_points = sorted((e for e in points if e.dist.name != "asdf"), key=lambda e: e.dist.name)
+
+    # When the cache is enabled, entry points that were successfully
+    # loaded by a previous session are described by their cached metadata
+    # and wrapped in lazy proxies that only import the plugin when it is
+    # needed.  Entry points that failed to load or warned (or contain
+    # plugins that can't be described in the cache) are always imported
+    # so that their warnings are reported every session.
+    describe, lazy_proxy_class = _CACHEABLE_PROXY_CLASSES.get(proxy_class, (None, None))
+    cache = cache and describe is not None
+    if cache:
+        cache_path = get_cache_path()
+        cached_records = _read_cache(cache_path).get(group, {})
+    records = {}
+
+    for entry_point in other_entry_points + asdf_entry_points:
+        key = _entry_point_key(entry_point) if cache else None
+
+        if cache and key in cached_records:
+            loader = _EntryPointLoader(group, entry_point, proxy_class, cache_path)
+            for index, metadata in enumerate(cached_records[key]):
+                results.append(
+                    lazy_proxy_class(
+                        metadata,
+                        loader=functools.partial(loader, index, metadata["class_name"]),
+                        package_name=entry_point.dist.name,
+                        package_version=entry_point.dist.version,
+                    )
+                )
+            records[key] = cached_records[key]
+            continue
+
+        proxies, failed = _load_entry_point(group, entry_point, proxy_class)
+        results.extend(p for p in proxies if p is not None)
+
+        if cache and not failed:
+            descriptions = [describe(p) for p in proxies]
+            if None not in descriptions:
+                records[key] = descriptions
+
+    if cache and records != cached_records:
+        _write_cache(cache_path, group, records)
 
     return results
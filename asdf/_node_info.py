@@ -1,6 +1,8 @@
+import itertools
 import re
 from collections import namedtuple
 
+from . import lazy_nodes
 from .schema import load_schema
 from .treeutil import get_children, is_container
 
@@ -138,7 +140,31 @@ def _get_schema_key(schema, key):
     return None
 
 
-def create_tree(key, node, identifier="root", filters=None, extension_manager=None):
+def _count_children(node):
+    """
+    Count the children of a node without accessing them (which
+    would convert the children of lazy nodes).
+    """
+    if isinstance(node, (dict, lazy_nodes.AsdfDictNode, list, tuple, lazy_nodes.AsdfListNode)):
+        return len(node)
+    return 0
+
+
+def _get_first_children(node, count):
+    """
+    Like `asdf.treeutil.get_children` but only retrieve the first
+    ``count`` children.
+    """
+    if isinstance(node, (dict, lazy_nodes.AsdfDictNode)):
+        return list(itertools.islice(node.items(), count))
+
+    if isinstance(node, (list, tuple, lazy_nodes.AsdfListNode)):
+        return list(itertools.islice(enumerate(node), count))
+
+    return []
+
+
+def create_tree(key, node, identifier="root", filters=None, extension_manager=None, expand=None):
     """
     Create a `NodeSchemaInfo` tree which can be filtered from a base node.
 
@@ -150,8 +176,9 @@ def create_tree(key, node, identifier="root", filters=None, extension_manager=No
         The asdf tree to search.
     filters : list of functions
         A list of functions that take a node and identifier and return True if the node should be included in the tree.
-    preserve_list : bool
-        If True, then lists are preserved. Otherwise, they are turned into dicts.
+    expand : callable, optional
+        See `NodeSchemaInfo.from_root_node`.  Ignored if filters are provided as
+        filtering requires the full tree.
     """
     filters = [] if filters is None else filters
 
@@ -160,6 +187,7 @@ def create_tree(key, node, identifier="root", filters=None, extension_manager=No
         identifier,
         node,
         extension_manager=extension_manager,
+        expand=None if len(filters) > 0 else expand,
     )
 
     if len(filters) > 0 and not _filter_tree(schema_info, filters):
@@ -289,7 +317,11 @@ class NodeSchemaInfo:
         If this node will be made visible in the output. Default is True.
 
     children : list
-        List of the NodeSchemaInfo objects for the children of this node. This is a leaf node if this is empty.
+        List of the NodeSchemaInfo objects for the children of this node. This is a leaf node if this is empty
+        and ``elided_children`` is 0.
+
+    elided_children : int
+        Number of children of this node that were not expanded into NodeSchemaInfo objects.
 
     schema : dict
         The portion of the underlying schema corresponding to the node.
@@ -304,6 +336,7 @@ class NodeSchemaInfo:
         self.recursive = recursive
         self.visible = visible
         self.children = []
+        self.elided_children = 0
         self.schema = None
         self.extension_manager = extension_manager or _get_extension_manager()
 
@@ -311,6 +344,10 @@ class NodeSchemaInfo:
     def visible_children(self):
         return [c for c in self.children if c.visible]
 
+    @property
+    def num_children(self):
+        return len(self.children) + self.elided_children
+
     @property
     def parent_node(self):
         if self.parent is not None:
@@ -342,11 +379,17 @@ class NodeSchemaInfo:
         self.schema = schema
 
     @classmethod
-    def from_root_node(cls, key, root_identifier, root_node, schema=None, extension_manager=None):
+    def from_root_node(cls, key, root_identifier, root_node, schema=None, extension_manager=None, expand=None):
         """
         Build a NodeSchemaInfo tree from the given ASDF root node.
         Intentionally processes the tree in breadth-first order so that recursively
         referenced nodes are displayed at their shallowest reference point.
+
+        If provided, ``expand`` is called (in breadth-first order) with each
+        NodeSchemaInfo and the number of children of its node, and returns how
+        many of the first children to expand.  The remaining children are not
+        accessed (so lazy nodes are not converted) and are only counted in
+        ``elided_children``.
         """
         extension_manager = extension_manager or _get_extension_manager()
 
@@ -413,7 +456,14 @@ class NodeSchemaInfo:
                                 pass
 
                     # add children to queue
-                    for child_identifier, child_node in get_children(t_node):
+                    if expand is None:
+                        children = get_children(t_node)
+                    else:
+                        num_children = _count_children(t_node)
+                        num_expanded = expand(info, num_children) if num_children else 0
+                        children = _get_first_children(t_node, num_expanded)
+                        info.elided_children = num_children - len(children)
+                    for child_identifier, child_node in children:
                         next_nodes.append((info, child_identifier, child_node))
 
             if len(next_nodes) == 0:
@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import asdf
+from asdf._block.cache import BlockCache
+
+
+class Block:
+    def __init__(self):
+        self.evicted = False
+
+    def _evict(self):
+        self.evicted = True
+
+
+def test_block_cache_lru():
+    cache = BlockCache(10)
+    blocks = [Block() for _ in range(3)]
+    cache.add(blocks[0], 4)
+    cache.add(blocks[1], 4)
+    cache.hit(blocks[0])
+    cache.add(blocks[2], 4)
+    # blocks[1] was the least recently used
+    assert blocks[1].evicted
+    assert not blocks[0].evicted
+    assert blocks[1] not in cache
+    assert cache.stats == {"hits": 1, "misses": 3, "evictions": 1, "blocks": 2, "size": 8, "max_size": 10}
+
+    # the newest block is never evicted
+    big = Block()
+    cache.add(big, 100)
+    assert not big.evicted
+    assert len(cache) == 1
+    assert cache.size == 100
+
+    cache.discard(big)
+    assert not big.evicted
+    assert cache.size == 0
+
+
+def test_block_cache_unlimited():
+    cache = BlockCache()
+    blocks = [Block() for _ in range(3)]
+    for block in blocks:
+        cache.add(block, 1000)
+    assert not cache.limited
+    assert not any(block.evicted for block in blocks)
+    assert cache.size == 3000
+
+
+@pytest.fixture
+def compressed_file(tmp_path):
+    fn = tmp_path / "test.asdf"
+    arrays = {f"a{i}": np.full(1000, i, dtype="f8") for i in range(5)}
+    af = asdf.AsdfFile(arrays)
+    for arr in af.tree.values():
+        if isinstance(arr, np.ndarray):
+            af.set_array_compression(arr, "zlib")
+    af.write_to(fn)
+    return fn, arrays
+
+
+def test_block_cache_size(compressed_file):
+    fn, arrays = compressed_file
+    with asdf.config_context() as cfg:
+        cfg.block_cache_size = 2 * 8000
+        with asdf.open(fn, lazy_load=True, memmap=False) as af:
+            cache = af._blocks._block_cache
+            for key, arr in arrays.items():
+                np.testing.assert_array_equal(af[key], arr)
+            assert cache.stats["misses"] == 5
+            assert cache.stats["evictions"] == 3
+            assert cache.size == 2 * 8000
+
+            # only the 2 most recently used arrays keep their data
+            assert [af[key]._array is not None for key in arrays] == [False, False, False, True, True]
+
+            # using an array keeps it in the cache
+            assert af["a3"][0] == 3
+            np.testing.assert_array_equal(af["a0"], arrays["a0"])
+            assert af["a3"]._array is not None
+            assert af["a4"]._array is None
+            assert cache.stats["misses"] == 6
+            assert cache.stats["hits"] > 0
+
+            # arrays that use cached data are read-only
+            with pytest.raises(ValueError, match="read-only"):
+                af["a0"][0] = 42
+
+
+def test_block_cache_unlimited_writeable(compressed_file):
+    fn, arrays = compressed_file
+    with asdf.open(fn, lazy_load=True, memmap=False) as af:
+        for key, arr in arrays.items():
+            np.testing.assert_array_equal(af[key], arr)
+        assert af._blocks._block_cache.stats["evictions"] == 0
+        af["a0"][0] = 42
+        assert af["a0"][0] == 42
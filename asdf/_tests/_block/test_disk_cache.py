@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pytest
+
+import asdf
+from asdf._block import disk_cache
+from asdf._block import io as bio
+
+
+@pytest.fixture
+def compressed_file(tmp_path):
+    fn = tmp_path / "test.asdf"
+    arrays = {f"a{i}": np.full(1000, i, dtype="f8") for i in range(3)}
+    af = asdf.AsdfFile({**arrays, "uncompressed": np.arange(10)})
+    for key in arrays:
+        af.set_array_compression(af[key], "zlib")
+    af.write_to(fn)
+    return fn, arrays
+
+
+def _cached_files(directory):
+    if not directory.exists():
+        return []
+    return sorted(p for p in os.listdir(directory) if p.endswith(".block"))
+
+
+@pytest.mark.parametrize("lazy_load", [True, False])
+def test_disk_cache(tmp_path, compressed_file, lazy_load):
+    fn, arrays = compressed_file
+    cache_dir = tmp_path / "cache"
+    with asdf.config_context() as cfg:
+        cfg.block_cache_directory = cache_dir
+        with asdf.open(fn, lazy_load=lazy_load, memmap=False) as af:
+            for key, arr in arrays.items():
+                np.testing.assert_array_equal(af[key], arr)
+            np.testing.assert_array_equal(af["uncompressed"], np.arange(10))
+            # compressed blocks are memory mapped (read-only) from the cache
+            assert isinstance(af["a0"].base, np.memmap)
+            assert not af["a0"].flags.writeable
+        assert len(_cached_files(cache_dir)) == 3
+
+        # later reads use the cached data
+        with asdf.open(fn, lazy_load=lazy_load, memmap=False) as af:
+            block = af._blocks.blocks[0]
+            assert block._decoded_data is None or isinstance(block._decoded_data, np.memmap)
+            np.testing.assert_array_equal(af["a1"], arrays["a1"])
+            assert af._blocks.blocks[1]._decoded_data.filename.startswith(str(cache_dir))
+        assert len(_cached_files(cache_dir)) == 3
+
+
+def test_disk_cache_modified_file(tmp_path, compressed_file):
+    fn, arrays = compressed_file
+    cache_dir = tmp_path / "cache"
+    with asdf.config_context() as cfg:
+        cfg.block_cache_directory = cache_dir
+        with asdf.open(fn) as af:
+            np.testing.assert_array_equal(af["a0"], arrays["a0"])
+
+        af = asdf.AsdfFile({"a0": np.full(1000, 42, dtype="f8")})
+        af.set_array_compression(af["a0"], "zlib")
+        af.write_to(fn)
+
+        with asdf.open(fn) as af:
+            assert np.all(af["a0"] == 42)
+        assert len(_cached_files(cache_dir)) == 2
+
+
+def test_disk_cache_size(tmp_path, compressed_file):
+    fn, arrays = compressed_file
+    cache_dir = tmp_path / "cache"
+    with asdf.config_context() as cfg:
+        cfg.block_cache_directory = cache_dir
+        cfg.block_cache_directory_size = 2 * 8000
+        cache = disk_cache.get_disk_cache()
+        with asdf.open(fn) as af:
+            paths = [
+                cache.path(bio.block_identity(af._fd, block.header, block.data_offset))
+                for block in af._blocks.blocks[:3]
+            ]
+            np.testing.assert_array_equal(af["a0"], arrays["a0"])
+            np.testing.assert_array_equal(af["a1"], arrays["a1"])
+            # make a1 the least recently used
+            os.utime(paths[0], ns=(2000, 2000))
+            os.utime(paths[1], ns=(1000, 1000))
+            np.testing.assert_array_equal(af["a2"], arrays["a2"])
+        assert [os.path.exists(p) for p in paths] == [True, False, True]
+
+
+def test_disk_cache_unwritable(tmp_path, compressed_file):
+    fn, arrays = compressed_file
+    cache_dir = tmp_path / "cache"
+    cache_dir.write_bytes(b"not a directory")
+    with asdf.config_context() as cfg:
+        cfg.block_cache_directory = cache_dir
+        with asdf.open(fn) as af:
+            np.testing.assert_array_equal(af["a0"], arrays["a0"])
+            assert af["a0"].flags.writeable
+
+
+def test_disk_cache_update(tmp_path, compressed_file):
+    fn, arrays = compressed_file
+    cache_dir = tmp_path / "cache"
+    with asdf.config_context() as cfg:
+        cfg.block_cache_directory = cache_dir
+        # the read-only cache is not used for files opened for update
+        with asdf.open(fn, mode="rw") as af:
+            assert af["a0"].flags.writeable
+            af["a0"][:] = 42
+            af.update()
+        assert not _cached_files(cache_dir)
+
+        with asdf.open(fn) as af:
+            assert np.all(af["a0"] == 42)
+            np.testing.assert_array_equal(af["a1"], arrays["a1"])
@@ -207,6 +207,35 @@ def test_compressed_block():
     np.testing.assert_array_equal(rdata, data)
 
 
+@pytest.mark.parametrize("compression", ["zlib", "bzp2", "lz4"])
+@pytest.mark.parametrize("padding", [False, 0.5])
+@pytest.mark.parametrize("write_checksum", [True, False])
+def test_compressed_block_seekable_matches_buffered(compression, padding, write_checksum):
+    data = np.arange(10000, dtype="uint8")
+    headers = []
+    contents = []
+    for seekable in (True, False):
+        raw_fd = io.BytesIO()
+        fd = generic_io.get_file(raw_fd, mode="rw")
+        fd.seekable = lambda seekable=seekable: seekable
+        fd.write(b"before")
+        headers.append(
+            bio.write_block(fd, data, padding=padding, compression=compression, write_checksum=write_checksum)
+        )
+        fd.write(b"after")
+        contents.append(raw_fd.getvalue())
+    # data written directly to the seekable file followed by the patched
+    # header matches data compressed into a buffer before writing
+    assert headers[0] == headers[1]
+    assert contents[0] == contents[1]
+    assert headers[0]["used_size"] < data.nbytes
+
+    fd = generic_io.get_file(io.BytesIO(contents[0]), mode="r")
+    fd.seek(len(b"before"))
+    _, _, _, rdata = bio.read_block(fd, True)
+    np.testing.assert_array_equal(rdata, data)
+
+
 def test_stream_block():
     data = np.ones(10, dtype="uint8")
     fd = generic_io.get_file(io.BytesIO(), mode="rw")
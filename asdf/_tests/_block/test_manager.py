@@ -4,6 +4,7 @@ import numpy as np
 import pytest
 
 import asdf
+from asdf import util
 from asdf._block import manager
 from asdf._block.options import Options
 
@@ -91,3 +92,26 @@ def test_input_compression(tmp_path):
         assert af.get_array_compression(af["arr"]) == "bzp2"
         af.set_array_compression(af["arr"], "input")
         assert af.get_array_compression(af["arr"]) == "zlib"
+
+
+@pytest.mark.parametrize("lazy_load", [True, False])
+@pytest.mark.parametrize("memmap", [True, False])
+def test_block_for_data(tmp_path, lazy_load, memmap):
+    fn = tmp_path / "test.asdf"
+    af = asdf.AsdfFile({f"a{i}": np.full(3, i) for i in range(3)})
+    af.set_array_compression(af["a1"], "zlib")
+    af.write_to(fn)
+
+    with asdf.open(fn, lazy_load=lazy_load, memmap=memmap) as af, asdf.open(fn) as other:
+        blocks = af._blocks.blocks
+        for i, blk in enumerate(blocks):
+            base = util.get_array_base(af[f"a{i}"][...])
+            # matches searching all blocks
+            expected = next((b for b in blocks if b._cached_data is base or b._data is base), None)
+            assert blocks.block_for_data(base) is expected
+            # blocks of other files are not found
+            assert other._blocks.blocks.block_for_data(base) is None
+        # decompressed data is always found
+        assert blocks.block_for_data(util.get_array_base(af["a1"][...])) is blocks[1]
+        assert blocks.block_for_data(np.arange(3)) is None
+        assert af._blocks.options.get_options_from_block(af["a1"][...]).compression == "zlib"
@@ -2,6 +2,8 @@ import contextlib
 import io
 import mmap
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import pytest
@@ -232,3 +234,31 @@ def test_bad_checksum(validate_checksums, compression):
         else:
             block = read_blocks(fd, lazy_load=False, validate_checksums=validate_checksums)[0]
             _ = block.data
+
+
+@pytest.mark.parametrize("memmap", [True, False])
+@pytest.mark.parametrize("validate_checksums", [True, False])
+def test_read_concurrently(tmp_path, memmap, validate_checksums):
+    fn = tmp_path / "test.asdf"
+    with gen_blocks(fn=fn, n=20, size=1000, write_checksums=True):
+        pass
+
+    with generic_io.get_file(fn, mode="r") as fd:
+        blocks = read_blocks(fd, memmap=memmap, lazy_load=True, validate_checksums=validate_checksums)
+        # all threads start loading the blocks at once
+        barrier = threading.Barrier(8)
+
+        def load(i):
+            barrier.wait()
+            return [blocks[(i + j) % len(blocks)].cached_data for j in range(len(blocks))]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(load, range(8)))
+
+        for i, result in enumerate(results):
+            for j, data in enumerate(result):
+                index = (i + j) % len(blocks)
+                # each block is read once
+                assert data is blocks[index].cached_data
+                assert data.size == 1000
+                assert np.all(data == index)
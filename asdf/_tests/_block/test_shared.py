@@ -0,0 +1,170 @@
+import os
+import stat
+import subprocess
+import sys
+import textwrap
+
+import numpy as np
+import pytest
+
+import asdf
+from asdf._block import shared
+from asdf._block.shared import _HEADER, _WRITING, _SharedMemory
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="segments are not reference counted on windows")
+
+
+def _segment_exists(name):
+    try:
+        shm = _SharedMemory(name)
+    except FileNotFoundError:
+        return False
+    shm.close()
+    return True
+
+
+@pytest.fixture
+def compressed_file(tmp_path):
+    fn = tmp_path / "test.asdf"
+    arr = np.arange(10_000, dtype="f8")
+    af = asdf.AsdfFile({"compressed": arr, "uncompressed": arr + 1})
+    af.set_array_compression(af["compressed"], "zlib")
+    af.write_to(fn)
+    return fn, arr
+
+
+@pytest.fixture
+def shared_memory_blocks():
+    with asdf.config_context() as cfg:
+        cfg.shared_memory_blocks = True
+        yield
+
+
+@pytest.mark.usefixtures("shared_memory_blocks")
+@pytest.mark.parametrize("lazy_load", [True, False])
+def test_shared_block(compressed_file, lazy_load):
+    fn, arr = compressed_file
+    af0 = asdf.open(fn, lazy_load=lazy_load)
+    af1 = asdf.open(fn, lazy_load=lazy_load)
+    arr0 = af0["compressed"][:]
+    arr1 = af1["compressed"][:]
+    np.testing.assert_array_equal(arr0, arr)
+    np.testing.assert_array_equal(arr1, arr)
+    np.testing.assert_array_equal(af0["uncompressed"], arr + 1)
+
+    # both files use the same (read-only) segment
+    name = af0._blocks.blocks[0]._shared_block.name
+    assert af1._blocks.blocks[0]._shared_block.name == name
+    assert af0._blocks.blocks[1]._shared_block is None
+    assert not arr0.flags.writeable
+    assert _segment_exists(name)
+
+    # the segment is unlinked when both files are closed
+    af0.close()
+    assert _segment_exists(name)
+    af1.close()
+    assert not _segment_exists(name)
+
+    # arrays that use the segment remain valid
+    np.testing.assert_array_equal(arr0, arr)
+
+
+@pytest.mark.usefixtures("shared_memory_blocks")
+def test_shared_block_other_process(compressed_file):
+    fn, arr = compressed_file
+    with asdf.open(fn, lazy_load=True) as af:
+        np.testing.assert_array_equal(af["compressed"], arr)
+        name = af._blocks.blocks[0]._shared_block.name
+
+        script = textwrap.dedent(
+            f"""
+            import asdf
+            import numpy as np
+            with asdf.config_context() as cfg:
+                cfg.shared_memory_blocks = True
+                with asdf.open({str(fn)!r}) as af:
+                    np.testing.assert_array_equal(af["compressed"], np.arange(10_000, dtype="f8"))
+                    assert af._blocks.blocks[0]._shared_block.name == {name!r}
+            """
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)  # noqa: S603
+        assert _segment_exists(name)
+    assert not _segment_exists(name)
+
+
+@pytest.mark.usefixtures("shared_memory_blocks")
+def test_shared_block_crashed_process(compressed_file):
+    """
+    A segment left behind by a process that exited without releasing it
+    is reused and unlinked when the block is next released.
+    """
+    fn, arr = compressed_file
+    script = textwrap.dedent(
+        f"""
+        import os
+        import asdf
+        with asdf.config_context() as cfg:
+            cfg.shared_memory_blocks = True
+            af = asdf.open({str(fn)!r})
+            af["compressed"][:]
+            print(af._blocks.blocks[0]._shared_block.name)
+            os._exit(0)
+        """
+    )
+    output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True)  # noqa: S603
+    name = output.stdout.strip()
+    assert _segment_exists(name)
+
+    with asdf.open(fn) as af:
+        np.testing.assert_array_equal(af["compressed"], arr)
+        assert af._blocks.blocks[0]._shared_block.name == name
+    assert not _segment_exists(name)
+
+
+@pytest.mark.usefixtures("shared_memory_blocks")
+def test_shared_block_incomplete_segment(compressed_file):
+    """
+    A segment that was not completely written by a process that exited
+    is replaced.
+    """
+    fn, arr = compressed_file
+    with asdf.open(fn, lazy_load=True) as af:
+        header = af._blocks.blocks[0].header
+        name = shared.segment_name(af._blocks.blocks[0]._fd(), header, af._blocks.blocks[0].data_offset)
+    shm = _SharedMemory(name, create=True, size=_HEADER.size + header["data_size"])
+    _HEADER.pack_into(shm.buf, 0, _WRITING)
+    shm.close()
+
+    with asdf.open(fn) as af:
+        np.testing.assert_array_equal(af["compressed"], arr)
+        assert af._blocks.blocks[0]._shared_block.name == name
+    assert not _segment_exists(name)
+
+
+@pytest.mark.usefixtures("shared_memory_blocks")
+def test_shared_block_update(compressed_file):
+    fn, _ = compressed_file
+    # read-only segments are not used for files opened for update
+    with asdf.open(fn, mode="rw") as af:
+        assert af._blocks.blocks[0]._shared_block is None
+        assert af["compressed"].flags.writeable
+        af["compressed"][:] = 42
+        af.update()
+
+    with asdf.open(fn) as af:
+        assert np.all(af["compressed"] == 42)
+
+
+def test_lock_directory():
+    directory = shared._lock_directory()
+    info = os.stat(directory)
+    assert info.st_uid == os.getuid()
+    assert stat.S_IMODE(info.st_mode) == 0o700
+
+
+def test_shared_block_disabled(compressed_file):
+    fn, arr = compressed_file
+    with asdf.open(fn, lazy_load=True) as af:
+        np.testing.assert_array_equal(af["compressed"], arr)
+        assert af._blocks.blocks[0]._shared_block is None
+        assert af["compressed"].flags.writeable
@@ -178,3 +178,37 @@ def test_keys_for_value():
         assert objs == returned_objects
         del returned_objects, objs
         gc.collect(2)
+
+
+def test_keys_for_value_reassigned():
+    s = Store()
+    f = Foo()
+    k = Key(f)
+    s.assign_object(f, 1)
+    s.assign_object(k, 1)
+    s.assign_object(f, 2)
+    assert [key._ref() for key in s.keys_for_value(1)] == [f]
+    assert [key._ref() for key in s.keys_for_value(2)] == [f]
+    # reassigning using an equal Key replaces the value
+    s.assign_object(Key(f, k._key), 2)
+    assert list(s.keys_for_value(1)) == []
+    assert len(list(s.keys_for_value(2))) == 2
+
+
+def test_cleanup_on_growth():
+    s = Store()
+    kept = []
+    for i in range(1000):
+        obj = Foo()
+        s.assign_object(obj, i % 2)
+        if i % 2:
+            kept.append(obj)
+    del obj
+    gc.collect(2)
+    s.assign_object(Foo(), 2)
+    # keys for garbage collected objects are removed as the store grows
+    n_keys = sum(len(by_key) for by_key in s._by_id.values())
+    assert n_keys < 1000
+    assert sum(len(keys) for keys in s._keys_by_value.values()) == n_keys
+    assert list(s.keys_for_value(0)) == []
+    assert len(list(s.keys_for_value(1))) == 500
@@ -12,7 +12,8 @@ from asdf._block import reader, writer
 @pytest.mark.parametrize("compression", [None, b"zlib"])
 @pytest.mark.parametrize("stream", [True, False])
 @pytest.mark.parametrize("seekable", [True, False])
-def test_write_blocks(tmp_path, lazy, index, padding, compression, stream, seekable):
+@pytest.mark.parametrize("threads", [1, 4])
+def test_write_blocks(tmp_path, lazy, index, padding, compression, stream, seekable, threads):
     data = [np.ones(10, dtype=np.uint8), np.zeros(5, dtype=np.uint8), None]
     if lazy:
         blocks = [writer.WriteBlock(lambda bd=d: bd, compression=compression) for d in data]
@@ -26,7 +27,9 @@ def test_write_blocks(tmp_path, lazy, index, padding, compression, stream, seeka
     with generic_io.get_file(fn, mode="w") as fd:
         if not seekable:
             fd.seekable = lambda: False
-        writer.write_blocks(fd, blocks, padding=padding, streamed_block=streamed_block, write_index=index)
+        writer.write_blocks(
+            fd, blocks, padding=padding, streamed_block=streamed_block, write_index=index, threads=threads
+        )
     with generic_io.get_file(fn, mode="r") as fd:
         if index and not stream:
             assert bio.find_block_index(fd) is not None
@@ -55,6 +58,23 @@ def test_write_blocks(tmp_path, lazy, index, padding, compression, stream, seeka
             assert read_stream_block.header["flags"] & constants.BLOCK_FLAG_STREAMED
 
 
+@pytest.mark.parametrize("padding", [False, 0.5])
+@pytest.mark.parametrize("compression", [None, b"zlib"])
+def test_write_blocks_parallel_matches_serial(tmp_path, padding, compression):
+    rng = np.random.default_rng(42)
+    data = [rng.integers(0, 4, size, dtype=np.uint8) for size in (1, 100_000, 0, 12345, 3_000_000)]
+    blocks = [writer.WriteBlock(d, compression=compression) for d in data]
+    contents = []
+    for threads in (1, 3):
+        fn = tmp_path / f"test{threads}.bin"
+        with generic_io.get_file(fn, mode="w") as fd:
+            fd.write(b"header")
+            offsets, headers = writer.write_blocks(fd, blocks, padding=padding, threads=threads)
+            fd.write(b"end")
+        contents.append((fn.read_bytes(), offsets, headers))
+    assert contents[0] == contents[1]
+
+
 def _raise_illegal_seek():
     raise OSError("Illegal seek")
 
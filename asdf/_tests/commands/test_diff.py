@@ -1,10 +1,14 @@
 import io
 import sys
+import threading
+import time
 
+import numpy as np
 import pytest
 
 import asdf
 from asdf._commands import diff, main
+from asdf.testing import helpers
 
 
 @pytest.fixture(autouse=True)
@@ -122,3 +126,180 @@ def test_int_key_diff(tmp_path):
     asdf.dump(t1, fn1)
 
     assert main.main_from_args(["diff", str(fn0), str(fn1)]) == 0
+
+
+@pytest.mark.parametrize(
+    "arr1, loads, expected",
+    [
+        ([0.0, 1.0, 2.0], False, ""),
+        ([2.0, 1.0, 0.0], True, "ndarrays differ by contents"),
+        # equal values with different bytes
+        ([-0.0, 1.0, 2.0], True, ""),
+    ],
+)
+def test_diff_array_summary(tmp_path, monkeypatch, arr1, loads, expected):
+    fn0 = tmp_path / "a.asdf"
+    fn1 = tmp_path / "b.asdf"
+
+    with asdf.config_context() as cfg:
+        cfg.array_summary = True
+        asdf.dump({"arr": np.array([0.0, 1.0, 2.0])}, fn0)
+        asdf.dump({"arr": np.array(arr1)}, fn1)
+
+    diff_module = sys.modules["asdf._commands.diff"]
+    load_array = diff_module._load_array
+    loaded = []
+
+    def _load_array(asdf_file, array_dict):
+        loaded.append(array_dict)
+        return load_array(asdf_file, array_dict)
+
+    monkeypatch.setattr(diff_module, "_load_array", _load_array)
+
+    iostream = io.StringIO()
+    diff([fn0, fn1], minimal=False, iostream=iostream)
+    assert bool(loaded) is loads
+    assert expected in iostream.getvalue()
+    if not expected:
+        assert "ndarrays differ" not in iostream.getvalue()
+
+
+@pytest.mark.parametrize("write_checksums, loads", [(True, False), (False, True)])
+def test_diff_block_checksums(tmp_path, monkeypatch, write_checksums, loads):
+    fn0 = tmp_path / "a.asdf"
+    fn1 = tmp_path / "b.asdf"
+
+    arr = np.arange(100).reshape(10, 10)
+    asdf.AsdfFile({"arr": arr, "view": arr[2:]}).write_to(fn0, write_checksums=write_checksums)
+    asdf.AsdfFile({"arr": arr.copy(), "view": arr[2:]}).write_to(fn1, write_checksums=write_checksums)
+
+    diff_module = sys.modules["asdf._commands.diff"]
+    load_array = diff_module._load_array
+    loaded = []
+
+    def _load_array(asdf_file, array_dict):
+        loaded.append(array_dict)
+        return load_array(asdf_file, array_dict)
+
+    monkeypatch.setattr(diff_module, "_load_array", _load_array)
+
+    iostream = io.StringIO()
+    diff([fn0, fn1], minimal=False, iostream=iostream)
+    assert bool(loaded) is loads
+    assert "ndarrays differ" not in iostream.getvalue()
+
+
+@pytest.mark.parametrize(
+    "arr0, arr1, expected",
+    [
+        (np.arange(10), np.arange(10), None),
+        (np.arange(10), np.arange(10)[::-1], "[0:10]"),
+        (np.arange(10), np.arange(10) % 7, "[7:10]"),
+        (np.arange(10), np.where(np.arange(10) == 7, 0, np.arange(10)), "[7]"),
+        (np.zeros((4, 5)), np.where(np.arange(20).reshape(4, 5) > 15, 1, 0), "[3, 1:5]"),
+        (np.zeros((4, 5)), np.zeros((5, 4)), ""),
+        (np.zeros((3, 4, 5)), np.where(np.arange(60).reshape(3, 4, 5) == 42, 1, 0), "[2, 0, 2]"),
+        (np.array(1), np.array(2), ""),
+        (np.array([np.nan]), np.array([np.nan]), "[0]"),
+        (np.zeros((0, 3)), np.zeros((0, 3)), None),
+    ],
+)
+@pytest.mark.parametrize("chunk_size", [1, 16, 100, 10000])
+def test_diff_first_difference(arr0, arr1, expected, chunk_size):
+    diff_module = sys.modules["asdf._commands.diff"]
+    assert diff_module._first_difference(arr0, arr1, chunk_size) == expected
+
+
+def test_diff_jobs(tmp_path):
+    fn0 = tmp_path / "a.asdf"
+    fn1 = tmp_path / "b.asdf"
+
+    asdf.dump({"a": np.arange(10), "b": [np.arange(3), np.ones(5)], "c": np.zeros(3), "d": 1}, fn0)
+    asdf.dump({"a": np.arange(10)[::-1], "b": [np.arange(3), np.zeros(5)], "c": np.zeros(3), "d": 2}, fn1)
+
+    results = []
+    for jobs in [1, 4]:
+        iostream = io.StringIO()
+        diff([fn0, fn1], minimal=False, iostream=iostream, jobs=jobs)
+        results.append(iostream.getvalue())
+    assert results[0] == results[1]
+    assert results[0].count("ndarrays differ by contents") == 4
+
+
+def test_diff_jobs_bounded(tmp_path, monkeypatch):
+    """
+    With several jobs, only a few loaded arrays wait to be compared.
+    """
+    fn0 = tmp_path / "a.asdf"
+    fn1 = tmp_path / "b.asdf"
+    diff_module = sys.modules["asdf._commands.diff"]
+    asdf.dump({f"a{i}": np.arange(10) for i in range(20)}, fn0)
+    asdf.dump({f"a{i}": np.arange(10)[::-1] for i in range(20)}, fn1)
+
+    lock = threading.Lock()
+    loaded = [0, 0]
+    load_array = diff_module._load_array
+    first_difference = diff_module._first_difference
+
+    def _load_array(*args):
+        with lock:
+            loaded[0] += 1
+            loaded[1] = max(loaded)
+        return load_array(*args)
+
+    def _first_difference(*args):
+        time.sleep(0.01)
+        result = first_difference(*args)
+        with lock:
+            loaded[0] -= 2
+        return result
+
+    monkeypatch.setattr(diff_module, "_load_array", _load_array)
+    monkeypatch.setattr(diff_module, "_first_difference", _first_difference)
+
+    iostream = io.StringIO()
+    diff([fn0, fn1], minimal=False, iostream=iostream, jobs=2)
+    assert iostream.getvalue().count("ndarrays differ by contents") == 40
+    # two arrays for each of at most 2 * jobs comparisons
+    assert loaded[1] <= 8
+
+
+def test_diff_jobs_inline(tmp_path, monkeypatch):
+    """
+    Comparisons of several inline arrays (including bare inline data)
+    are matched to the right arrays when run in the background.
+    """
+    af = asdf.AsdfFile()
+    tag = af.extension_manager.get_converter_for_type(np.ndarray).select_tag(np.zeros(0), af)
+    tag = tag.removeprefix("tag:stsci.edu:asdf/")
+    fns = []
+    for name in ["a", "b"]:
+        # every third array differs at index 1
+        values = [-1 if name == "b" and i % 3 == 0 else i + 1 for i in range(10)]
+        lines = [f"a{i}: !{tag} [{i}, {values[i]}, {i + 2}]" for i in range(10)]
+        lines += ["list:"] + [f"  - !{tag} [{i}, {values[i]}]" for i in range(4)]
+        fn = tmp_path / f"{name}.asdf"
+        fn.write_bytes(helpers.yaml_to_asdf("\n".join(lines)).getvalue())
+        fns.append(fn)
+
+    diff_module = sys.modules["asdf._commands.diff"]
+    first_difference = diff_module._first_difference
+    calls = []
+
+    def _first_difference(*args):
+        calls.append(args)
+        return first_difference(*args)
+
+    monkeypatch.setattr(diff_module, "_first_difference", _first_difference)
+
+    results = []
+    for jobs in [1, 4]:
+        calls.clear()
+        iostream = io.StringIO()
+        diff(fns, minimal=False, iostream=iostream, jobs=jobs)
+        results.append(iostream.getvalue())
+        # every queued comparison is used
+        assert len(calls) == 14
+    assert results[0] == results[1]
+    # a0, a3, a6, a9, list[0] and list[3] differ, displayed for both files
+    assert results[0].count("ndarrays differ by contents (first difference at [1])") == 12
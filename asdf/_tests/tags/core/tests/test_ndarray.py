@@ -1,6 +1,8 @@
 import contextlib
+import copy
 import io
 import os
+import pickle
 import re
 import sys
 
@@ -11,6 +13,7 @@ from numpy import ma
 from numpy.testing import assert_array_equal
 
 import asdf
+from asdf import tagged
 from asdf.exceptions import ValidationError
 from asdf.extension import Converter, Extension, TagDefinition
 from asdf.tags.core import ndarray
@@ -1160,3 +1163,180 @@ def test_empty_inline_array_roundtrip(shape, dtype):
     # Can't just compare the arrays because numpy doesn't like comparing empty arrays
     assert f["array"].shape == array.shape
     assert f["array"].dtype == array.dtype
+
+
+@pytest.mark.parametrize(
+    "array",
+    [
+        np.arange(6, dtype="i1").reshape(2, 3),
+        np.array([0, 2**64 - 2**62], dtype="u8"),
+        np.array([True, False, True]),
+        np.array([1.5, -0.0, 1e16, 1e-300, 5e-324, np.nan, np.inf, -np.inf]),
+        np.linspace(-1, 1, 24, dtype="f4").reshape(2, 3, 4),
+        np.array([0.1, 65504], dtype="f2"),
+    ],
+)
+def test_inline_numeric_array(array, monkeypatch):
+    """
+    Inline numeric arrays are written exactly as the equivalent nested
+    lists and are read back with the same values.
+    """
+    if array.dtype == np.uint64:
+        # uint64 values that are too large for a literal are rejected
+        with pytest.raises(ValidationError, match=r"Integer value .* is too large"):
+            asdf.dumps({"array": array}, all_array_storage="inline")
+        array = array[:1]
+
+    content = asdf.dumps({"array": array, "same": array}, all_array_storage="inline")
+
+    with asdf.config_context() as cfg:
+        cfg.lazy_tree = False
+        tree = asdf.loads(content)
+        assert isinstance(tree["array"], np.ndarray)
+        assert tree["array"].dtype == array.dtype
+        assert_array_equal(tree["array"], array)
+        assert tree["same"] is tree["array"]
+
+    monkeypatch.setattr(ndarray._InlineNumericArray, "supports", staticmethod(lambda array: False))
+    assert asdf.dumps({"array": array, "same": array}, all_array_storage="inline") == content
+
+
+def test_inline_numeric_array_raw_tree(ndarray_tag):
+    """
+    Inline numeric data in a raw tagged tree is a list of the values.
+    """
+    content = f"""
+arr: !{ndarray_tag}
+  data: [[1, 2, 3], [4, 5, 6]]
+    """
+    buff = helpers.yaml_to_asdf(content)
+    with asdf.open(buff, _force_raw_types=True) as af:
+        data = af["arr"]["data"]
+        assert isinstance(data, list)
+        assert isinstance(data[0], list)
+        assert data == [[1, 2, 3], [4, 5, 6]]
+
+
+def test_inline_numeric_array_lazy_list():
+    """
+    The list contents of inline numeric data are only converted to
+    python objects when they are used.
+    """
+    array = np.arange(6).reshape(2, 3)
+    inline = tagged._InlineNumericArray(array)
+    assert not inline._filled
+    assert np.asarray(inline) is array
+    assert inline.tolist() == [[0, 1, 2], [3, 4, 5]]
+    assert not inline._filled
+
+    assert len(inline) == 2
+    assert inline._filled
+    assert inline == [[0, 1, 2], [3, 4, 5]]
+    assert list.__len__(inline) == 2
+
+    for copied in (copy.deepcopy(inline), pickle.loads(pickle.dumps(inline))):  # noqa: S301
+        assert copied == [[0, 1, 2], [3, 4, 5]]
+        assert_array_equal(copied.array, array)
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("[0x10, 1_000, 010]", [16, 1000, 8]),
+        ("[1, 2.5]", [1.0, 2.5]),
+        ("[1, .NaN, -.Inf]", [1.0, np.nan, -np.inf]),
+        ("[[yes, true], [off, 'no']]", [["True", "True"], ["False", "no"]]),
+    ],
+)
+def test_inline_data_not_parsed_in_bulk(data, expected, ndarray_tag):
+    """
+    Inline data that can not be parsed in bulk is still read correctly.
+    """
+    content = f"""
+arr: !{ndarray_tag}
+  data: {data}
+    """
+    buff = helpers.yaml_to_asdf(content)
+    with asdf.open(buff) as af:
+        assert_array_equal(af["arr"], expected)
+
+
+def test_array_summary(tmp_path):
+    fn = tmp_path / "test.asdf"
+    arr = np.arange(100, dtype="f8").reshape(10, 10)
+    arr[1, 2] = np.nan
+    tree = {
+        "arr": arr,
+        "view": arr[::2, 3:],
+        "ints": np.array([-3, 7, 2], dtype="i2"),
+        "empty": np.zeros(0, dtype="u4"),
+        "masked": ma.array([1, 2], mask=[0, 1]),
+        "inline": np.arange(3),
+    }
+    af = asdf.AsdfFile(tree)
+    af.set_array_storage(tree["inline"], "inline")
+    with asdf.config_context() as cfg:
+        cfg.array_summary = True
+        af.write_to(fn)
+
+    with asdf.open(fn, lazy_load=True, memmap=False) as af:
+        summary = af["arr"].summary
+        assert af["arr"]._array is None
+        assert summary["nan_count"] == 1
+        assert summary["min"] == 0
+        assert summary["max"] == 99
+        assert summary["mean"] == np.nanmean(arr)
+        assert summary["md5"] == ndarray.compute_array_summary(af["arr"]._make_array())["md5"]
+
+        assert af["view"].summary == ndarray.compute_array_summary(np.ascontiguousarray(arr[::2, 3:]))
+        assert af["ints"].summary["min"] == -3
+        assert af["ints"].summary["max"] == 7
+        assert af["empty"].summary == {"md5": ndarray.compute_array_summary(np.zeros(0))["md5"], "nan_count": 0}
+        assert af["masked"].summary is None
+        assert af["inline"].summary is None
+
+
+def test_array_summary_disabled(tmp_path):
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile({"arr": np.arange(10)}).write_to(fn)
+
+    with asdf.open(fn, lazy_load=True) as af:
+        assert af["arr"].summary is None
+
+
+def test_array_summary_chunks():
+    arr = np.arange(1000, dtype="i8").reshape(10, 100)[:, ::3]
+    for chunk_bytes in (8, 64, 10000):
+        chunks = list(ndarray._iter_flat_chunks(arr, chunk_bytes))
+        assert all(chunk.flags.c_contiguous and chunk.ndim == 1 for chunk in chunks)
+        assert_array_equal(np.concatenate(chunks), arr.ravel())
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_pickle_ndarraytype(tmp_path, compression):
+    import pickle
+
+    fn = tmp_path / "test.asdf"
+    arr = np.arange(10_000, dtype="i4")
+    af = asdf.AsdfFile({"arr": arr, "masked": ma.array([1, 2, 3], mask=[0, 1, 0]), "inline": np.arange(3)})
+    af.set_array_compression(arr, compression)
+    af.set_array_storage(af["inline"], "inline")
+    af.write_to(fn)
+
+    with asdf.open(fn, lazy_load=True, memmap=False) as af:
+        # unloaded arrays are pickled as a reference to the block
+        pkl = pickle.dumps(af["arr"])
+        assert len(pkl) < arr.nbytes // 10
+        assert af["arr"]._array is None
+        loaded = pickle.loads(pkl)  # noqa: S301
+        assert loaded._array is None
+        assert_array_equal(loaded, arr)
+
+        for key in ("masked", "inline"):
+            assert_array_equal(pickle.loads(pickle.dumps(af[key])), af[key])  # noqa: S301
+
+        # loaded (writable) arrays include their (possibly modified) data
+        af["arr"][0] = 42
+        loaded = pickle.loads(pickle.dumps(af["arr"]))  # noqa: S301
+        assert loaded._data_callback is None
+        assert loaded[0] == 42
@@ -4,6 +4,7 @@ import getpass
 import io
 import os
 import pathlib
+import subprocess
 import sys
 
 import numpy as np
@@ -599,3 +600,27 @@ def test_write_to_no_version_modification(tmp_path, valid_filename):
         return
     with asdf.open(fn) as af:
         assert af.version_string == "1.1.0"
+
+
+def test_import_is_lazy():
+    """
+    Importing asdf does not import the heavy submodules and dependencies
+    until the public API is used.
+    """
+    code = (
+        "import sys, asdf; "
+        "print([m for m in ('numpy', 'yaml', 'asdf._asdf', 'asdf._jsonschema', 'asdf.extension') "
+        "if m in sys.modules]); "
+        "asdf.AsdfFile; "
+        "print([m for m in ('numpy', 'yaml', 'asdf._asdf') if m not in sys.modules])"
+    )
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    assert output.splitlines() == ["[]", "[]"]
+
+
+@pytest.mark.parametrize("name", asdf.__all__)
+def test_public_api(name):
+    assert name in dir(asdf)
+    assert getattr(asdf, name) is not None
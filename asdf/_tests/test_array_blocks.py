@@ -986,3 +986,176 @@ def test_views_save_base(tmp_path, default_array_save_base, save_base):
             assert len(base) == 100
         else:
             assert len(base) == 10
+
+
+@pytest.mark.parametrize("lazy_load", [True, False])
+@pytest.mark.parametrize("memmap", [True, False])
+def test_append_blocks(tmp_path, lazy_load, memmap):
+    path = tmp_path / "test.asdf"
+    tree = _get_update_tree()
+    ff = asdf.AsdfFile(tree)
+    ff.set_array_compression(ff.tree["arrays"][1], "zlib")
+    ff.write_to(path, pad_blocks=True)
+
+    with open(path, "rb") as f:
+        original = f.read()
+
+    with asdf.open(path, lazy_load=lazy_load, memmap=memmap, mode="rw") as ff:
+        blocks = ff._blocks.blocks
+        start = blocks[0].offset - len(constants.BLOCK_MAGIC)
+        allocated_size = blocks[-1].header["allocated_size"]
+        end = blocks[-1].data_offset + allocated_size
+        ff.tree["arrays"].append(np.arange(32))
+        ff.append_blocks()
+        assert len(ff._blocks.blocks) == 4
+        if lazy_load:
+            # arrays that were never loaded are not read
+            assert ff.tree["arrays"][0]._array is None
+        assert_array_equal(ff.tree["arrays"][0], tree["arrays"][0])
+        assert_array_equal(ff.tree["arrays"][3], np.arange(32))
+
+    # the existing blocks were not rewritten
+    with open(path, "rb") as f:
+        assert f.read()[start:end] == original[start:end]
+
+    with asdf.open(path) as ff:
+        for i in range(3):
+            assert_array_equal(ff.tree["arrays"][i], tree["arrays"][i])
+        assert_array_equal(ff.tree["arrays"][3], np.arange(32))
+        assert ff.get_array_compression(ff.tree["arrays"][1]) == "zlib"
+        assert len(ff._blocks.blocks) == 4
+
+
+@pytest.mark.parametrize("lazy_load", [True, False])
+@pytest.mark.parametrize("memmap", [True, False])
+def test_append_blocks_changed_array(tmp_path, lazy_load, memmap):
+    path = tmp_path / "test.asdf"
+    tree = _get_update_tree()
+    asdf.AsdfFile(tree).write_to(path, pad_blocks=True)
+
+    with asdf.open(path, lazy_load=lazy_load, memmap=memmap, mode="rw") as ff:
+        ff.tree["arrays"][1][0] = 42
+        # unchanged (in memory) arrays are found by checksum
+        np.asarray(ff.tree["arrays"][2])
+        ff.append_blocks()
+        # memory mapped changes are written in place, others to a new block
+        assert len(ff._blocks.blocks) == (3 if memmap else 4)
+
+    with asdf.open(path) as ff:
+        assert ff.tree["arrays"][1][0] == 42
+        assert_array_equal(ff.tree["arrays"][1][1:], tree["arrays"][1][1:])
+        assert_array_equal(ff.tree["arrays"][2], tree["arrays"][2])
+
+
+def test_append_blocks_tree_does_not_fit(tmp_path):
+    path = tmp_path / "test.asdf"
+    tree = _get_update_tree()
+    asdf.AsdfFile(tree).write_to(path)
+
+    with asdf.open(path, mode="rw") as ff:
+        ff.tree["arrays"][1][0] = 42
+        ff.tree["arrays"].append(np.arange(32))
+        # falls back to update, which doesn't leave unused blocks
+        ff.append_blocks()
+        assert len(ff._blocks.blocks) == 4
+
+    with asdf.open(path, mode="rw") as ff:
+        assert ff.tree["arrays"][1][0] == 42
+        assert_array_equal(ff.tree["arrays"][3], np.arange(32))
+        # the update left room for the tree to grow
+        first_block_offset = ff._blocks.blocks[0].offset
+        ff.tree["arrays"].append(np.arange(16))
+        ff.append_blocks()
+        assert ff._blocks.blocks[0].offset == first_block_offset
+        assert len(ff._blocks.blocks) == 5
+
+    with asdf.open(path) as ff:
+        assert_array_equal(ff.tree["arrays"][4], np.arange(16))
+
+
+@pytest.mark.parametrize("deduplicate_blocks", [True, False])
+def test_deduplicate_blocks(tmp_path, deduplicate_blocks):
+    path = tmp_path / "test.asdf"
+    mask = np.zeros((8, 8), dtype="uint8")
+    tree = {
+        "a": mask,
+        "b": mask.copy(),
+        "c": mask[:4],
+        "d": mask.copy().view("int16"),
+        "e": np.ones((8, 8), dtype="uint8"),
+    }
+    af = asdf.AsdfFile(tree)
+    with asdf.config_context() as cfg:
+        cfg.deduplicate_blocks = deduplicate_blocks
+        af.write_to(path)
+
+    with asdf.open(path) as af2:
+        if deduplicate_blocks:
+            # b has the same bytes and dtype as a, c is a view of a and
+            # d has the same bytes but a different dtype
+            assert af.deduplicated_bytes == mask.nbytes
+            assert len(af2._blocks.blocks) == 3
+        else:
+            assert af.deduplicated_bytes == 0
+            assert len(af2._blocks.blocks) == 4
+        for key, value in tree.items():
+            assert af2[key].dtype == value.dtype
+            assert_array_equal(af2[key], value)
+
+
+@pytest.mark.parametrize("memmap", [True, False])
+def test_deduplicate_blocks_rw(tmp_path, memmap):
+    """
+    Arrays with the same bytes and dtype share a block (and are read back
+    as views of the same data), arrays with a different dtype do not.
+    """
+    path = tmp_path / "test.asdf"
+    tree = {"a": np.zeros(8, dtype="int32"), "b": np.zeros(8, dtype="float32"), "c": np.zeros(8, dtype="int32")}
+    with asdf.config_context() as cfg:
+        cfg.deduplicate_blocks = True
+        asdf.AsdfFile(tree).write_to(path)
+
+    with asdf.open(path, mode="rw", memmap=memmap) as af:
+        assert len(af._blocks.blocks) == 2
+        af["a"][0] = 5
+        assert af["c"][0] == 5
+        assert_array_equal(af["b"], np.zeros(8, dtype="float32"))
+
+
+def test_deduplicate_blocks_compression(tmp_path):
+    path = tmp_path / "test.asdf"
+    tree = {"a": np.arange(64), "b": np.arange(64), "c": np.arange(64)}
+    af = asdf.AsdfFile(tree)
+    af.set_array_compression(tree["b"], "zlib")
+    af.set_array_compression(tree["c"], "zlib")
+    with asdf.config_context() as cfg:
+        cfg.deduplicate_blocks = True
+        af.write_to(path)
+    assert af.deduplicated_bytes == tree["c"].nbytes
+
+    with asdf.open(path) as af2:
+        assert len(af2._blocks.blocks) == 2
+        assert af2.get_array_compression(af2["a"]) is None
+        assert af2.get_array_compression(af2["c"]) == "zlib"
+        for key, value in tree.items():
+            assert_array_equal(af2[key], value)
+
+
+def test_deduplicate_blocks_update(tmp_path):
+    path = tmp_path / "test.asdf"
+    asdf.AsdfFile({"a": np.arange(64)}).write_to(path)
+
+    with asdf.config_context() as cfg:
+        cfg.deduplicate_blocks = True
+        with asdf.open(path, mode="rw") as af:
+            af["b"] = np.arange(64)
+            af["c"] = np.arange(64) * 2
+            af.update()
+            assert af.deduplicated_bytes == af["b"].nbytes
+            assert_array_equal(af["b"], np.arange(64))
+
+    with asdf.open(path) as af:
+        assert len(af._blocks.blocks) == 2
+        assert_array_equal(af["a"], np.arange(64))
+        assert_array_equal(af["b"], np.arange(64))
+        assert_array_equal(af["c"], np.arange(64) * 2)
@@ -390,3 +390,48 @@ def test_asdf_file_pickle_from_dict():
     pkl = pickle.dumps(af)
     loaded = pickle.loads(pkl)  # noqa: S301
     assert_tree_match(af.tree, loaded.tree)
+
+
+def test_asdf_file_pickle_array_options():
+    """Block options set for in-memory arrays are pickled with the AsdfFile"""
+    arr = np.arange(100)
+    af = AsdfFile({"a": arr, "b": arr[::2], "c": np.ones(3)})
+    af.set_array_compression(arr, "zlib", level=1)
+    af.set_array_storage(af["c"], "inline")
+    loaded = pickle.loads(pickle.dumps(af))  # noqa: S301
+    assert loaded.get_array_compression(loaded["a"]) == "zlib"
+    assert loaded.get_array_compression_kwargs(loaded["a"]) == {"level": 1}
+    assert loaded.get_array_compression(loaded["b"]) == "zlib"
+    assert loaded.get_array_storage(loaded["c"]) == "inline"
+
+
+@pytest.mark.parametrize("open_kwargs", [{"lazy_load": True}, {"memmap": True}, {"lazy_tree": True}])
+def test_asdf_file_pickle_from_file(tmp_path, open_kwargs):
+    """Arrays in a pickled AsdfFile are read from the file, not stored in the pickle"""
+    fn = tmp_path / "test.asdf"
+    arr = np.arange(100_000, dtype="f8")
+    AsdfFile({"a": arr, "b": arr[::2], "c": {"d": [1, 2]}}).write_to(fn)
+
+    with open_asdf(fn, **open_kwargs) as af:
+        pkl = pickle.dumps(af)
+    assert len(pkl) < arr.nbytes // 10
+
+    loaded = pickle.loads(pkl)  # noqa: S301
+    assert loaded.tree["c"] == {"d": [1, 2]}
+    np.testing.assert_array_equal(loaded["a"], arr)
+    np.testing.assert_array_equal(loaded["b"], arr[::2])
+    # arrays that shared a block still share memory
+    assert np.shares_memory(loaded["a"], loaded["b"])
+
+
+def test_array_pickle_from_modified_file(tmp_path):
+    fn = tmp_path / "test.asdf"
+    AsdfFile({"a": np.arange(10)}).write_to(fn)
+
+    with open_asdf(fn, lazy_load=True) as af:
+        pkl = pickle.dumps(af["a"])
+
+    AsdfFile({"a": np.arange(20)}).write_to(fn)
+    loaded = pickle.loads(pkl)  # noqa: S301
+    with pytest.raises(OSError, match="has changed"):
+        np.asarray(loaded)
@@ -127,6 +127,30 @@ def test_lz4(tmp_path):
     _roundtrip(tmp_path, tree, "lz4")
 
 
+def test_lz4_decompress_frames():
+    pytest.importorskip("lz4")
+    data = np.arange(1000, dtype=np.uint8)
+    buff = io.BytesIO()
+    _compression.compress(buff, data, "lz4", config={"compression_block_size": 300})
+    _compression.compress(buff, data[:10], "lz4")
+    compressed = buff.getvalue()
+
+    # split the compressed data at arbitrary positions
+    blocks = [compressed[i : i + 7] for i in range(0, len(compressed), 7)]
+    frames = list(_compression.decompress_frames(blocks, "lz4"))
+    assert [frame.size for frame in frames] == [300, 300, 300, 100, 10]
+    np.testing.assert_array_equal(np.concatenate(frames), np.concatenate([data, data[:10]]))
+
+    with pytest.raises(ValueError, match=r"incomplete frame"):
+        list(_compression.decompress_frames([compressed[:-1]], "lz4"))
+
+    assert _compression.is_framed("lz4")
+    assert not _compression.is_framed("zlib")
+    assert not _compression.is_framed(None)
+    with pytest.raises(ValueError, match=r"does not support decompressing frames"):
+        list(_compression.decompress_frames(blocks, "zlib"))
+
+
 def test_recompression(tmp_path):
     tree = _get_large_tree()
     tmpfile = os.path.join(str(tmp_path), "test1.asdf")
@@ -261,3 +285,187 @@ def test_compression_with_extension(tmp_path):
 
         with asdf.open(fn) as af:
             assert hist in af["history"]["extensions"]
+
+
+def _get_auto_sparse_data():
+    arr = np.zeros((128, 128))
+    arr[::16, ::8] = np.arange(128).reshape(8, 16)
+    return arr
+
+
+@pytest.mark.parametrize("objective", _compression.AUTO_OBJECTIVES)
+def test_choose_compression(objective):
+    noise = np.random.default_rng(1).normal(size=(128, 128)).view(np.uint8).ravel()
+    sparse = _get_auto_sparse_data().view(np.uint8).ravel()
+
+    # incompressible data is not compressed
+    assert _compression.choose_compression(noise, objective) is None
+    assert _compression.choose_compression(sparse, objective) in _compression.AUTO_COMPRESSIONS
+    assert _compression.choose_compression(sparse, objective, candidates=["zlib"]) == "zlib"
+    assert _compression.choose_compression(sparse, objective, candidates=[]) is None
+    assert _compression.choose_compression(sparse[:0], objective) is None
+
+
+def test_choose_compression_size():
+    data = _get_auto_sparse_data().view(np.uint8).ravel()
+    sizes = {label: _compression.get_compressed_size(data, label) for label in _compression.AUTO_COMPRESSIONS}
+    assert _compression.choose_compression(data, "size") == min(sizes, key=sizes.get)
+
+
+def test_choose_compression_invalid_objective():
+    with pytest.raises(ValueError, match=r"Compression objective must be one of"):
+        _compression.choose_compression(np.zeros(8, np.uint8), "small")
+
+
+def test_auto_compression(tmp_path):
+    tree = {"science_data": np.random.default_rng(1).normal(size=(128, 128)), "mask": _get_auto_sparse_data()}
+    fn = _roundtrip(tmp_path, tree, "auto", write_options={"compression_kwargs": {"objective": "size"}})
+
+    with asdf.open(fn) as af:
+        assert af.get_array_compression(af["science_data"]) is None
+        assert af.get_array_compression(af["mask"]) in _compression.AUTO_COMPRESSIONS
+
+
+def test_set_array_compression_auto(tmp_path):
+    tmpfile = tmp_path / "auto.asdf"
+    tree = {"mask": np.zeros(1000, dtype="uint8")}
+    with config_context() as config:
+        config.add_extension(LzmaExtension())
+
+        af = asdf.AsdfFile(tree)
+        af.set_array_compression(tree["mask"], "auto", objective="size", candidates=["lzma"])
+        assert af.get_array_compression(tree["mask"]) == "auto"
+        af.write_to(tmpfile)
+
+        with asdf.open(tmpfile) as af:
+            assert af.get_array_compression(af["mask"]) == "lzma"
+            extensions = [ext["extension_class"] for ext in af["history"]["extensions"]]
+            assert "asdf._tests.test_compression.LzmaExtension" in extensions
+            np.testing.assert_array_equal(af["mask"], tree["mask"])
+
+
+@pytest.mark.parametrize("dtype", ["<f8", ">f4", "<i2", ">u8", "u1", "S3"])
+@pytest.mark.parametrize(
+    "filters", [["shuffle"], ["bitshuffle"], ["delta"], ["delta", "shuffle"], ["bitshuffle", "delta"]]
+)
+def test_apply_filters(dtype, filters):
+    dtype = np.dtype(dtype)
+    if "delta" in filters and dtype.itemsize not in (1, 2, 4, 8):
+        with pytest.raises(ValueError, match=r"The delta filter can not be used"):
+            _compression.normalize_filters(filters, dtype)
+        return
+    filters = _compression.normalize_filters(filters, dtype)
+    data = np.random.default_rng(1).integers(0, 256, 1001 * dtype.itemsize + 1, dtype=np.uint8)
+    original = data.copy()
+    filtered = _compression.apply_filters(data, filters, dtype)
+    assert filtered.shape == data.shape
+    np.testing.assert_array_equal(data, original)
+    np.testing.assert_array_equal(_compression.apply_filters(filtered, filters, dtype, inverse=True), data)
+
+
+def test_truncate_filter():
+    data = np.random.default_rng(1).normal(size=1000)
+    filters = _compression.normalize_filters([{"name": "truncate", "bits": 10}], data.dtype)
+    truncated = _compression.apply_filters(data.view(np.uint8), filters, data.dtype).view(data.dtype)
+    np.testing.assert_allclose(truncated, data, rtol=2**-10)
+    assert not np.any(truncated.view(np.uint64) & np.uint64(2**42 - 1))
+    # truncate can't be undone
+    np.testing.assert_array_equal(
+        _compression.apply_filters(truncated.view(np.uint8), filters, data.dtype, inverse=True),
+        truncated.view(np.uint8),
+    )
+
+
+@pytest.mark.parametrize(
+    "filters, dtype, match",
+    [
+        (["unknown"], "f8", r"Supported filters are"),
+        ([{"name": "truncate", "bits": 10}], "i4", r"The truncate filter can only be used"),
+        ([{"name": "truncate", "bits": 24}], "f4", r"The truncate filter requires bits between 0 and 23"),
+        ([{"name": "truncate"}], "f4", r"The truncate filter requires bits"),
+    ],
+)
+def test_invalid_filters(filters, dtype, match):
+    with pytest.raises(ValueError, match=match):
+        _compression.normalize_filters(filters, np.dtype(dtype))
+
+
+@pytest.mark.parametrize("compression", ["zlib", "bzp2", "lz4"])
+def test_filters(tmp_path, compression):
+    tree = {
+        "science_data": np.random.default_rng(1).normal(size=(128, 128)),
+        "counts": np.arange(10000, dtype=">i4"),
+    }
+    filters = {"science_data": ["shuffle"], "counts": ["delta", "bitshuffle"]}
+    tmpfile = tmp_path / "filtered.asdf"
+
+    with asdf.AsdfFile(tree) as af:
+        for key, value in filters.items():
+            af.set_array_compression(af[key], compression, filters=value)
+        af.write_to(tmpfile)
+
+    with asdf.open(tmpfile) as af:
+        for key, value in tree.items():
+            assert af.get_array_compression(af[key]) == "filt"
+            np.testing.assert_array_equal(af[key], value)
+            block = af._blocks.blocks.block_for_data(af[key].base)
+            assert block.header["used_size"] < _compression.get_compressed_size(value.view(np.uint8), compression)
+
+        # the filtered blocks can be written again
+        af.write_to(tmp_path / "rewritten.asdf")
+
+    with asdf.open(tmp_path / "rewritten.asdf") as af:
+        for key, value in tree.items():
+            np.testing.assert_array_equal(af[key], value)
+
+
+def test_filters_kept_on_rewrite(tmp_path):
+    """
+    Blocks read with filters are written again (by write_to, update and
+    with "input" compression) with the same compression and filters.
+    """
+    arr = np.arange(10000, dtype=">i4")
+    tmpfile = tmp_path / "filtered.asdf"
+    with asdf.AsdfFile({"counts": arr}) as af:
+        af.set_array_compression(af["counts"], "lz4", filters=["delta", "bitshuffle"])
+        af.write_to(tmpfile)
+
+    expected = {
+        "compression": "lz4",
+        "filters": _compression.normalize_filters(["delta", "bitshuffle"], arr.dtype),
+        "dtype": ">i4",
+    }
+
+    def _assert_filtered(path):
+        with asdf.open(path) as af:
+            assert af.get_array_compression(af["counts"]) == "filt"
+            assert af.get_array_compression_kwargs(af["counts"]) == expected
+            np.testing.assert_array_equal(af["counts"], arr)
+
+    _assert_filtered(tmpfile)
+
+    with asdf.open(tmpfile) as af:
+        af.write_to(tmp_path / "rewritten.asdf")
+    _assert_filtered(tmp_path / "rewritten.asdf")
+
+    with asdf.open(tmpfile) as af:
+        af.set_array_compression(af["counts"], "zlib")
+        af.set_array_compression(af["counts"], "input")
+        af.write_to(tmp_path / "input.asdf")
+    _assert_filtered(tmp_path / "input.asdf")
+
+    with asdf.open(tmpfile, mode="rw") as af:
+        af["counts"][0] = 0
+        af["other"] = np.ones(10)
+        af.update()
+    arr[0] = 0
+    _assert_filtered(tmpfile)
+
+
+def test_filters_require_compression():
+    data = np.arange(10)
+    af = asdf.AsdfFile({"data": data})
+    with pytest.raises(ValueError, match=r"Array filters can only be used with compression"):
+        af.set_array_compression(data, None, filters=["shuffle"])
+    with pytest.raises(ValueError, match=r"Supported filters are"):
+        af.set_array_compression(data, "zlib", filters=["unknown"])
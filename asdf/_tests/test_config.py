@@ -146,6 +146,73 @@ def test_all_array_compression_kwargs():
             config.all_array_compression_kwargs = "foo"
 
 
+def test_lazy_tree_cache_size():
+    with asdf.config_context() as config:
+        assert config.lazy_tree_cache_size == asdf.config.DEFAULT_LAZY_TREE_CACHE_SIZE
+        config.lazy_tree_cache_size = 10
+        assert get_config().lazy_tree_cache_size == 10
+        config.lazy_tree_cache_size = None
+        assert get_config().lazy_tree_cache_size is None
+        with pytest.raises(ValueError, match=r"lazy_tree_cache_size must be None or a non-negative integer"):
+            config.lazy_tree_cache_size = -1
+
+
+def test_shared_memory_blocks():
+    with asdf.config_context() as config:
+        assert config.shared_memory_blocks == asdf.config.DEFAULT_SHARED_MEMORY_BLOCKS
+        config.shared_memory_blocks = True
+        assert get_config().shared_memory_blocks is True
+    assert get_config().shared_memory_blocks == asdf.config.DEFAULT_SHARED_MEMORY_BLOCKS
+
+
+def test_block_cache_size():
+    with asdf.config_context() as config:
+        assert config.block_cache_size == asdf.config.DEFAULT_BLOCK_CACHE_SIZE
+        config.block_cache_size = 1024
+        assert get_config().block_cache_size == 1024
+        config.block_cache_size = None
+        assert get_config().block_cache_size is None
+        with pytest.raises(ValueError, match=r"block_cache_size must be None or a non-negative integer"):
+            config.block_cache_size = -1
+
+
+def test_block_cache_directory(tmp_path):
+    with asdf.config_context() as config:
+        assert config.block_cache_directory == asdf.config.DEFAULT_BLOCK_CACHE_DIRECTORY
+        assert config.block_cache_directory_size == asdf.config.DEFAULT_BLOCK_CACHE_DIRECTORY_SIZE
+        config.block_cache_directory = tmp_path
+        assert get_config().block_cache_directory == str(tmp_path)
+        config.block_cache_directory_size = 1024
+        assert get_config().block_cache_directory_size == 1024
+        with pytest.raises(ValueError, match=r"block_cache_directory_size must be a non-negative integer"):
+            config.block_cache_directory_size = -1
+
+
+def test_block_write_threads():
+    with asdf.config_context() as config:
+        assert config.block_write_threads == asdf.config.DEFAULT_BLOCK_WRITE_THREADS
+        config.block_write_threads = 4
+        assert get_config().block_write_threads == 4
+        with pytest.raises(ValueError, match=r"block_write_threads must be a positive integer"):
+            config.block_write_threads = 0
+
+
+def test_entry_point_cache():
+    with asdf.config_context() as config:
+        assert config.entry_point_cache is False
+        config.entry_point_cache = True
+        assert get_config().entry_point_cache is True
+    assert get_config().entry_point_cache is False
+
+
+def test_deduplicate_blocks():
+    with asdf.config_context() as config:
+        assert config.deduplicate_blocks == asdf.config.DEFAULT_DEDUPLICATE_BLOCKS
+        config.deduplicate_blocks = True
+        assert get_config().deduplicate_blocks is True
+    assert get_config().deduplicate_blocks == asdf.config.DEFAULT_DEDUPLICATE_BLOCKS
+
+
 def test_resource_mappings():
     with asdf.config_context() as config:
         core_mappings = get_json_schema_resource_mappings() + asdf_standard.integration.get_resource_mappings()
@@ -1,11 +1,12 @@
 import sys
+import warnings
 
 import pytest
 
 from asdf import _entry_points
 from asdf._version import version as asdf_package_version
 from asdf.exceptions import AsdfWarning
-from asdf.extension import ExtensionProxy
+from asdf.extension import Converter, ExtensionProxy
 from asdf.resource import ResourceMappingProxy
 
 # The standard library importlib.metadata returns duplicate entrypoints
@@ -37,6 +38,11 @@ def _monkeypatch_entry_points(monkeypatch, mock_entry_points):
     monkeypatch.setattr(_entry_points, "entry_points", patched_entry_points)
 
 
+@pytest.fixture(autouse=True)
+def _cache_dir(monkeypatch, tmp_path):
+    monkeypatch.setenv("ASDF_CACHE_DIR", str(tmp_path))
+
+
 def resource_mappings_entry_point_successful():
     return [
         {"http://somewhere.org/schemas/foo-1.0.0": b"foo"},
@@ -172,3 +178,128 @@ def test_get_extensions(mock_entry_points):
     with pytest.warns(AsdfWarning, match=r"TypeError"):
         extensions = _entry_points.get_extensions()
     assert len(extensions) == 0
+
+
+class CachedType:
+    pass
+
+
+class CachedConverter(Converter):
+    tags = ["asdf://somewhere.org/tags/cached-*"]
+    types = [CachedType]
+
+    def to_yaml_tree(self, obj, tag, ctx):
+        return {}
+
+    def from_yaml_tree(self, node, tag, ctx):
+        return CachedType()
+
+
+class CachedExtension:
+    extension_uri = "asdf://somewhere.org/extensions/cached-1.0.0"
+    tags = ["asdf://somewhere.org/tags/cached-1.0.0"]
+    converters = [CachedConverter()]
+    yaml_tag_handles = {"!cached!": "asdf://somewhere.org/tags/"}
+
+
+def extensions_entry_point_cached():
+    return [CachedExtension()]
+
+
+def test_cached_extensions(mock_entry_points):
+    mock_entry_points.append(
+        ("asdf.extensions", "cached", "asdf._tests.test_entry_points:extensions_entry_point_cached"),
+    )
+    (extension,) = _entry_points.get_extensions()
+    assert type(extension) is ExtensionProxy
+
+    (cached,) = _entry_points.get_extensions()
+    assert isinstance(cached, ExtensionProxy)
+    assert not cached.loaded
+    assert cached.extension_uri == extension.extension_uri
+    assert cached.class_name == extension.class_name
+    assert [t.tag_uri for t in cached.tags] == ["asdf://somewhere.org/tags/cached-1.0.0"]
+    assert cached.yaml_tag_handles == extension.yaml_tag_handles
+    assert cached.asdf_standard_requirement == extension.asdf_standard_requirement
+    assert cached.validators == []
+    assert cached.compressors == []
+    (converter,) = cached.converters
+    assert converter.tags == ["asdf://somewhere.org/tags/cached-1.0.0"]
+    assert converter.types == ["asdf._tests.test_entry_points.CachedType"]
+    assert converter.extension is cached
+    assert cached in {cached}
+    assert not cached.loaded
+
+    assert isinstance(converter.from_yaml_tree({}, converter.tags[0], None), CachedType)
+    assert cached.loaded
+    assert isinstance(cached.delegate, CachedExtension)
+    assert cached == ExtensionProxy(cached.delegate)
+
+
+def test_cached_resource_mappings(mock_entry_points):
+    mock_entry_points.append(
+        (
+            "asdf.resource_mappings",
+            "successful",
+            "asdf._tests.test_entry_points:resource_mappings_entry_point_successful",
+        ),
+    )
+    _entry_points.get_resource_mappings()
+    mappings = _entry_points.get_resource_mappings()
+    assert [list(m) for m in mappings] == [
+        ["http://somewhere.org/schemas/foo-1.0.0"],
+        ["http://somewhere.org/schemas/bar-1.0.0"],
+    ]
+    assert "http://somewhere.org/schemas/foo-1.0.0" in mappings[0]
+    assert not any(m.loaded for m in mappings)
+
+    assert mappings[1]["http://somewhere.org/schemas/bar-1.0.0"] == b"bar"
+    assert mappings[1].loaded
+    assert mappings[1].package_name == "asdf"
+
+
+def test_failing_entry_points_not_cached(mock_entry_points):
+    mock_entry_points.append(
+        ("asdf.extensions", "bad_element", "asdf._tests.test_entry_points:extensions_entry_point_bad_element"),
+    )
+    for _ in range(2):
+        with pytest.warns(AsdfWarning, match=r"TypeError: Extension must implement the Extension interface"):
+            extensions = _entry_points.get_extensions()
+        assert [type(e) for e in extensions] == [ExtensionProxy, ExtensionProxy]
+
+
+def extensions_entry_point_warning():
+    warnings.warn("plugin is deprecated", DeprecationWarning)
+    return [CachedExtension()]
+
+
+def test_warning_entry_points_not_cached(mock_entry_points):
+    mock_entry_points.append(
+        ("asdf.extensions", "warning", "asdf._tests.test_entry_points:extensions_entry_point_warning"),
+    )
+    for _ in range(2):
+        with pytest.warns(DeprecationWarning, match=r"plugin is deprecated"):
+            (extension,) = _entry_points.get_extensions()
+        assert type(extension) is ExtensionProxy
+
+
+def test_cache_disabled(mock_entry_points, tmp_path):
+    mock_entry_points.append(
+        ("asdf.extensions", "cached", "asdf._tests.test_entry_points:extensions_entry_point_cached"),
+    )
+    for _ in range(2):
+        (extension,) = _entry_points.get_extensions(cache=False)
+        assert type(extension) is ExtensionProxy
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_unwritable_cache(mock_entry_points, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "not_a_dir"
+    cache_dir.write_bytes(b"")
+    monkeypatch.setenv("ASDF_CACHE_DIR", str(cache_dir))
+    mock_entry_points.append(
+        ("asdf.extensions", "cached", "asdf._tests.test_entry_points:extensions_entry_point_cached"),
+    )
+    for _ in range(2):
+        (extension,) = _entry_points.get_extensions()
+        assert type(extension) is ExtensionProxy
@@ -857,3 +857,32 @@ def test_write_file_permissions(tmp_path, umask):
     os.umask(previous_umask)
     target_permissions = generic_io._FILE_PERMISSIONS_NO_EXECUTE & ~umask
     assert permissions == target_permissions
+
+
+def _open_for_read_into_array_at(tmp_path, kind, mode="r"):
+    content = bytes(range(100))
+    if kind == "real":
+        fn = tmp_path / "test.bin"
+        fn.write_bytes(content)
+        return generic_io.get_file(fn, mode=mode)
+    return generic_io.get_file(io.BytesIO(content), mode=mode)
+
+
+@pytest.mark.parametrize("kind", ["real", "bytes_io"])
+def test_read_into_array_at(tmp_path, kind):
+    fd = _open_for_read_into_array_at(tmp_path, kind)
+
+    with fd:
+        fd.seek(7)
+        assert fd.read_into_array_at(10, 20).tolist() == list(range(10, 30))
+        assert fd.read_into_array_at(90, 10).tolist() == list(range(90, 100))
+        # the file position is unchanged
+        assert fd.tell() == 7
+
+
+@pytest.mark.parametrize("mode", ["r", "rw"])
+@pytest.mark.parametrize("kind", ["real", "bytes_io"])
+def test_read_into_array_at_truncated(tmp_path, kind, mode):
+    with _open_for_read_into_array_at(tmp_path, kind, mode) as fd:
+        with pytest.raises(ValueError, match=r"(Read 10 bytes at offset 90|buffer is smaller)"):
+            fd.read_into_array_at(90, 20)
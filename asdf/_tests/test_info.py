@@ -867,3 +867,20 @@ def test_info_blocks_hide(capsys, test_data_path, snapshot):
         out = _get_block_output(capsys, af)
         # Run `pytest --snapshot-update` to update stored snapshot
         assert out == snapshot
+
+
+@pytest.mark.parametrize("max_rows, num_shown", [(12, 1), ((None, 3), 2)])
+def test_info_lazy_tree_bounded(capsys, tmp_path, max_rows, num_shown):
+    """
+    Nodes that aren't rendered should not be converted
+    """
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile({"arrays": [np.arange(i + 1) for i in range(100)]}).write_to(fn)
+
+    with asdf.open(fn, lazy_tree=True) as af:
+        af.info(max_rows=max_rows)
+        converted = [not isinstance(item, asdf.tagged.Tagged) for item in af.tree["arrays"].data]
+        assert converted == [True] * num_shown + [False] * (100 - num_shown)
+
+    captured = capsys.readouterr()
+    assert f"{100 - num_shown} not shown" in captured.out
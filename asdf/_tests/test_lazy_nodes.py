@@ -1,11 +1,14 @@
 import collections
 import copy
 import gc
+import threading
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import numpy as np
 import pytest
+from numpy.testing import assert_array_equal
 
 import asdf
 from asdf.lazy_nodes import AsdfDictNode, AsdfListNode, AsdfOrderedDictNode, _resolve_af_ref, _to_lazy_node
@@ -316,6 +319,96 @@ def test_cache_non_weakref():
     assert cache_item.custom_object == complex(1, 1)
 
 
+def test_cache_drops_collected_items(cache_test_tree_path):
+    with asdf.open(cache_test_tree_path, lazy_tree=True) as af:
+        cache = af._tagged_object_cache
+        # opening the file converts some nodes (like the history)
+        size = len(cache)
+        hits = cache.hits
+        misses = cache.misses
+
+        af["a"][0]
+        assert len(cache) == size + 2
+        assert cache.misses == misses + 2
+
+        af["b"][1]
+        assert len(cache) == size + 2
+        assert cache.hits == hits + 2
+        assert cache.stats == {"hits": hits + 2, "misses": misses + 2, "evictions": 0, "size": size + 2}
+
+        # items are removed when the converted objects are garbage
+        # collected, without having to look them up again
+        del af.tree["a"], af.tree["b"]
+        gc.collect(2)
+        assert len(cache) == size
+
+
+@pytest.mark.parametrize("max_size", [None, 0, 2])
+def test_cache_max_size(tmp_path, max_size):
+    values = [complex(i, 1) for i in range(5)]
+    my_array = np.arange(3, dtype="uint8")
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile({"values": values, "a": my_array, "b": my_array}).write_to(fn)
+
+    with asdf.config_context() as cfg:
+        cfg.lazy_tree_cache_size = max_size
+        with asdf.open(fn, lazy_tree=True) as af:
+            cache = af._tagged_object_cache
+            size = len(cache)
+            # complex numbers can't be weakly referenced so are
+            # kept alive by the cache (up to max_size)
+            assert list(af["values"]) == values
+            n_held = 5 if max_size is None else max_size
+            assert cache.evictions == 5 - n_held
+            # +1 for the "values" list
+            assert len(cache) == size + n_held + 1
+
+            # objects that can be weakly referenced are never evicted
+            # so shared objects keep their identity
+            assert af["a"] is af["b"]
+
+
+def test_cache_max_size_aliased(tmp_path):
+    """
+    Objects for aliased nodes that can't be weakly referenced keep their
+    identity when more than lazy_tree_cache_size objects are converted
+    """
+    fn = tmp_path / "test.asdf"
+    fn.write_bytes(
+        b"""#ASDF 1.0.0
+#ASDF_STANDARD 1.6.0
+%YAML 1.1
+%TAG ! tag:stsci.edu:asdf/
+--- !core/asdf-1.1.0
+a: &shared !core/complex-1.0.0 5+1j
+values: [!core/complex-1.0.0 0+1j, !core/complex-1.0.0 1+1j, !core/complex-1.0.0 2+1j]
+b: *shared
+...
+"""
+    )
+
+    with asdf.config_context() as cfg:
+        cfg.lazy_tree_cache_size = 1
+        with asdf.open(fn, lazy_tree=True) as af:
+            cache = af._tagged_object_cache
+            a = af["a"]
+            assert list(af["values"]) == [0 + 1j, 1 + 1j, 2 + 1j]
+            assert cache.evictions == 2
+            assert af["b"] is a
+
+
+def test_cache_item_tagged_node():
+    tagged_node = asdf.tagged.TaggedDict({}, "tag:nowhere.org:custom/foo-1.0.0")
+    obj = AsdfDictNode()
+    cache_item = asdf.lazy_nodes._TaggedObjectCacheItem(tagged_node, obj)
+    assert cache_item.tagged_node is tagged_node
+    assert cache_item.custom_object is obj
+    assert not cache_item.holds_custom_object
+    del tagged_node
+    gc.collect(2)
+    assert cache_item.tagged_node is None
+
+
 @pytest.fixture(params=[True, False, None], ids=["lazy", "not-lazy", "undefined"])
 def lazy_test_class(request):
     class Foo:
@@ -435,3 +528,25 @@ def test_lazy_copy(tmp_path):
     gc.collect(2)
     assert af2["a"]["b"] == obj
     assert af2["a"]["c"]["b"] is af2["a"]["b"]
+
+
+def test_concurrent_conversion(tmp_path):
+    my_array = np.arange(3, dtype="uint8")
+    tree = {f"l{i}": [my_array, {"a": my_array}] for i in range(20)}
+    fn = tmp_path / "test.asdf"
+    asdf.AsdfFile(tree).write_to(fn)
+
+    with asdf.open(fn, lazy_tree=True, lazy_load=True) as af:
+        barrier = threading.Barrier(8)
+
+        def convert(i):
+            barrier.wait()
+            keys = [f"l{(i + j) % 20}" for j in range(20)]
+            return [(af[key][0], af[key][1]["a"]) for key in keys]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = [obj for result in executor.map(convert, range(8)) for pair in result for obj in pair]
+
+        # every reference to the array resolves to the same object
+        assert all(obj is results[0] for obj in results)
+        assert_array_equal(results[0], my_array)
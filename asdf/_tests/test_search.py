@@ -203,3 +203,71 @@ def test_search():
 
     result = af.search(value="hello")
     assert result.node == "hello"
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        {},
+        {"key": "foo"},
+        {"key": "^fo"},
+        {"key": 1},
+        {"key": "index", "value": 1},
+        {"type_": int},
+        {"type_": "int"},
+        {"type_": dict},
+        {"type_": "numpy"},
+        {"value": 24},
+        {"value": "^wh"},
+        {"value": True},
+        {"value": [1, 2]},
+        {"value": np.float64(24.0)},
+        {"filter_": lambda n: isinstance(n, int) and n == 24},
+        {"key": "foo", "type_": int, "value": 42},
+    ],
+)
+def test_use_index(asdf_file, query):
+    asdf_file["array"] = np.arange(3)
+    asdf_file["flags"] = [True, 1, 1.0, None]
+    asdf_file["pair"] = [1, 2]
+
+    expected = asdf_file.search(**query)
+    result = asdf_file.search(**query, use_index=True)
+    assert result.paths == expected.paths
+    assert repr(result) == repr(expected)
+
+    # chained searches are narrowed by the index too
+    expected = expected.search(type_=int)
+    result = result.search(type_=int)
+    assert result.paths == expected.paths
+
+
+def test_use_index_reused(asdf_file):
+    asdf_file.search(use_index=True)
+    index = asdf_file._search_index
+    assert len(index) == 15
+    asdf_file.search("foo", use_index=True)
+    assert asdf_file._search_index is index
+
+
+def test_use_index_invalidated(asdf_file):
+    assert asdf_file.search("bar", use_index=True).node == "hello"
+
+    asdf_file.search("bar", use_index=True).replace("goodbye")
+    assert asdf_file.search("bar", use_index=True).node == "goodbye"
+
+    asdf_file["baz"] = 1
+    assert asdf_file.search("baz", use_index=True).node == 1
+
+    del asdf_file["baz"]
+    assert asdf_file.search("baz", use_index=True).node is None
+
+    asdf_file.tree = {"qux": 2}
+    assert asdf_file.search("qux", use_index=True).node == 2
+
+    asdf_file["qux"] = {}
+    asdf_file.search(use_index=True)
+    asdf_file["qux"]["quux"] = 3
+    assert asdf_file.search("quux", use_index=True).node is None
+    asdf_file.clear_search_index()
+    assert asdf_file.search("quux", use_index=True).node == 3
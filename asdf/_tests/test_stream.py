@@ -184,3 +184,216 @@ def test_stream_repr_and_str():
     ff = asdf.AsdfFile(tree)
     repr(ff.tree["stream"])
     str(ff.tree["stream"])
+
+
+@pytest.mark.parametrize("background", [False, True])
+@pytest.mark.parametrize("buffer_size", [1, 100, 2**20])
+def test_stream_writer(tmp_path, background, buffer_size):
+    path = tmp_path / "test.asdf"
+    tree = {"nonstream": np.array([1, 2, 3, 4], np.int64), "stream": Stream([6, 2], np.float64)}
+
+    with asdf.StreamWriter(path, tree, buffer_size=buffer_size, background=background) as writer:
+        writer.write_array(np.zeros((6, 2)))
+        for i in range(1, 100, 3):
+            writer.write_array(np.repeat(np.arange(i, i + 3, dtype=np.float64), 12).reshape((3, 6, 2)))
+    assert writer.closed
+    assert writer.rows == 100
+    assert writer.nbytes == 100 * 12 * 8
+
+    with asdf.open(path, validate_checksums=True) as af:
+        header = af._blocks.blocks[-1].header
+        assert header["data_size"] == header["used_size"] == writer.nbytes
+        assert any(header["checksum"])
+        assert af["stream"].shape == (100, 6, 2)
+        for i, row in enumerate(af["stream"]):
+            assert np.all(row == i)
+
+
+def test_stream_writer_non_contiguous():
+    buff = io.BytesIO()
+    arr = np.arange(40, dtype=np.int32).reshape((4, 10))
+
+    with asdf.StreamWriter(buff, {"stream": Stream([4], np.int32)}, buffer_size=8) as writer:
+        writer.write_array(arr.T)
+        writer.write_array(arr[:, ::2].T)
+
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        assert_array_equal(af["stream"], np.concatenate([arr.T, arr[:, ::2].T]))
+
+
+def test_stream_writer_not_seekable():
+    buff = io.BytesIO()
+    fd = generic_io.OutputStream(buff)
+
+    with asdf.StreamWriter(fd, {"stream": Stream([2], np.uint8)}, background=True) as writer:
+        writer.write_array(np.ones((5, 2), np.uint8))
+
+    buff.seek(0)
+    with asdf.open(generic_io.InputStream(buff, "r")) as af:
+        assert af._blocks.blocks[-1].header["data_size"] == 0
+        assert_array_equal(af["stream"], np.ones((5, 2), np.uint8))
+
+
+def test_stream_writer_no_header_update():
+    buff = io.BytesIO()
+    af = asdf.AsdfFile({"stream": Stream([2], np.uint8)})
+
+    with asdf.StreamWriter(buff, af, update_header=False) as writer:
+        writer.write_array(np.ones((5, 2), np.uint8))
+
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        header = af._blocks.blocks[-1].header
+        assert header["data_size"] == 0
+        assert not any(header["checksum"])
+        assert af["stream"].shape == (5, 2)
+
+
+def test_stream_writer_invalid():
+    with pytest.raises(ValueError, match=r"exactly one Stream, found 0"):
+        asdf.StreamWriter(io.BytesIO(), {"data": np.arange(3)})
+
+    writer = asdf.StreamWriter(io.BytesIO(), {"stream": Stream([2], np.float64)})
+    with pytest.raises(ValueError, match=r"doesn't match stream row shape"):
+        writer.write_array(np.zeros((2, 3)))
+    with pytest.raises(ValueError, match=r"doesn't match stream dtype"):
+        writer.write_array(np.zeros((2, 2), np.float32))
+    writer.close()
+    with pytest.raises(ValueError, match=r"closed StreamWriter"):
+        writer.write_array(np.zeros((2, 2)))
+
+
+def test_stream_writer_background_error():
+    class BadFile(io.BytesIO):
+        def write(self, data):
+            if self.tell() > 1000:
+                msg = "disk full"
+                raise OSError(msg)
+            return super().write(data)
+
+    writer = asdf.StreamWriter(BadFile(), {"stream": Stream([100], np.uint8)}, buffer_size=100, background=True)
+    with pytest.raises(OSError, match=r"disk full"):
+        for _ in range(100):
+            writer.write_array(np.zeros((10, 100), np.uint8))
+        writer.flush()
+    with pytest.raises(OSError, match=r"disk full"):
+        writer.close()
+    assert writer.closed
+
+
+@pytest.mark.parametrize("update_header", [True, False])
+@pytest.mark.parametrize("background", [False, True])
+def test_stream_writer_compressed(tmp_path, update_header, background):
+    pytest.importorskip("lz4")
+    path = tmp_path / "test.asdf"
+    tree = {"stream": Stream([4], np.int64, compression="lz4")}
+    arrays = [np.full((i % 7, 4), i) for i in range(50)]
+
+    with asdf.StreamWriter(path, tree, buffer_size=64, update_header=update_header, background=background) as writer:
+        for arr in arrays:
+            writer.write_array(arr)
+    assert writer.nbytes == sum(arr.nbytes for arr in arrays)
+
+    with asdf.open(path, validate_checksums=True) as af:
+        header = af._blocks.blocks[-1].header
+        assert header["compression"] == b"lz4\0"
+        assert header["data_size"] == (writer.nbytes if update_header else 0)
+        assert_array_equal(af["stream"], np.concatenate(arrays))
+
+    # more frames can be appended to a compressed stream
+    with open(path, "ab") as fd:
+        asdf._compression.compress(fd, np.full((3, 4), 50), "lz4")
+    with asdf.open(path) as af:
+        assert_array_equal(af["stream"], np.concatenate([*arrays, np.full((3, 4), 50)]))
+
+    with asdf.open(generic_io.InputStream(io.BytesIO(path.read_bytes()), "r")) as af:
+        assert af["stream"].shape == (sum(arr.shape[0] for arr in arrays) + 3, 4)
+
+
+def test_stream_compressed_array():
+    pytest.importorskip("lz4")
+    buff = io.BytesIO()
+    af = asdf.AsdfFile({"stream": np.arange(100)})
+    af.set_array_storage(af["stream"], "streamed")
+    af.set_array_compression(af["stream"], "lz4")
+    af.write_to(buff)
+    buff.write(b"".join(asdf._compression.Lz4Compressor().compress(memoryview(np.arange(100, 120)))))
+
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        assert af._blocks.blocks[-1].header["compression"] == b"lz4\0"
+        assert_array_equal(af["stream"], np.arange(120))
+
+        # compression is kept when the file is written again
+        buff2 = io.BytesIO()
+        af.write_to(buff2)
+    buff2.seek(0)
+    with asdf.open(buff2) as af:
+        assert af._blocks.blocks[-1].header["compression"] == b"lz4\0"
+        assert_array_equal(af["stream"], np.arange(120))
+
+
+def test_stream_invalid_compression():
+    with pytest.raises(ValueError, match=r"Stream compression must be one of"):
+        Stream([4], np.int64, compression="zlib")
+
+
+@pytest.mark.parametrize("compression", [None, "lz4"])
+@pytest.mark.parametrize("rows_per_chunk", [1, 7, 64, 1000])
+def test_iter_stream(tmp_path, compression, rows_per_chunk):
+    if compression:
+        pytest.importorskip("lz4")
+    path = tmp_path / "test.asdf"
+    expected = np.arange(300 * 6).reshape((300, 3, 2))
+    tree = {"nonstream": np.arange(10), "stream": Stream([3, 2], np.int64, compression=compression)}
+
+    with asdf.StreamWriter(path, tree, buffer_size=1000) as writer:
+        for i in range(0, 300, 11):
+            writer.write_array(expected[i : i + 11])
+
+    with asdf.open(path, validate_checksums=True) as af:
+        chunks = list(af.iter_stream("stream", rows_per_chunk=rows_per_chunk))
+        assert all(len(chunk) == rows_per_chunk for chunk in chunks[:-1])
+        assert_array_equal(np.concatenate(chunks), expected)
+        # the streamed block was not read into memory
+        assert af._blocks.blocks[-1]._cached_data is None
+        assert_array_equal(af["stream"], expected)
+
+    with asdf.open(generic_io.InputStream(io.BytesIO(path.read_bytes()), "r")) as af:
+        chunks = list(af.iter_stream(["stream"], rows_per_chunk=rows_per_chunk))
+        assert_array_equal(np.concatenate(chunks), expected)
+        with pytest.raises(OSError, match=r"already iterated"):
+            af["stream"][0]
+
+    with asdf.open(path, lazy_load=False) as af:
+        chunks = list(af.iter_stream("stream", rows_per_chunk=rows_per_chunk))
+        assert_array_equal(np.concatenate(chunks), expected)
+
+
+def test_iter_stream_not_seekable_read():
+    buff = io.BytesIO()
+    with asdf.StreamWriter(buff, {"stream": Stream([2], np.uint8)}) as writer:
+        writer.write_array(np.ones((5, 2), np.uint8))
+
+    buff.seek(0)
+    with asdf.open(generic_io.InputStream(buff, "r")) as af:
+        # once read, the data can also be iterated
+        assert_array_equal(af["stream"], np.ones((5, 2)))
+        assert [chunk.shape for chunk in af.iter_stream("stream", rows_per_chunk=2)] == [(2, 2), (2, 2), (1, 2)]
+
+
+def test_iter_stream_invalid():
+    buff = io.BytesIO()
+    tree = {"nonstream": np.arange(10), "stream": Stream([2], np.uint8)}
+    with asdf.StreamWriter(buff, tree) as writer:
+        writer.write_array(np.ones((5, 2), np.uint8))
+
+    buff.seek(0)
+    with asdf.open(buff) as af:
+        with pytest.raises(ValueError, match=r"is not a streamed array"):
+            next(af.iter_stream("nonstream"))
+        with pytest.raises(ValueError, match=r"rows_per_chunk must be positive"):
+            next(af.iter_stream("stream", rows_per_chunk=0))
+        with pytest.raises(ValueError, match=r"Only the data of a streamed block"):
+            next(af._blocks.blocks[0].iter_data())
@@ -1,3 +1,7 @@
+import sys
+
+import pytest
+
 from asdf import treeutil
 
 
@@ -48,3 +52,61 @@ def test_walk_and_modify_shared_references():
     assert result["target"]["foo"] == "baz"
     assert result["target"] is result["nested_in_dict"]["target"]
     assert result["target"] is result["nested_in_list"][0]
+
+
+@pytest.mark.parametrize("postorder", [True, False])
+def test_walk_and_modify_order(postorder):
+    tree = {"a": [1, {"b": "c"}], "d": (2.0, None)}
+    visited = []
+
+    def _callback(node):
+        visited.append(node)
+        return node
+
+    result = treeutil.walk_and_modify(tree, _callback, postorder=postorder)
+
+    assert result == tree
+    assert result is not tree
+    assert result["a"][1] is not tree["a"][1]
+    if postorder:
+        expected = [1, "c", {"b": "c"}, [1, {"b": "c"}], 2.0, None, (2.0, None), tree]
+    else:
+        expected = [tree, [1, {"b": "c"}], 1, {"b": "c"}, "c", (2.0, None), 2.0, None]
+    assert visited == expected
+
+
+def test_walk_and_modify_remove_node():
+    tree = {"a": 1, "b": {"c": 2, "d": 3}}
+
+    def _callback(node):
+        if node == 2:
+            return treeutil.RemoveNode
+        return node
+
+    assert treeutil.walk_and_modify(tree, _callback) == {"a": 1, "b": {"d": 3}}
+
+
+def test_walk_and_modify_cycle():
+    tree = {"a": []}
+    tree["a"].append(tree)
+
+    result = treeutil.walk_and_modify(tree, lambda node: node)
+
+    assert result is not tree
+    assert result["a"][0] is result
+
+
+def test_walk_and_modify_deep_tree():
+    """
+    The depth of the tree is not limited by the recursion limit.
+    """
+    tree = node = {}
+    for _ in range(sys.getrecursionlimit() * 2):
+        node["child"] = node = {}
+    node["child"] = "leaf"
+
+    result = treeutil.walk_and_modify(tree, lambda node: node)
+
+    while isinstance(result, dict):
+        result = result["child"]
+    assert result == "leaf"
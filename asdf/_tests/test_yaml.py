@@ -283,3 +283,80 @@ def test_invalid_omap(payload):
     with pytest.raises(yaml.constructor.ConstructorError):
         with asdf.open(buff) as ff:
             ff["od"]
+
+
+def _shared_tree():
+    shared_list = [1, 2]
+    shared_dict = {"x": 1}
+    tree = {
+        "a": shared_list,
+        "b": shared_dict,
+        "c": [shared_dict, shared_list],
+        "np": np.int64(5),
+        "od": OrderedDict([("z", 1), ("a", [1, 2])]),
+        "tuple": (1, 2, (3,)),
+        "empty": [],
+        "binary": b"\x00\x01",
+    }
+    tree["self"] = tree
+    return tree
+
+
+def _tagged_tree():
+    string = tagged.TaggedString("value")
+    string._tag = "tag:nowhere.org:custom/string-1.0.0"
+    string.style = "literal"
+    mapping = tagged.TaggedDict({"b": 1, "a": [1, {"c": 2}], "z": "z"}, "tag:nowhere.org:custom/mapping-1.0.0")
+    mapping.property_order = ["z", "b"]
+    sequence = tagged.TaggedList([1, 2, 3], "tag:nowhere.org:custom/sequence-1.0.0")
+    sequence.flow_style = "block"
+    return {"string": string, "mapping": mapping, "sequence": sequence, 1: None}
+
+
+@pytest.mark.parametrize("tree_factory", [_shared_tree, _tagged_tree])
+def test_tree_emitter_matches_yaml_dump(tree_factory):
+    """
+    The events emitted by _TreeEmitter should produce the same YAML
+    as dumping the tree with pyyaml
+    """
+    tree = tree_factory()
+    kwargs = {
+        "explicit_start": True,
+        "explicit_end": True,
+        "version": asdf.versioning._YAML_VERSION,
+        "allow_unicode": True,
+        "encoding": "utf-8",
+        "tags": {"!": asdf.constants.STSCI_SCHEMA_TAG_BASE + "/"},
+    }
+
+    expected = io.BytesIO()
+    yaml.dump_all([tree], stream=expected, Dumper=yamlutil.AsdfDumper, **kwargs)
+
+    result = io.BytesIO()
+    dumper = yamlutil.AsdfDumper(result, **kwargs)
+    emitter = yamlutil._TreeEmitter(dumper)
+    emitter.scan(tree)
+    emitter.emit(tree, version=kwargs["version"], tags=kwargs["tags"])
+    dumper.dispose()
+
+    assert result.getvalue() == expected.getvalue()
+
+
+def test_serialization_error_before_yaml_written():
+    """
+    Unserializable objects should be detected before any
+    of the YAML is written
+    """
+    buff = io.BytesIO()
+    af = asdf.AsdfFile({"a": 1, "z": object()})
+    with pytest.raises(AsdfSerializationError):
+        af.write_to(buff)
+    assert b"--- " not in buff.getvalue()
+
+
+def test_write_does_not_modify_history():
+    af = asdf.AsdfFile()
+    af.add_history_entry("an entry")
+    af["history"]["extensions"] = []
+    af.write_to(io.BytesIO())
+    assert af["history"]["extensions"] == []
@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import collections
 import copy
+import os
 import threading
 from contextlib import contextmanager
 from typing import TYPE_CHECKING, Any
@@ -35,6 +36,15 @@ DEFAULT_ALL_ARRAY_COMPRESSION_KWARGS = None
 DEFAULT_DEFAULT_ARRAY_SAVE_BASE = True
 DEFAULT_LAZY_TREE = False
 DEFAULT_WARN_ON_FAILED_CONVERSION = False
+DEFAULT_ENTRY_POINT_CACHE = False
+DEFAULT_ARRAY_SUMMARY = False
+DEFAULT_LAZY_TREE_CACHE_SIZE = 1000
+DEFAULT_SHARED_MEMORY_BLOCKS = False
+DEFAULT_BLOCK_CACHE_SIZE = None
+DEFAULT_BLOCK_CACHE_DIRECTORY = None
+DEFAULT_BLOCK_CACHE_DIRECTORY_SIZE = 1024**3  # 1 GiB
+DEFAULT_BLOCK_WRITE_THREADS = 1
+DEFAULT_DEDUPLICATE_BLOCKS = False
 
 
 class AsdfConfig:
@@ -59,6 +69,15 @@ class AsdfConfig:
         self._default_array_save_base = DEFAULT_DEFAULT_ARRAY_SAVE_BASE
         self._lazy_tree = DEFAULT_LAZY_TREE
         self._warn_on_failed_conversion = DEFAULT_WARN_ON_FAILED_CONVERSION
+        self._entry_point_cache = DEFAULT_ENTRY_POINT_CACHE
+        self._array_summary = DEFAULT_ARRAY_SUMMARY
+        self._lazy_tree_cache_size: int | None = DEFAULT_LAZY_TREE_CACHE_SIZE
+        self._shared_memory_blocks = DEFAULT_SHARED_MEMORY_BLOCKS
+        self._block_cache_size: int | None = DEFAULT_BLOCK_CACHE_SIZE
+        self._block_cache_directory: str | None = DEFAULT_BLOCK_CACHE_DIRECTORY
+        self._block_cache_directory_size = DEFAULT_BLOCK_CACHE_DIRECTORY_SIZE
+        self._block_write_threads = DEFAULT_BLOCK_WRITE_THREADS
+        self._deduplicate_blocks = DEFAULT_DEDUPLICATE_BLOCKS
 
         self._lock = threading.RLock()
 
@@ -76,7 +95,7 @@ class AsdfConfig:
         if self._resource_mappings is None:
             with self._lock:
                 if self._resource_mappings is None:
-                    self._resource_mappings = _entry_points.get_resource_mappings()
+                    self._resource_mappings = _entry_points.get_resource_mappings(cache=self.entry_point_cache)
         return self._resource_mappings
 
     def add_resource_mapping(self, mapping: Mapping[str, str | bytes]) -> None:
@@ -170,7 +189,7 @@ class AsdfConfig:
         if self._extensions is None:
             with self._lock:
                 if self._extensions is None:
-                    self._extensions = _entry_points.get_extensions()
+                    self._extensions = _entry_points.get_extensions(cache=self.entry_point_cache)
         return self._extensions
 
     def add_extension(self, extension: ExtensionLike) -> None:
@@ -380,6 +399,9 @@ class AsdfConfig:
 
         - ``input``: Use the same compression as in the file read.
           If there is no prior file, acts as None
+
+        - ``auto``: Choose the compression for each block by compressing
+          a sample of the data (see `asdf.AsdfFile.set_array_compression`).
         """
         return self._all_array_compression
 
@@ -483,6 +505,218 @@ class AsdfConfig:
     def warn_on_failed_conversion(self, value: bool) -> None:
         self._warn_on_failed_conversion = value
 
+    @property
+    def entry_point_cache(self) -> bool:
+        """
+        Get configuration that controls if installed plugins are
+        discovered using a cache of their entry point metadata.
+
+        When enabled, plugins described by the cache are only imported
+        when one of their tags, types or resources is needed.  The cache
+        is a file written to the user cache directory and is refreshed
+        when the version or entry points of an installed package change.
+        Disabled by default.  This option takes effect the next time
+        extensions or resource mappings are discovered (see
+        `AsdfConfig.reset_extensions`).
+
+        Returns
+        -------
+        bool
+        """
+        return self._entry_point_cache
+
+    @entry_point_cache.setter
+    def entry_point_cache(self, value: bool) -> None:
+        self._entry_point_cache = value
+
+    @property
+    def array_summary(self) -> bool:
+        """
+        Get configuration that controls if summary statistics (min, max,
+        mean, NaN count and a content digest) are computed for arrays
+        stored in binary blocks and written to the tree next to the
+        array.
+
+        The statistics can be displayed by `asdf.info` and used by
+        ``asdftool diff`` without reading the array data.
+
+        Returns
+        -------
+        bool
+        """
+        return self._array_summary
+
+    @array_summary.setter
+    def array_summary(self, value: bool) -> None:
+        self._array_summary = value
+
+    @property
+    def lazy_tree_cache_size(self) -> int | None:
+        """
+        Get the maximum number of converted objects that a file opened
+        with ``lazy_tree=True`` keeps alive so that references to the
+        same tagged node resolve to the same object.
+
+        Only objects that can't be weakly referenced count towards this
+        limit, other objects are released as soon as they are removed
+        from the tree.  Objects for nodes that are referenced more than
+        once in the file (with a YAML alias) are always kept.  The least
+        recently used objects are released first.  `None` means no limit.
+
+        Returns
+        -------
+        int or None
+        """
+        return self._lazy_tree_cache_size
+
+    @lazy_tree_cache_size.setter
+    def lazy_tree_cache_size(self, value: int | None) -> None:
+        if value is not None and value < 0:
+            msg = "lazy_tree_cache_size must be None or a non-negative integer"
+            raise ValueError(msg)
+        self._lazy_tree_cache_size = value
+
+    @property
+    def shared_memory_blocks(self) -> bool:
+        """
+        Get configuration that controls if compressed blocks read from
+        a local file are decompressed into shared memory.
+
+        When enabled, other processes that read the same block (of the
+        same, unmodified, file) with this option enabled use the already
+        decompressed data instead of decompressing the block again.
+        The shared memory is released when every process that uses
+        it has closed the file.  Files opened for update (``mode="rw"``)
+        don't use shared memory.
+
+        Returns
+        -------
+        bool
+        """
+        return self._shared_memory_blocks
+
+    @shared_memory_blocks.setter
+    def shared_memory_blocks(self, value: bool) -> None:
+        self._shared_memory_blocks = value
+
+    @property
+    def block_cache_size(self) -> int | None:
+        """
+        Get the maximum size (in bytes) of the block data that a file
+        keeps in memory after reading (and decompressing) it.
+
+        When the limit is exceeded, the data of the least recently used
+        blocks is released (and read again the next time the arrays that
+        use it are accessed).  Only blocks that are lazily loaded and not
+        memory mapped are counted and, when a limit is set, the arrays
+        that use them are read-only.  `None` means no limit.
+
+        Returns
+        -------
+        int or None
+        """
+        return self._block_cache_size
+
+    @block_cache_size.setter
+    def block_cache_size(self, value: int | None) -> None:
+        if value is not None and value < 0:
+            msg = "block_cache_size must be None or a non-negative integer"
+            raise ValueError(msg)
+        self._block_cache_size = value
+
+    @property
+    def block_cache_directory(self) -> str | None:
+        """
+        Get the directory where decompressed block data is cached
+        (or `None` to disable the cache).
+
+        When set, compressed blocks read from local files are decompressed
+        into files in this directory and memory mapped (read-only) from
+        there.  Later reads of the same block, by any process, memory map
+        the cached data instead of decompressing the block again.  Files
+        opened for update (``mode="rw"``) don't use the cache.  See
+        ``block_cache_directory_size`` for the size limit.
+
+        Returns
+        -------
+        str or None
+        """
+        return self._block_cache_directory
+
+    @block_cache_directory.setter
+    def block_cache_directory(self, value: str | os.PathLike | None) -> None:
+        self._block_cache_directory = None if value is None else os.fspath(value)
+
+    @property
+    def block_cache_directory_size(self) -> int:
+        """
+        Get the maximum size (in bytes) of the files in the
+        ``block_cache_directory``.  When the limit is exceeded the least
+        recently used files are deleted.
+
+        Returns
+        -------
+        int
+        """
+        return self._block_cache_directory_size
+
+    @block_cache_directory_size.setter
+    def block_cache_directory_size(self, value: int) -> None:
+        if value < 0:
+            msg = "block_cache_directory_size must be a non-negative integer"
+            raise ValueError(msg)
+        self._block_cache_directory_size = value
+
+    @property
+    def block_write_threads(self) -> int:
+        """
+        Get the number of threads used to write blocks to a local file.
+
+        With more than 1 thread, the headers (and compressed data) of all
+        blocks are computed (in parallel) before writing so the offset of
+        every block is known and the blocks can then be written in parallel
+        (with positional writes). Other files are always written by
+        a single thread.
+
+        Returns
+        -------
+        int
+        """
+        return self._block_write_threads
+
+    @block_write_threads.setter
+    def block_write_threads(self, value: int) -> None:
+        if value < 1:
+            msg = "block_write_threads must be a positive integer"
+            raise ValueError(msg)
+        self._block_write_threads = value
+
+    @property
+    def deduplicate_blocks(self) -> bool:
+        """
+        Get configuration that controls if arrays with identical content
+        (that are not views of the same array) are written to a single
+        block. The block checksum is used to find candidate blocks, which
+        are then compared byte for byte. Only blocks of arrays with the
+        same dtype and compression are combined.
+
+        Arrays that share a block are read back as views of the same
+        data, so in a file opened with ``mode="rw"`` (or with
+        ``memmap=True``) modifying one of them modifies the others.
+
+        The number of bytes that were not written is available as
+        `asdf.AsdfFile.deduplicated_bytes` after writing.
+
+        Returns
+        -------
+        bool
+        """
+        return self._deduplicate_blocks
+
+    @deduplicate_blocks.setter
+    def deduplicate_blocks(self, value: bool) -> None:
+        self._deduplicate_blocks = value
+
     def __repr__(self) -> str:
         return (
             "<AsdfConfig\n"
@@ -497,6 +731,15 @@ class AsdfConfig:
             f"  validate_on_read: {self.validate_on_read}\n"
             f"  lazy_tree: {self.lazy_tree}\n"
             f"  warn_on_failed_conversion: {self.warn_on_failed_conversion}\n"
+            f"  entry_point_cache: {self.entry_point_cache}\n"
+            f"  array_summary: {self.array_summary}\n"
+            f"  lazy_tree_cache_size: {self.lazy_tree_cache_size}\n"
+            f"  shared_memory_blocks: {self.shared_memory_blocks}\n"
+            f"  block_cache_size: {self.block_cache_size}\n"
+            f"  block_cache_directory: {self.block_cache_directory}\n"
+            f"  block_cache_directory_size: {self.block_cache_directory_size}\n"
+            f"  block_write_threads: {self.block_write_threads}\n"
+            f"  deduplicate_blocks: {self.deduplicate_blocks}\n"
             ">"
         )
 
@@ -541,3 +784,18 @@ def config_context() -> Generator[AsdfConfig]:
         yield config
     finally:
         _local.config_stack.pop()
+
+
+@contextmanager
+def _use_config(config: AsdfConfig) -> Generator[AsdfConfig]:
+    """
+    Context manager that makes ``config`` the current config (for this
+    thread) so code run in other threads can use the config of the
+    thread that started it.
+    """
+    _local.config_stack.append(config)
+
+    try:
+        yield config
+    finally:
+        _local.config_stack.pop()
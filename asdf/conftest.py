@@ -1,4 +1,6 @@
 import os
+import shutil
+import tempfile
 import warnings
 
 import pytest
@@ -9,6 +11,22 @@ import pytest
 collect_ignore = ["asdf.py", "stream.py"]
 
 
+def pytest_configure(config):
+    # Keep the entry point discovery cache used by the tests
+    # separate from the user's cache
+    config._asdf_cache_dir = tempfile.mkdtemp(prefix="asdf-cache-")
+    config._asdf_original_cache_dir = os.environ.get("ASDF_CACHE_DIR")
+    os.environ["ASDF_CACHE_DIR"] = config._asdf_cache_dir
+
+
+def pytest_unconfigure(config):
+    if config._asdf_original_cache_dir is None:
+        os.environ.pop("ASDF_CACHE_DIR", None)
+    else:
+        os.environ["ASDF_CACHE_DIR"] = config._asdf_original_cache_dir
+    shutil.rmtree(config._asdf_cache_dir, ignore_errors=True)
+
+
 def pytest_collection_modifyitems(items):
     # first check if warnings are already turned into errors
     for wf in warnings.filters:
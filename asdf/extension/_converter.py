@@ -4,6 +4,7 @@ types.  Will eventually replace the `asdf.types` module.
 """
 
 import abc
+import operator
 
 from asdf.util import get_class_name, uri_match
 
@@ -386,9 +387,36 @@ class ConverterProxy(Converter):
         return False
 
     def __hash__(self):
-        return hash((id(self.delegate), id(self.extension)))
+        return hash((self.class_name, id(self.extension)))
 
     def __repr__(self):
         package_description = "(none)" if self.package_name is None else f"{self.package_name}=={self.package_version}"
 
         return f"<ConverterProxy class: {self.class_name} package: {package_description}>"
+
+
+class _LazyConverterProxy(ConverterProxy):
+    """
+    `ConverterProxy` for a converter of a `_LazyExtensionProxy`.  The
+    tags and types come from the cached metadata, the converter
+    itself is imported on first use.
+    """
+
+    def __init__(self, extension, index, class_name, tags, types):
+        self._extension = extension
+        self._index = index
+        self._class_name = class_name
+        self._tags = tags
+        self._types = types
+
+    @property
+    def _delegate(self):
+        return self._extension._load().converters[self._index].delegate
+
+    def __eq__(self, other):
+        return other is self
+
+    __hash__ = ConverterProxy.__hash__
+
+    def __reduce__(self):
+        return (operator.getitem, (self._extension._load().converters, self._index))
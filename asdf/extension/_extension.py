@@ -7,7 +7,7 @@ from packaging.specifiers import SpecifierSet
 from asdf.util import get_class_name
 
 from ._compressor import Compressor
-from ._converter import ConverterProxy
+from ._converter import ConverterProxy, _LazyConverterProxy
 from ._tag import TagDefinition
 from ._validator import Validator
 
@@ -409,7 +409,9 @@ class ExtensionProxy(Extension):
         return False
 
     def __hash__(self):
-        return hash(id(self.delegate))
+        # Hash without the delegate so that a `_LazyExtensionProxy`
+        # doesn't have to import its extension to be hashed.
+        return hash((self.class_name, self.extension_uri))
 
     def __repr__(self):
         package_description = "(none)" if self.package_name is None else f"{self.package_name}=={self.package_version}"
@@ -420,3 +422,94 @@ class ExtensionProxy(Extension):
             f"<ExtensionProxy URI: {uri_description} class: {self.class_name} "
             f"package: {package_description} legacy: {self.legacy}>"
         )
+
+
+class _LazyExtensionProxy(ExtensionProxy):
+    """
+    `ExtensionProxy` built from cached entry point metadata.  The
+    extension itself is only imported when something other than the
+    cached metadata (a converter method, a validator, the delegate, ...)
+    is requested.
+
+    Parameters
+    ----------
+    metadata : dict
+        Cached description of the extension.
+    loader : callable
+        Function that imports the extension and returns an
+        `ExtensionProxy` wrapping it.
+    package_name : str
+    package_version : str
+    """
+
+    def __init__(self, metadata, loader, package_name=None, package_version=None):
+        self._loader = loader
+        self._proxy = None
+        self._package_name = package_name
+        self._package_version = package_version
+        self._class_name = metadata["class_name"]
+        self._extension_uri = metadata["extension_uri"]
+        self._legacy = False
+        self._legacy_class_names = set(metadata["legacy_class_names"])
+        self._asdf_standard_requirement = SpecifierSet(metadata["asdf_standard_requirement"])
+        self._tags = [
+            TagDefinition(
+                tag["tag_uri"],
+                schema_uris=tag["schema_uris"],
+                title=tag["title"],
+                description=tag["description"],
+            )
+            for tag in metadata["tags"]
+        ]
+        self._yaml_tag_handles = metadata["yaml_tag_handles"]
+        self._has_compressors = metadata["has_compressors"]
+        self._has_validators = metadata["has_validators"]
+        self._converters = [
+            _LazyConverterProxy(self, index, converter["class_name"], converter["tags"], converter["types"])
+            for index, converter in enumerate(metadata["converters"])
+        ]
+
+    @property
+    def loaded(self):
+        """
+        `True` if the wrapped extension has been imported.
+        """
+        return self._proxy is not None
+
+    def _load(self):
+        if self._proxy is None:
+            self._proxy = self._loader()
+        return self._proxy
+
+    @property
+    def _delegate(self):
+        return self._load().delegate
+
+    @property
+    def _compressors(self):
+        return self._load().compressors if self._has_compressors else []
+
+    @property
+    def _validators(self):
+        return self._load().validators if self._has_validators else []
+
+    @property
+    def extension_uri(self):
+        return self._extension_uri
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        # Comparing against another proxy is only possible without
+        # importing anything once both delegates are available.
+        if not self.loaded or not isinstance(other, ExtensionProxy):
+            return False
+        if isinstance(other, _LazyExtensionProxy) and not other.loaded:
+            return False
+        return other.delegate is self.delegate
+
+    __hash__ = ExtensionProxy.__hash__
+
+    def __reduce__(self):
+        # The loader can't be pickled, pickle the loaded extension instead
+        return (ExtensionProxy.maybe_wrap, (self._load(),))
@@ -15,6 +15,7 @@ import os
 import pathlib
 import re
 import sys
+import threading
 import typing
 import warnings
 from os import SEEK_CUR, SEEK_END, SEEK_SET
@@ -246,6 +247,10 @@ class GenericFile:
         self._close = close
         self._uri = uri
 
+        # held by operations that seek and read on behalf of other
+        # threads (see read_into_array_at)
+        self._lock = threading.RLock()
+
         self.block_size = get_config().io_block_size
 
     def __enter__(self) -> GenericFile:
@@ -317,8 +322,12 @@ class GenericFile:
         """
         Read ``size`` bytes of data from the file, one block at a
         time.  The result is a generator where each value is a bytes
-        object.
+        object.  If ``size`` is negative, read until the end of the file.
         """
+        if size < 0:
+            while block := self.read(self._blksize):
+                yield block
+            return
         for i in range(0, size, self._blksize):
             thissize = min(self._blksize, size - i)
             yield self.read(thissize)
@@ -697,6 +706,44 @@ class GenericFile:
         # Need cast because numpy doesn't type frombuffer as a 1D array
         return typing.cast("ByteArray1D", np.frombuffer(buff, np.uint8, size, 0))
 
+    def read_into_array_at(self, offset: int, size: int) -> ByteArray1D:
+        """
+        Read a chunk of the file, starting at ``offset``, into a uint8
+        array without changing the file position.  This can be called
+        from several threads at once.
+
+        Parameters
+        ----------
+        offset : integer
+            The offset, in bytes, in the file.
+
+        size : integer
+            The size of the data.
+
+        Returns
+        -------
+        array : np.ndarray
+        """
+        with self._lock:
+            position = self.tell()
+            self.seek(offset)
+            try:
+                array = self.read_into_array(size)
+            finally:
+                self.seek(position)
+        _check_read_size(array, offset, size)
+        return array
+
+
+def _check_read_size(array, offset, size):
+    """
+    Raise a `ValueError` if fewer than ``size`` bytes were read at
+    ``offset``, for example because the file is truncated.
+    """
+    if array.size != size:
+        msg = f"Read {array.size} bytes at offset {offset} but expected {size}, the file may be truncated"
+        raise ValueError(msg)
+
 
 class GenericWrapper:
     """
@@ -813,6 +860,28 @@ class RealFile(RandomAccessFile):
     def read_into_array(self, size):
         return np.fromfile(self._fd, dtype=np.uint8, count=size)
 
+    def read_into_array_at(self, offset, size):
+        # Positional reads bypass the python file buffer so only use them
+        # when no writes can be pending.
+        if self._mode != "r" or not hasattr(os, "pread"):
+            return super().read_into_array_at(offset, size)
+
+        fileno = self._fd.fileno()
+        array = np.empty(size, dtype=np.uint8)
+        nread = 0
+        while nread < size:
+            if hasattr(os, "preadv"):
+                n = os.preadv(fileno, [memoryview(array)[nread:]], offset + nread)
+            else:
+                buff = os.pread(fileno, size - nread, offset + nread)
+                n = len(buff)
+                array[nread : nread + n] = np.frombuffer(buff, np.uint8)
+            if n == 0:
+                break
+            nread += n
+        _check_read_size(array[:nread], offset, size)
+        return array
+
     def _fix_permissions(self):
         """
         atomicfile internally uses tempfile.NamedTemporaryFile
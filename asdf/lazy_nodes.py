@@ -5,6 +5,7 @@ lazy conversion of tagged ASDF tree nodes to custom objects.
 
 import collections
 import inspect
+import threading
 import warnings
 import weakref
 
@@ -16,18 +17,43 @@ from .extension._serialization_context import BlockAccess
 __all__ = ["AsdfDictNode", "AsdfListNode", "AsdfOrderedDictNode"]
 
 
+def _make_ref(obj, callback=None):
+    """
+    Make a weakref to ``obj`` (calling ``callback`` when it is garbage
+    collected) or, if ``obj`` can't be weakly referenced, a function
+    that returns ``obj``.
+
+    Returns
+    -------
+    ref : callable
+        Returns ``obj`` (or `None` if ``obj`` was garbage collected).
+    is_weak : bool
+        `True` if ``ref`` is a weakref.
+    """
+    try:
+        return weakref.ref(obj, callback), True
+    except TypeError:
+        # if a weakref is not possible, store the object
+        return (lambda obj=obj: obj), False
+
+
 class _TaggedObjectCacheItem:
     """
-    A tagged node and a (weakref) to the converted custom object
+    A (weakref to a) tagged node and a (weakref) to the converted custom object
     """
 
-    def __init__(self, tagged_node, custom_object):
-        self.tagged_node = tagged_node
-        try:
-            self._custom_object_ref = weakref.ref(custom_object)
-        except TypeError:
-            # if a weakref is not possible, store the object
-            self._custom_object_ref = lambda obj=custom_object: obj
+    def __init__(self, tagged_node, custom_object, callback=None):
+        self._tagged_node_ref, _ = _make_ref(tagged_node, callback)
+        self._custom_object_ref, is_weak = _make_ref(custom_object, callback)
+        # True if the item keeps the custom object alive
+        self.holds_custom_object = not is_weak
+
+    def owns(self, ref):
+        return ref is self._tagged_node_ref or ref is self._custom_object_ref
+
+    @property
+    def tagged_node(self):
+        return self._tagged_node_ref()
 
     @property
     def custom_object(self):
@@ -41,18 +67,82 @@ class _TaggedObjectCache:
     This is critical for trees that contain references/pointers to the
     same object at multiple locations in the tree.
 
-    Only weakrefs are key to the custom objects to allow large items
-    deleted from the tree to be garbage collected. This means that an
-    item added to the cache may later fail to retrieve (if the weakref-ed
-    custom object was deleted).
+    Only weakrefs are key to the tagged nodes and custom objects (when
+    possible) to allow large items deleted from the tree to be garbage
+    collected. Entries are removed as soon as either is collected. This
+    means that an item added to the cache may later fail to retrieve (if
+    the weakref-ed custom object was deleted).
+
+    Custom objects that can't be weakly referenced are kept alive by the
+    cache. Objects converted from tagged nodes that are referenced more
+    than once in the tree (through YAML aliases) are never evicted so
+    that every reference resolves to the same object. Of the others,
+    which are no longer referenced from the tree once converted, at most
+    ``max_size`` are kept and the least recently used are evicted first.
+
+    Parameters
+    ----------
+    max_size : int or None, optional
+        Maximum number of custom objects (that can't be weakly referenced
+        and weren't converted from an aliased tagged node) kept alive by
+        the cache. `None` for no limit.
     """
 
-    def __init__(self):
+    def __init__(self, max_size=None):
+        self.max_size = max_size
+        # held while converting (and caching) tagged nodes so that threads
+        # accessing the same node get the same object
+        self.lock = threading.RLock()
+        # (key, weakref) pairs for collected tagged nodes and custom objects,
+        # weakref callbacks can run at any time (and in any thread) so the
+        # items are removed the next time the cache is used
+        self._collected = collections.deque()
         # start with a clear cache
         self.clear()
 
+    def __reduce__(self):
+        # the cached items (and locks) can't be copied, start with an empty cache
+        return (self.__class__, (self.max_size,))
+
     def clear(self):
-        self._cache = {}
+        with self.lock:
+            self._cache = {}
+            # keys of items that hold a custom object and can be evicted,
+            # in least to most recently used order
+            self._held = collections.OrderedDict()
+            self._collected.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def __len__(self):
+        with self.lock:
+            self._discard_collected()
+            return len(self._cache)
+
+    @property
+    def stats(self):
+        """
+        Cache statistics as a dict with ``hits``, ``misses``,
+        ``evictions`` and ``size`` (the number of cached items).
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self)}
+
+    def _discard_collected(self):
+        while self._collected:
+            self._discard(*self._collected.popleft())
+
+    def _discard(self, key, ref=None):
+        """
+        Remove the item for ``key`` (if ``ref`` is provided, only if the
+        item owns ``ref``).
+        """
+        item = self._cache.get(key)
+        if item is None or (ref is not None and not item.owns(ref)):
+            return
+        del self._cache[key]
+        self._held.pop(key, None)
 
     def retrieve(self, tagged_node):
         """
@@ -70,14 +160,22 @@ class _TaggedObjectCache:
             ``None`` if the object hasn't been converted (or was previously
             deleted from the tree).
         """
-        key = id(tagged_node)
-        if key not in self._cache:
-            return None
-        item = self._cache[key]
-        custom_object = item.custom_object
-        if custom_object is None:
-            del self._cache[key]
-        return custom_object
+        with self.lock:
+            self._discard_collected()
+            key = id(tagged_node)
+            item = self._cache.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            custom_object = item.custom_object
+            if custom_object is None or item.tagged_node is not tagged_node:
+                self._discard(key)
+                self.misses += 1
+                return None
+            if key in self._held:
+                self._held.move_to_end(key)
+            self.hits += 1
+            return custom_object
 
     def store(self, tagged_node, custom_object):
         """
@@ -91,7 +189,26 @@ class _TaggedObjectCache:
         custom_object : converted object
             The custom object (a weakref to this object will be kept in the cache).
         """
-        self._cache[id(tagged_node)] = _TaggedObjectCacheItem(tagged_node, custom_object)
+        key = id(tagged_node)
+        collected = self._collected
+
+        def callback(ref):
+            # drop the item when the tagged node or custom object is collected
+            collected.append((key, ref))
+
+        with self.lock:
+            self._discard_collected()
+            self._discard(key)
+            item = _TaggedObjectCacheItem(tagged_node, custom_object, callback)
+            self._cache[key] = item
+            # objects for aliased nodes are kept, the other references
+            # to the node would otherwise convert to a new object
+            if item.holds_custom_object and not getattr(tagged_node, "_aliased", False):
+                self._held[key] = None
+                while self.max_size is not None and len(self._held) > self.max_size:
+                    evicted_key, _ = self._held.popitem(last=False)
+                    del self._cache[evicted_key]
+                    self.evictions += 1
 
 
 def _resolve_af_ref(af_ref):
@@ -145,6 +262,14 @@ class _AsdfNode:
     def __deepcopy__(self, memo):
         return treeutil.walk_and_modify(self, lambda n: n)
 
+    def __reduce__(self):
+        # pickle as the equivalent (non-lazy) ``list`` or ``dict``
+        # which converts every item in this node
+        if isinstance(self, AsdfListNode):
+            return (list, (), None, iter(self))
+        base_type = collections.OrderedDict if isinstance(self, AsdfOrderedDictNode) else dict
+        return (base_type, (), None, None, iter(self.items()))
+
     def _convert_and_cache(self, value, key):
         """
         Convert ``value`` to either:
@@ -189,52 +314,55 @@ class _AsdfNode:
         if not isinstance(value, tagged.Tagged) and type(value) not in _base_type_to_node_map:
             return value
         af = _resolve_af_ref(self._af_ref)
-        # if the obj that will be returned from this value
-        # is already cached, use the cached obj
-        if (obj := af._tagged_object_cache.retrieve(value)) is not None:
+        # hold the cache lock so that threads converting the same
+        # value get the same obj
+        with af._tagged_object_cache.lock:
+            # if the obj that will be returned from this value
+            # is already cached, use the cached obj
+            if (obj := af._tagged_object_cache.retrieve(value)) is not None:
+                self[key] = obj
+                return obj
+            # for Tagged instances, convert them to their custom obj
+            if isinstance(value, tagged.Tagged):
+                extension_manager = af.extension_manager
+                tag = value._tag
+                if not extension_manager.handles_tag(tag):
+                    if not af._ignore_unrecognized_tag:
+                        warnings.warn(
+                            f"{tag} is not recognized, converting to raw Python data structure",
+                            AsdfConversionWarning,
+                        )
+                    obj = _to_lazy_node(value, self._af_ref)
+                else:
+                    converter = extension_manager.get_converter_for_tag(tag)
+                    if not getattr(converter, "lazy", False) or inspect.isgeneratorfunction(
+                        converter._delegate.from_yaml_tree
+                    ):
+                        obj = yamlutil.tagged_tree_to_custom_tree(value, af)
+                    else:
+                        data = _to_lazy_node(value.data, self._af_ref)
+                        sctx = af._create_serialization_context(BlockAccess.READ)
+                        try:
+                            obj = converter.from_yaml_tree(data, tag, sctx)
+                        except Exception as err:
+                            if get_config().warn_on_failed_conversion:
+                                warnings.warn(f"A node failed to convert with: {err}", AsdfConversionWarning)
+                                obj = _to_lazy_node(value, self._af_ref)
+                            else:
+                                raise
+                        sctx.assign_object(obj)
+                        sctx.assign_blocks()
+                        sctx._mark_extension_used(converter.extension)
+            else:
+                # for non-tagged objects, wrap in an _AsdfNode
+                node_type = _base_type_to_node_map[type(value)]
+                obj = node_type(value, self._af_ref)
+            # cache the converted/wrapped obj with the AsdfFile so other
+            # references to the same Tagged value will result in the
+            # same obj
+            af._tagged_object_cache.store(value, obj)
             self[key] = obj
             return obj
-        # for Tagged instances, convert them to their custom obj
-        if isinstance(value, tagged.Tagged):
-            extension_manager = af.extension_manager
-            tag = value._tag
-            if not extension_manager.handles_tag(tag):
-                if not af._ignore_unrecognized_tag:
-                    warnings.warn(
-                        f"{tag} is not recognized, converting to raw Python data structure",
-                        AsdfConversionWarning,
-                    )
-                obj = _to_lazy_node(value, self._af_ref)
-            else:
-                converter = extension_manager.get_converter_for_tag(tag)
-                if not getattr(converter, "lazy", False) or inspect.isgeneratorfunction(
-                    converter._delegate.from_yaml_tree
-                ):
-                    obj = yamlutil.tagged_tree_to_custom_tree(value, af)
-                else:
-                    data = _to_lazy_node(value.data, self._af_ref)
-                    sctx = af._create_serialization_context(BlockAccess.READ)
-                    try:
-                        obj = converter.from_yaml_tree(data, tag, sctx)
-                    except Exception as err:
-                        if get_config().warn_on_failed_conversion:
-                            warnings.warn(f"A node failed to convert with: {err}", AsdfConversionWarning)
-                            obj = _to_lazy_node(value, self._af_ref)
-                        else:
-                            raise
-                    sctx.assign_object(obj)
-                    sctx.assign_blocks()
-                    sctx._mark_extension_used(converter.extension)
-        else:
-            # for non-tagged objects, wrap in an _AsdfNode
-            node_type = _base_type_to_node_map[type(value)]
-            obj = node_type(value, self._af_ref)
-        # cache the converted/wrapped obj with the AsdfFile so other
-        # references to the same Tagged value will result in the
-        # same obj
-        af._tagged_object_cache.store(value, obj)
-        self[key] = obj
-        return obj
 
 
 class AsdfListNode(_AsdfNode, collections.UserList):
@@ -112,7 +112,7 @@ class ResourceMappingProxy(Mapping):
         return False
 
     def __hash__(self):
-        return hash(id(self.delegate))
+        return hash(self.class_name)
 
     def __repr__(self):
         if self.package_name is not None:
@@ -123,6 +123,78 @@ class ResourceMappingProxy(Mapping):
         return f"<ResourceMappingProxy class: {self.class_name} package: {package_description} len: {len(self)}>"
 
 
+class _LazyResourceMappingProxy(ResourceMappingProxy):
+    """
+    `ResourceMappingProxy` built from cached entry point metadata.
+    Iterating the URIs uses the cache, the mapping itself is only
+    imported when the content of a resource is requested.
+
+    Parameters
+    ----------
+    metadata : dict
+        Cached description of the mapping.
+    loader : callable
+        Function that imports the mapping and returns a
+        `ResourceMappingProxy` wrapping it.
+    package_name : str
+    package_version : str
+    """
+
+    def __init__(self, metadata, loader, package_name=None, package_version=None):
+        self._loader = loader
+        self._proxy = None
+        self._package_name = package_name
+        self._package_version = package_version
+        self._class_name = metadata["class_name"]
+        self._uris = metadata["uris"]
+        self._uri_set = frozenset(self._uris)
+
+    @property
+    def loaded(self):
+        """
+        `True` if the wrapped mapping has been imported.
+        """
+        return self._proxy is not None
+
+    def _load(self):
+        if self._proxy is None:
+            self._proxy = self._loader()
+        return self._proxy
+
+    @property
+    def _delegate(self):
+        return self._load().delegate
+
+    def __getitem__(self, uri):
+        if uri not in self._uri_set:
+            raise KeyError(uri)
+        return self._delegate.__getitem__(uri)
+
+    def __contains__(self, uri):
+        return uri in self._uri_set
+
+    def __len__(self):
+        return len(self._uris)
+
+    def __iter__(self):
+        return iter(self._uris)
+
+    def __eq__(self, other):
+        if other is self:
+            return True
+        if not self.loaded or not isinstance(other, ResourceMappingProxy):
+            return False
+        if isinstance(other, _LazyResourceMappingProxy) and not other.loaded:
+            return False
+        return other.delegate is self.delegate
+
+    __hash__ = ResourceMappingProxy.__hash__
+
+    def __reduce__(self):
+        # The loader can't be pickled, pickle the loaded mapping instead
+        return (ResourceMappingProxy.maybe_wrap, (self._load(),))
+
+
 class ResourceManager(Mapping):
     """
     Wraps multiple resource mappings into a single interface
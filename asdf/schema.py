@@ -137,6 +137,91 @@ def validate_enum(validator, enums, instance, schema):
     yield from mvalidators.Draft4Validator.VALIDATORS["enum"](validator, enums, instance, schema)
 
 
+# Schema keywords whose outcome, for a number, boolean or array instance,
+# depends only on the type and structure of the instance (and not on its
+# values).  String and object keywords are ignored for these instances.
+_STRUCTURAL_KEYWORDS = frozenset(
+    [
+        "$ref",
+        "$schema",
+        "additionalProperties",
+        "allOf",
+        "anyOf",
+        "default",
+        "definitions",
+        "dependencies",
+        "description",
+        "examples",
+        "format",
+        "id",
+        "items",
+        "maxItems",
+        "maxLength",
+        "maxProperties",
+        "minItems",
+        "minLength",
+        "minProperties",
+        "oneOf",
+        "pattern",
+        "patternProperties",
+        "properties",
+        "propertyOrder",
+        "required",
+        "style",
+        "tag",
+        "title",
+        "type",
+    ],
+)
+
+
+def _is_structural_schema(validator, schema, _seen=None):
+    """
+    Return `True` if validating against ``schema`` depends only on
+    the type and structure of the instance.
+    """
+    if not isinstance(schema, dict):
+        return False
+
+    if _seen is None:
+        _seen = set()
+    if id(schema) in _seen:
+        return True
+    _seen.add(id(schema))
+
+    for keyword, value in schema.items():
+        if keyword not in _STRUCTURAL_KEYWORDS:
+            return False
+        if keyword == "$ref":
+            with validator.resolver.resolving(value) as resolved:
+                if not _is_structural_schema(validator, resolved, _seen):
+                    return False
+        elif keyword in ("allOf", "anyOf", "oneOf"):
+            if not all(_is_structural_schema(validator, subschema, _seen) for subschema in value):
+                return False
+        elif keyword == "items" and not _is_structural_schema(validator, value, _seen):
+            return False
+    return True
+
+
+def validate_items(validator, items, instance, schema):
+    """
+    All items of inline numeric ndarray data have the same type and
+    structure, so when the items schema only constrains those, it is
+    enough to validate the first item.
+    """
+    if (
+        isinstance(instance, tagged._InlineNumericArray)
+        and validator.is_type(items, "object")
+        and _is_structural_schema(validator, items)
+    ):
+        if len(instance.array):
+            yield from validator.descend(instance.array[0].tolist(), items, path=0)
+        return
+
+    yield from mvalidators.Draft4Validator.VALIDATORS["items"](validator, items, instance, schema)
+
+
 YAML_VALIDATORS = util.HashableDict(mvalidators.Draft4Validator.VALIDATORS.copy())
 YAML_VALIDATORS.update(
     {
@@ -146,6 +231,7 @@ YAML_VALIDATORS.update(
         "style": validate_style,
         "type": validate_type,
         "enum": validate_enum,
+        "items": validate_items,
     },
 )
 
@@ -346,7 +432,8 @@ def _create_validator(validators=YAML_VALIDATORS, visit_repeat_nodes=False):
                         for val in instance.values():
                             yield from self.iter_errors(val)
 
-                    elif isinstance(instance, list):
+                    # inline numeric data only contains plain numbers
+                    elif isinstance(instance, list) and not isinstance(instance, tagged._InlineNumericArray):
                         for val in instance:
                             yield from self.iter_errors(val)
 
@@ -587,6 +674,11 @@ def _validate_large_literals(instance, reading):
 
     if isinstance(instance, Integral):
         _validate(instance)
+    elif isinstance(instance, tagged._InlineNumericArray):
+        array = instance.array
+        if array.dtype.kind in "iu":
+            for value in array[(array > constants.MAX_NUMBER) | (array < constants.MIN_NUMBER)].tolist():
+                _validate(value)
     elif isinstance(instance, Mapping):
         for key in instance:
             if isinstance(key, Integral):
@@ -616,7 +708,18 @@ def _validate_mapping_keys(instance, reading):
                 raise ValidationError(msg)
 
 
-def validate(instance, ctx=None, schema=None, validators=None, reading=False, *args, **kwargs):
+def _get_content_validators(ctx):
+    """
+    Return the validators that are applied to every node of a tagged
+    tree, independent of any schema.
+    """
+    content_validators = [_validate_large_literals]
+    if ctx.version >= versioning.RESTRICTED_KEYS_MIN_VERSION:
+        content_validators.append(_validate_mapping_keys)
+    return content_validators
+
+
+def validate(instance, ctx=None, schema=None, validators=None, reading=False, *args, _validate_contents=True, **kwargs):
     """
     Validate the given instance (which must be a tagged tree) against
     the appropriate schema.  The schema itself is located using the
@@ -656,9 +759,13 @@ def validate(instance, ctx=None, schema=None, validators=None, reading=False, *a
     validator = get_validator({} if schema is None else schema, ctx, validators, *args, **kwargs)
     validator.validate(instance)
 
-    additional_validators = [_validate_large_literals]
-    if ctx.version >= versioning.RESTRICTED_KEYS_MIN_VERSION:
-        additional_validators.append(_validate_mapping_keys)
+    # Callers that already visit every node of the tree (like the
+    # YAML emitter used when writing) apply these validators themselves
+    # to avoid an additional walk of the tree.
+    if not _validate_contents:
+        return
+
+    additional_validators = _get_content_validators(ctx)
 
     def _callback(instance):
         for validator in additional_validators:
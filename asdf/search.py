@@ -6,6 +6,7 @@ import builtins
 import inspect
 import re
 import typing
+from collections import defaultdict
 
 from ._display import DEFAULT_MAX_COLS, DEFAULT_MAX_ROWS, DEFAULT_SHOW_VALUES, render_tree
 from ._node_info import collect_schema_info
@@ -29,6 +30,8 @@ class AsdfSearchResult:
         max_rows=DEFAULT_MAX_ROWS,
         max_cols=DEFAULT_MAX_COLS,
         show_values=DEFAULT_SHOW_VALUES,
+        index=None,
+        candidates=None,
     ):
         self._identifiers = identifiers
         self._node = node
@@ -37,6 +40,11 @@ class AsdfSearchResult:
         self._max_rows = max_rows
         self._max_cols = max_cols
         self._show_values = show_values
+        # Optional _SearchIndex of the tree rooted at node and the sorted
+        # positions of the index entries that may match the filters
+        # (or None if every entry may match).
+        self._index = index
+        self._candidates = candidates
 
     def format(self, max_rows=NOT_SET, max_cols=NOT_SET, show_values=NOT_SET):
         """
@@ -87,6 +95,8 @@ class AsdfSearchResult:
             max_rows=max_rows,
             max_cols=max_cols,
             show_values=show_values,
+            index=self._index,
+            candidates=self._candidates,
         )
 
     def _maybe_compile_pattern(self, query):
@@ -108,11 +118,24 @@ class AsdfSearchResult:
         return False
 
     def _get_fully_qualified_type(self, value):
-        value_type = type(value)
-        if value_type.__module__ == "builtins":
-            return value_type.__name__
+        return _get_fully_qualified_type_name(type(value))
 
-        return ".".join([value_type.__module__, value_type.__name__])
+    def _walk(self, callback):
+        """
+        Call ``callback(identifiers, parent, node)`` for every node that
+        passes the filters, in breadth-first order.
+        """
+        if self._index is not None and not self._index.stale:
+            for identifiers, parent, node in self._index.entries(self._candidates):
+                if all(f(node, identifiers[-1]) for f in self._filters):
+                    callback(identifiers, parent, node)
+            return
+
+        def _callback(identifiers, parent, node, children):
+            if all(f(node, identifiers[-1]) for f in self._filters):
+                callback(identifiers, parent, node)
+
+        _walk_tree_breadth_first(self._identifiers, self._node, _callback)
 
     def search(self, key=NOT_SET, type_=NOT_SET, value=NOT_SET, filter_=None):
         """
@@ -202,6 +225,10 @@ class AsdfSearchResult:
 
             return True
 
+        candidates = self._candidates
+        if self._index is not None and not self._index.stale:
+            candidates = self._index.intersect(candidates, self._index.lookup(key, type_, value))
+
         return AsdfSearchResult(
             self._identifiers,
             self._node,
@@ -210,6 +237,8 @@ class AsdfSearchResult:
             max_rows=self._max_rows,
             max_cols=self._max_cols,
             show_values=self._show_values,
+            index=self._index,
+            candidates=candidates,
         )
 
     def replace(self, value):
@@ -222,12 +251,10 @@ class AsdfSearchResult:
         value : object
         """
         results = []
+        self._walk(lambda identifiers, parent, node: results.append((identifiers[-1], parent)))
 
-        def _callback(identifiers, parent, node, children):
-            if all(f(node, identifiers[-1]) for f in self._filters):
-                results.append((identifiers[-1], parent))
-
-        _walk_tree_breadth_first(self._identifiers, self._node, _callback)
+        if self._index is not None:
+            self._index.stale = True
 
         for identifier, parent in results:
             parent[identifier] = value
@@ -284,12 +311,7 @@ class AsdfSearchResult:
             every node in the search results (breadth-first order)
         """
         results = []
-
-        def _callback(identifiers, parent, node, children):
-            if all(f(node, identifiers[-1]) for f in self._filters):
-                results.append(node)
-
-        _walk_tree_breadth_first(self._identifiers, self._node, _callback)
+        self._walk(lambda identifiers, parent, node: results.append(node))
         return results
 
     @property
@@ -303,12 +325,7 @@ class AsdfSearchResult:
             the path to every node in the search results
         """
         results = []
-
-        def _callback(identifiers, parent, node, children):
-            if all(f(node, identifiers[-1]) for f in self._filters):
-                results.append(_build_path(identifiers))
-
-        _walk_tree_breadth_first(self._identifiers, self._node, _callback)
+        self._walk(lambda identifiers, parent, node: results.append(_build_path(identifiers)))
         return results
 
     def __repr__(self):
@@ -364,6 +381,118 @@ class AsdfSearchResult:
         )
 
 
+# Types of nodes whose values are indexed.  Other values (containers,
+# arrays, custom objects) may compare equal to arbitrary queries and
+# are always checked against the filters.
+_INDEXED_VALUE_TYPES = (str, int, float, bool, type(None))
+
+
+class _SearchIndex:
+    """
+    Index of the nodes in a tree by key (dict key or list index),
+    type and scalar value.
+
+    Lookups return candidate positions in the breadth-first ordering of
+    the nodes.  The candidates are a superset of the matching nodes,
+    the search filters are still applied to each candidate.
+    """
+
+    def __init__(self, root_identifiers, root_node):
+        self.root = root_node
+        self.stale = False
+
+        self._entries = []
+        self._by_key = defaultdict(list)
+        self._by_type = defaultdict(list)
+        self._by_value = defaultdict(list)
+        self._unindexed_values = []
+
+        def _callback(identifiers, parent, node, children):
+            position = len(self._entries)
+            self._entries.append((identifiers, parent, node))
+            self._by_key[identifiers[-1]].append(position)
+            node_type = type(node)
+            self._by_type[node_type].append(position)
+            if node_type in _INDEXED_VALUE_TYPES:
+                self._by_value[node].append(position)
+            else:
+                self._unindexed_values.append(position)
+
+        _walk_tree_breadth_first(root_identifiers, root_node, _callback)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def entries(self, candidates=None):
+        if candidates is None:
+            return iter(self._entries)
+        return (self._entries[position] for position in candidates)
+
+    def lookup(self, key=NOT_SET, type_=NOT_SET, value=NOT_SET):
+        """
+        Get the sorted positions of the nodes that may match the
+        (compiled) query, or `None` if the query can't be answered
+        from the index.
+        """
+        candidates = None
+
+        if isinstance(key, typing.Pattern):
+            candidates = self.intersect(candidates, self._union(self._by_key, lambda k: key.search(str(k)) is not None))
+        elif key is not NOT_SET:
+            candidates = self.intersect(candidates, self._get(self._by_key, key))
+
+        if isinstance(type_, typing.Pattern):
+            candidates = self.intersect(
+                candidates,
+                self._union(self._by_type, lambda t: type_.search(_get_fully_qualified_type_name(t)) is not None),
+            )
+        elif isinstance(type_, builtins.type):
+            candidates = self.intersect(candidates, self._union(self._by_type, lambda t: issubclass(t, type_)))
+
+        if isinstance(value, typing.Pattern):
+            matches = self._union(self._by_value, lambda v: value.search(str(v)) is not None)
+            candidates = self.intersect(candidates, sorted(matches + self._unindexed_values))
+        elif value is not NOT_SET:
+            matches = self._get(self._by_value, value)
+            if matches is not None:
+                candidates = self.intersect(candidates, sorted(matches + self._unindexed_values))
+
+        return candidates
+
+    @staticmethod
+    def intersect(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        b = set(b)
+        return [position for position in a if position in b]
+
+    @staticmethod
+    def _get(index, query):
+        # Other queries may define an __eq__ that a hash lookup
+        # would not respect
+        if type(query) not in _INDEXED_VALUE_TYPES:
+            return None
+        return index.get(query, [])
+
+    @staticmethod
+    def _union(index, predicate):
+        positions = []
+        for item, item_positions in index.items():
+            if predicate(item):
+                positions.extend(item_positions)
+        positions.sort()
+        return positions
+
+
+def _get_fully_qualified_type_name(value_type):
+    if value_type.__module__ == "builtins":
+        return value_type.__name__
+
+    return ".".join([value_type.__module__, value_type.__name__])
+
+
 def _walk_tree_breadth_first(root_identifiers, root_node, callback):
     """
     Walk the tree in breadth-first order (useful for prioritizing
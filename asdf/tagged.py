@@ -52,6 +52,8 @@ class Tagged(Generic[_T]):
 
     _base_type: type[_T]
     _tag: str | None = None
+    # set when the YAML references this node more than once (with an alias)
+    _aliased = False
 
     @property
     def base(self):
@@ -184,3 +186,117 @@ def get_tag(instance):
     if not isinstance(instance, Tagged):
         return None
     return getattr(instance, "_tag", None)
+
+
+class _InlineNumericArray(list):
+    """
+    Inline ndarray data of booleans, integers or floats held in a
+    tagged tree.
+
+    On write, inline numeric arrays are placed in the tagged tree as an
+    instance of this class so that `asdf.yamlutil` can format the values
+    with vectorized numpy operations.  On read, flow sequences of plain
+    numbers under the ``data`` key of an ndarray are parsed in bulk into
+    an instance of this class.  It is a list (of nested lists) of the
+    values so code that expects the basic YAML types sees a list, but the
+    values are only converted to python objects when the list contents
+    are first used.  The numpy array (``array``) is used when the data is
+    formatted or converted.  Instances should not be modified.
+    """
+
+    # Set by the flowStyle validator, like TaggedList.flow_style
+    flow_style = None
+
+    # If the list contents were filled from the array.  Instances made
+    # without calling __init__ (when unpickled or copied) are filled from
+    # the pickled items.
+    _filled = True
+
+    def __init__(self, array):
+        super().__init__()
+        self.array = array
+        self._filled = False
+
+    def _fill(self):
+        if not self._filled:
+            self._filled = True
+            list.extend(self, self.array.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or dtype == self.array.dtype:
+            return self.array.copy() if copy else self.array
+        return self.array.astype(dtype)
+
+    @staticmethod
+    def supports(array):
+        """
+        Return `True` if the array can be stored as an `_InlineNumericArray`.
+        Masked, structured, string, complex and empty arrays (and
+        extended precision floats) are written as nested lists.
+        """
+        import numpy as np
+        from numpy import ma
+
+        dtype = array.dtype
+        return (
+            isinstance(array, np.ndarray)
+            and not isinstance(array, ma.MaskedArray)
+            and dtype.fields is None
+            and (dtype.kind in "biu" or (dtype.kind == "f" and dtype.itemsize <= 8))
+            and array.ndim > 0
+            and array.size > 0
+        )
+
+    def asarray(self, dtype=None):
+        """
+        Return the data as an array of ``dtype`` or `None` if the
+        conversion could differ from converting the nested list.
+        """
+        import numpy as np
+
+        array = self.array
+        if dtype is None or dtype == array.dtype:
+            return array
+        if dtype.fields is not None or dtype.kind not in "biuf":
+            return None
+        if dtype.kind != array.dtype.kind and not (dtype.kind == "u" and array.dtype.kind == "i"):
+            return None
+        if dtype.kind in "iu":
+            info = np.iinfo(dtype)
+            if array.min() < info.min or array.max() > info.max:
+                return None
+        return array.astype(dtype)
+
+    def tolist(self):
+        return self.array.tolist()
+
+    def __repr__(self):
+        # formatted (and summarized) by numpy as validation errors use
+        # the repr of every instance that does not match a schema
+        import numpy as np
+
+        return np.array2string(self.array, separator=", ")
+
+
+def _fill_first(name):
+    method = getattr(list, name)
+
+    def _method(self, *args, **kwargs):
+        self._fill()
+        return method(self, *args, **kwargs)
+
+    _method.__name__ = name
+    _method.__doc__ = method.__doc__
+    return _method
+
+
+# list methods that use the contents of the list
+for _name in (
+    "__len__", "__getitem__", "__iter__", "__reversed__", "__contains__",
+    "__eq__", "__ne__", "__lt__", "__le__", "__gt__", "__ge__",
+    "__add__", "__mul__", "__rmul__", "__iadd__", "__imul__",
+    "__setitem__", "__delitem__", "__reduce_ex__", "append", "clear", "copy",
+    "count", "extend", "index", "insert", "pop", "remove", "reverse", "sort",
+):  # fmt: skip
+    setattr(_InlineNumericArray, _name, _fill_first(_name))
+del _name
@@ -4,7 +4,7 @@ from .constant import Constant
 from .external_reference import ExternalArrayReference
 from .integer import IntegerType
 from .ndarray import NDArrayType
-from .stream import Stream
+from .stream import Stream, StreamWriter
 
 __all__ = [
     "AsdfObject",
@@ -16,6 +16,7 @@ __all__ = [
     "NDArrayType",
     "Software",
     "Stream",
+    "StreamWriter",
     "SubclassMetadata",
 ]
 
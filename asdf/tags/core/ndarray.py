@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import mmap
 import sys
 import typing
@@ -7,8 +8,9 @@ import typing
 import numpy as np
 from numpy import ma
 
-from asdf import util
+from asdf import constants, util
 from asdf._jsonschema import ValidationError
+from asdf.tagged import _InlineNumericArray
 
 if typing.TYPE_CHECKING:
     from asdf.typing import NDArray
@@ -166,6 +168,11 @@ def inline_data_asarray(inline, dtype=None):
     # but it's probably good enough for now.  It also won't work with
     # object dtypes, but ASDF explicitly excludes those, so we're ok
     # there.
+    if isinstance(inline, _InlineNumericArray):
+        if (array := inline.asarray(dtype)) is not None:
+            return array
+        inline = inline.tolist()
+
     if dtype is not None and dtype.fields is not None:
 
         def is_empty(arr):
@@ -241,6 +248,110 @@ def numpy_array_to_list(array):
     return ascii_to_unicode(tolist(array))
 
 
+# Size of the chunks used to compute array summaries
+_SUMMARY_CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def _iter_flat_chunks(array, chunk_bytes=_SUMMARY_CHUNK_BYTES):
+    """
+    Iterate over the elements of an array, in C order, as contiguous 1D
+    arrays of at most ``chunk_bytes`` (or a single element).  Only one
+    chunk is copied (or, for memory mapped arrays, read) at a time.
+    """
+    if array.ndim == 0:
+        yield array.reshape(1)
+        return
+
+    if array.flags.c_contiguous:
+        flat = array.reshape(-1)
+        step = max(chunk_bytes // max(array.itemsize, 1), 1)
+        for start in range(0, flat.size, step):
+            yield flat[start : start + step]
+        return
+
+    if len(array) == 0:
+        return
+
+    row_bytes = array[0].nbytes
+    if row_bytes > chunk_bytes:
+        for row in array:
+            yield from _iter_flat_chunks(row, chunk_bytes)
+        return
+
+    step = max(chunk_bytes // max(row_bytes, 1), 1)
+    for start in range(0, len(array), step):
+        yield np.ascontiguousarray(array[start : start + step]).reshape(-1)
+
+
+def _summary_number(value):
+    """
+    Convert a numpy scalar to a value that can be written to the tree.
+    """
+    value = value.item()
+    if isinstance(value, int) and not (constants.MIN_NUMBER <= value <= constants.MAX_NUMBER):
+        return float(value)
+    return value
+
+
+def compute_array_summary(array):
+    """
+    Compute summary statistics of an array in a single pass over
+    bounded size chunks of the data.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+
+    Returns
+    -------
+    dict
+        ``md5``: hex digest of the array elements in C order (as written
+        to the file, so in the byte order of the array).
+        ``nan_count``: number of NaN elements (0 for integer, bool and
+        string arrays, absent for structured arrays).
+        ``min``, ``max`` and ``mean``: of the non-NaN elements of
+        integer and floating point arrays, absent for empty (or all-NaN)
+        arrays.
+    """
+    kind = array.dtype.kind
+    has_stats = kind in "iuf"
+    can_be_nan = kind in "fc"
+
+    digest = hashlib.md5(usedforsecurity=False)
+    nan_count = 0
+    count = 0
+    total = 0.0
+    minimum = None
+    maximum = None
+
+    for chunk in _iter_flat_chunks(array):
+        digest.update(chunk.view(np.uint8))
+
+        if can_be_nan:
+            nan_mask = np.isnan(chunk)
+            chunk_nan_count = int(np.count_nonzero(nan_mask))
+            nan_count += chunk_nan_count
+            if chunk_nan_count:
+                chunk = chunk[~nan_mask]
+
+        if has_stats and chunk.size:
+            count += chunk.size
+            total += float(np.sum(chunk, dtype=np.float64))
+            chunk_min = chunk.min()
+            chunk_max = chunk.max()
+            minimum = chunk_min if minimum is None else min(minimum, chunk_min)
+            maximum = chunk_max if maximum is None else max(maximum, chunk_max)
+
+    summary = {"md5": digest.hexdigest()}
+    if array.dtype.fields is None:
+        summary["nan_count"] = nan_count
+    if count:
+        summary["min"] = _summary_number(minimum)
+        summary["max"] = _summary_number(maximum)
+        summary["mean"] = total / count
+    return summary
+
+
 def inline_array_relax_empty_shape(array: NDArray, shape: None | tuple[int | str, ...]) -> NDArray:
     if shape is None or any(isinstance(s, str) for s in shape):
         return array
@@ -254,13 +365,15 @@ def inline_array_relax_empty_shape(array: NDArray, shape: None | tuple[int | str
 
 
 class NDArrayType:
-    def __init__(self, source, shape, dtype, offset, strides, order, mask, data_callback=None):
+    def __init__(self, source, shape, dtype, offset, strides, order, mask, data_callback=None, summary=None):
         self._source = source
         self._data_callback = data_callback
         self._array = None
         self._mask = mask
+        self._summary = summary
+        self._block_cache_hit = None
 
-        if isinstance(source, list):
+        if isinstance(source, (list, _InlineNumericArray)):
             self._array = inline_data_asarray(source, dtype)
             self._array = self._apply_mask(self._array, self._mask)
 
@@ -290,6 +403,9 @@ class NDArrayType:
         # the array if necessary, otherwise we risk segfaults when
         # memory mapping.
         if self._array is not None:
+            if self._block_cache_hit is not None:
+                # keep the block data in the block cache
+                self._block_cache_hit()
             base = util.get_array_base(self._array)
             if isinstance(base, np.memmap) and isinstance(base.base, mmap.mmap):
                 # check if the underlying mmap matches the one generated by generic_io
@@ -312,6 +428,14 @@ class NDArrayType:
                 # cached data is used here so that multiple NDArrayTypes will all use
                 # the same base array
                 data = self._data_callback(_attr="cached_data")
+                # if the block cache evicts the data, release it (see _release_block_data)
+                try:
+                    add_consumer = self._data_callback(_attr="_add_consumer")
+                except AttributeError:
+                    # external and pickled blocks are not cached
+                    pass
+                else:
+                    self._block_cache_hit = add_consumer(self)
 
             if hasattr(data, "base") and isinstance(data.base, mmap.mmap) and data.base.closed:
                 msg = "ASDF file has already been closed. Can not get the data."
@@ -324,8 +448,8 @@ class NDArrayType:
                 self._dtype,
                 data.size,
             )
-            self._array = np.ndarray(shape, self._dtype, data, self._offset, self._strides, self._order)
-            self._array = self._apply_mask(self._array, self._mask)
+            array = np.ndarray(shape, self._dtype, data, self._offset, self._strides, self._order)
+            self._array = self._apply_mask(array, self._mask)
         return self._array
 
     def _apply_mask(self, array, mask):
@@ -347,6 +471,45 @@ class NDArrayType:
     def __array__(self):
         return self._make_array()
 
+    def _release_block_data(self):
+        # called when the (read-only) block data was evicted from the
+        # block cache, the array will be made again when it is next used
+        self._array = None
+        self._block_cache_hit = None
+
+    def __getstate__(self):
+        # Arrays read from a local file (that are not loaded or are read-only)
+        # are pickled as a reference to the block so the array data is read
+        # (or memory mapped) from the file when the array is first used in
+        # the process that unpickles it.  Other arrays include their data.
+        state = self.__dict__.copy()
+        state["_block_cache_hit"] = None
+        if self._data_callback is None:
+            return state
+        get_file_data_callback = getattr(self._data_callback, "_get_file_data_callback", None)
+        file_data_callback = None if get_file_data_callback is None else get_file_data_callback()
+        if file_data_callback is not None and (self._array is None or not self._array.flags.writeable):
+            state["_array"] = None
+            state["_data_callback"] = file_data_callback
+        else:
+            state["_array"] = self._make_array()
+            state["_data_callback"] = None
+        return state
+
+    def __setstate__(self, state):
+        # defined so that unpickling does not call __getattr__
+        self.__dict__.update(state)
+
+    @property
+    def summary(self):
+        """
+        Summary statistics of the array (see `compute_array_summary`)
+        stored in the file when it was written with the ``array_summary``
+        config option enabled, or `None`.  Reading the summary does not
+        load the array data.
+        """
+        return self._summary
+
     def __repr__(self):
         # repr alone should not force loading of the data
         if self._array is None:
@@ -510,6 +673,9 @@ for op in [
 
 
 def _get_ndim(instance):
+    if isinstance(instance, _InlineNumericArray):
+        return instance.array.ndim
+
     if isinstance(instance, list):
         array = inline_data_asarray(instance)
         return array.ndim
@@ -546,7 +712,7 @@ def validate_max_ndim(validator, max_ndim, instance, schema):
 
 
 def validate_datatype(validator, datatype, instance, schema):
-    if isinstance(instance, list):
+    if isinstance(instance, (list, _InlineNumericArray)):
         array = inline_data_asarray(instance)
         in_datatype, _ = numpy_dtype_to_asdf_datatype(array.dtype)
     elif isinstance(instance, dict):
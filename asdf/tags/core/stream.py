@@ -1,30 +1,61 @@
-from .ndarray import numpy_dtype_to_asdf_datatype
+import hashlib
+import queue
+import threading
+import types
+
+import numpy as np
+
+from asdf import _compression as mcompression
+
+from .ndarray import asdf_datatype_to_numpy_dtype, numpy_dtype_to_asdf_datatype
 
 
 class Stream:
     """
     Used to put a streamed array into the tree.
 
+    Parameters
+    ----------
+    shape : list of int
+        The shape of one row of the streamed array.
+
+    dtype : numpy.dtype
+        The dtype of the streamed array.
+
+    strides : list of int, optional
+        The strides of the streamed array.
+
+    compression : str, optional
+        Compress the streamed block. Only compression that writes
+        self-delimiting frames (``"lz4"``) can be used as the compressed
+        size of a streamed block is not known.
+
+    compression_kwargs : dict, optional
+        Keyword arguments passed to the compressor.
+
     Examples
     --------
-    Save a double-precision array with 1024 columns, one row at a
-    time::
+    Save a double-precision array with 1024 columns, 20 rows at a
+    time (see `StreamWriter`)::
 
-         >>> from asdf import AsdfFile, Stream
+         >>> from asdf import AsdfFile, Stream, StreamWriter
          >>> import numpy as np
          >>> ff = AsdfFile()
          >>> ff.tree['streamed'] = Stream([1024], np.float64)
-         >>> with open('test.asdf', 'wb') as fd:
-         ...     ff.write_to(fd)
-         ...     for i in range(200):
-         ...         nbytes = fd.write(
-         ...                      np.array([i] * 1024, np.float64).tobytes())
+         >>> with StreamWriter('test.asdf', ff) as writer:
+         ...     for i in range(10):
+         ...         writer.write_array(np.full((20, 1024), i, np.float64))
     """
 
-    def __init__(self, shape, dtype, strides=None):
+    def __init__(self, shape, dtype, strides=None, compression=None, compression_kwargs=None):
+        if mcompression.validate(compression) is not None and not mcompression.is_framed(compression):
+            msg = f"Stream compression must be one of {mcompression.FRAMED_COMPRESSIONS}, not '{compression}'"
+            raise ValueError(msg)
         self._shape = shape
         self._datatype, self._byteorder = numpy_dtype_to_asdf_datatype(dtype)
         self._strides = strides
+        self._compression = mcompression.validate(compression)
+        self._compression_kwargs = compression_kwargs
         self._array = None
 
     def _make_array(self):
@@ -35,3 +66,317 @@ class Stream:
 
     def __str__(self):
         return str(self.__repr__())
+
+
+def _iter_rows(chunks, dtype, row_shape, rows_per_chunk, offset=0):
+    """
+    Split the block data ``chunks`` (an iterable of uint8 arrays of any
+    size) into arrays of ``rows_per_chunk`` rows (the last array can
+    contain fewer rows), skipping the first ``offset`` bytes.
+    """
+    row_nbytes = dtype.itemsize * int(np.prod(row_shape))
+    if row_nbytes == 0:
+        return
+    chunk_nbytes = row_nbytes * rows_per_chunk
+
+    pieces = []
+    size = 0
+    for data in chunks:
+        if offset:
+            skip = min(offset, data.size)
+            data = data[skip:]
+            offset -= skip
+        if not data.size:
+            continue
+        pieces.append(data)
+        size += data.size
+        while size >= chunk_nbytes:
+            buff = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+            yield buff[:chunk_nbytes].view(dtype).reshape((rows_per_chunk, *row_shape))
+            buff = buff[chunk_nbytes:]
+            pieces = [buff] if buff.size else []
+            size = buff.size
+
+    # the last rows (a partial row at the end of the block is ignored)
+    n_rows = size // row_nbytes
+    if n_rows:
+        buff = pieces[0] if len(pieces) == 1 else np.concatenate(pieces)
+        yield buff[: n_rows * row_nbytes].view(dtype).reshape((n_rows, *row_shape))
+
+
+class StreamWriter:
+    """
+    Write the rows of a `Stream` to a file in batches.
+
+    The tree (which must contain exactly one `Stream`) is written when
+    the writer is created, the rows are then written (after the streamed
+    block header) with `write_array`. Arrays of at least ``buffer_size``
+    bytes are written without being copied, smaller arrays are collected
+    in a buffer that is written when full.
+
+    If the `Stream` is compressed, each written buffer (or large array)
+    is compressed separately into self-delimiting frames.
+
+    When the writer is closed the buffer is written and, if the file is
+    seekable and ``update_header`` is enabled, the streamed block header
+    is updated with the size and checksum of the written data.
+
+    Parameters
+    ----------
+    fd : str, `pathlib.Path` or file-like object
+        The file to write. If a path, the file will be closed when
+        the writer is closed.
+
+    tree : dict or `asdf.AsdfFile`
+        The tree (or `asdf.AsdfFile`) to write.
+
+    buffer_size : int, optional
+        Size (in bytes) of the buffer used to collect small arrays.
+        This is rounded up to a multiple of the file block size.
+
+    update_header : bool, optional
+        Update the streamed block header on close (only possible
+        for seekable files).
+
+    write_checksums : bool, optional
+        Compute and write block checksums to the file.
+
+    background : bool, optional
+        Write (compress and checksum) the data in a background thread. Arrays
+        passed to `write_array` must not be modified until `flush`
+        (or `close`) is called as they may be written without
+        being copied.
+
+    **kwargs
+        Passed on to `asdf.AsdfFile.write_to`.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> from asdf import Stream, StreamWriter
+    >>> tree = {"stream": Stream([3], np.int64)}
+    >>> with StreamWriter("stream.asdf", tree) as writer:
+    ...     writer.write_array(np.arange(30).reshape((10, 3)))
+    ...     writer.write_array([30, 31, 32])
+    >>> writer.rows
+    11
+    """
+
+    def __init__(
+        self,
+        fd,
+        tree,
+        buffer_size=2**20,
+        update_header=True,
+        write_checksums=True,
+        background=False,
+        **kwargs,
+    ):
+        from asdf import AsdfFile, generic_io, treeutil
+
+        if buffer_size < 1:
+            msg = f"buffer_size must be positive, got {buffer_size}"
+            raise ValueError(msg)
+
+        af = tree if isinstance(tree, AsdfFile) else AsdfFile(tree)
+        streams = [node for node in treeutil.iter_tree(af.tree) if isinstance(node, Stream)]
+        if len(streams) != 1:
+            msg = f"tree must contain exactly one Stream, found {len(streams)}"
+            raise ValueError(msg)
+        stream = streams[0]
+        self._row_shape = tuple(stream._shape)
+        self._dtype = asdf_datatype_to_numpy_dtype(stream._datatype, stream._byteorder)
+        self._compression = stream._compression
+        self._compression_kwargs = stream._compression_kwargs
+
+        self._fd = generic_io.get_file(fd, mode="w")
+        try:
+            af.write_to(self._fd, write_checksums=write_checksums, **kwargs)
+        except BaseException:
+            self._fd.__exit__(None, None, None)
+            raise
+
+        from asdf._block import io as bio
+
+        # the streamed block header is the last thing written by write_to
+        self._header_offset = None
+        if update_header and self._fd.seekable():
+            self._header_offset = self._fd.tell() - bio.BLOCK_HEADER.size
+        self._hash = hashlib.new("md5", usedforsecurity=False) if write_checksums else None
+
+        block_size = self._fd.block_size
+        self._buffer_size = -(-buffer_size // block_size) * block_size
+        self._buffer = bytearray(self._buffer_size)
+        self._buffered = 0
+
+        self.rows = 0
+        self.nbytes = 0
+        # size of the (compressed) data written to the file
+        self._used_size = 0
+        self._frame_writer = types.SimpleNamespace(write=self._write_frame)
+        self._closed = False
+
+        self._error = None
+        self._queue = None
+        self._thread = None
+        if background:
+            # limit the number of pending writes so memory use is bounded
+            self._queue = queue.Queue(maxsize=4)
+            self._thread = threading.Thread(target=self._run, name="asdf-stream-writer", daemon=True)
+            self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_, value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def write_array(self, array):
+        """
+        Write rows to the stream.
+
+        Parameters
+        ----------
+        array : array-like
+            Either an array of rows (with shape ``(n, *row_shape)``) or a
+            single row. The dtype must match the `Stream` dtype.
+        """
+        if self._closed:
+            msg = "I/O operation on closed StreamWriter"
+            raise ValueError(msg)
+        self._check_error()
+
+        array = np.asarray(array)
+        if array.shape == self._row_shape:
+            array = array[np.newaxis]
+        if array.shape[1:] != self._row_shape:
+            msg = f"array shape {array.shape} doesn't match stream row shape {self._row_shape}"
+            raise ValueError(msg)
+        if array.dtype != self._dtype:
+            msg = f"array dtype {array.dtype} doesn't match stream dtype {self._dtype}"
+            raise ValueError(msg)
+
+        if not array.flags.c_contiguous:
+            array = np.ascontiguousarray(array)
+        self._write_bytes(memoryview(array.reshape(-1).view(np.uint8)))
+        self.rows += array.shape[0]
+
+    def flush(self):
+        """
+        Write any buffered data (and wait for background writes to finish).
+        """
+        self._check_error()
+        if self._buffered:
+            self._write_chunk(memoryview(self._buffer)[: self._buffered])
+            if self._queue is not None:
+                # the buffer was handed to the writing thread
+                self._buffer = bytearray(self._buffer_size)
+            self._buffered = 0
+        if self._queue is not None:
+            self._queue.join()
+        self._check_error()
+        self._fd.flush()
+
+    def close(self):
+        """
+        Write any buffered data, update the streamed block header
+        and close the file (if it was opened by the writer).
+        """
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            try:
+                self.flush()
+            finally:
+                if self._thread is not None:
+                    self._queue.put(None)
+                    self._thread.join()
+            if self._header_offset is not None:
+                self._update_header()
+        finally:
+            self._fd.__exit__(None, None, None)
+
+    def _write_bytes(self, data):
+        size = self._buffer_size
+        position = 0
+        if self._buffered:
+            # fill the partially filled buffer first
+            position = min(len(data), size - self._buffered)
+            self._buffer[self._buffered : self._buffered + position] = data[:position]
+            self._buffered += position
+            if self._buffered < size:
+                return
+            self._buffered = 0
+            self._write_chunk(memoryview(self._buffer))
+            if self._queue is not None:
+                self._buffer = bytearray(size)
+
+        # write whole buffers worth of data without copying
+        n_direct = (len(data) - position) // size * size
+        if n_direct:
+            self._write_chunk(data[position : position + n_direct])
+            position += n_direct
+
+        remainder = len(data) - position
+        if remainder:
+            self._buffer[:remainder] = data[position:]
+            self._buffered = remainder
+
+    def _write_chunk(self, chunk):
+        self.nbytes += len(chunk)
+        if self._queue is not None:
+            self._queue.put(chunk)
+        else:
+            self._write(chunk)
+
+    def _write(self, chunk):
+        if self._compression is None:
+            self._write_frame(chunk)
+        else:
+            mcompression.compress(self._frame_writer, chunk, self._compression, config=self._compression_kwargs)
+
+    def _write_frame(self, frame):
+        self._fd.write(frame)
+        self._used_size += len(frame)
+        if self._hash is not None:
+            self._hash.update(frame)
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            try:
+                if chunk is None:
+                    return
+                if self._error is None:
+                    self._write(chunk)
+            except BaseException as err:
+                self._error = err
+            finally:
+                self._queue.task_done()
+
+    def _check_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _update_header(self):
+        from asdf import constants
+        from asdf._block import io as bio
+
+        checksum = self._hash.digest() if self._hash is not None else b"\0" * 16
+        header = bio.BLOCK_HEADER.pack(
+            flags=constants.BLOCK_FLAG_STREAMED,
+            compression=mcompression.to_compression_header(self._compression),
+            allocated_size=self._used_size,
+            used_size=self._used_size,
+            data_size=self.nbytes,
+            checksum=checksum,
+        )
+        end = self._fd.tell()
+        self._fd.seek(self._header_offset)
+        self._fd.write(header)
+        self._fd.seek(end)
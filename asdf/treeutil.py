@@ -64,7 +64,9 @@ def iter_tree(top):
         if tree_id in seen:
             return
 
-        if isinstance(tree, (list, tuple, lazy_nodes.AsdfListNode)):
+        if isinstance(tree, tagged._InlineNumericArray):
+            pass
+        elif isinstance(tree, (list, tuple, lazy_nodes.AsdfListNode)):
             seen.add(tree_id)
             for val in tree:
                 yield from recurse(val)
@@ -219,6 +221,280 @@ class _RemoveNode:
 RemoveNode = _RemoveNode()
 
 
+# Kinds of nodes handled by walk_and_modify
+_LEAF = 0
+_MAPPING = 1
+_MUTABLE_SEQUENCE = 2
+_IMMUTABLE_SEQUENCE = 3
+
+# Leaf types that can neither contain a reference cycle nor need to be
+# mapped to a single result, so walk_and_modify skips its bookkeeping
+# for them.
+_SCALAR_TYPES = frozenset([str, int, float, bool, type(None)])
+
+# Map of node type to (kind, factory for the modified container)
+_node_types = {
+    dict: (_MAPPING, dict),
+    list: (_MUTABLE_SEQUENCE, list),
+    tuple: (_IMMUTABLE_SEQUENCE, tuple),
+    # inline ndarray data is a list of scalars that is never modified
+    tagged._InlineNumericArray: (_LEAF, None),
+    **{scalar_type: (_LEAF, None) for scalar_type in _SCALAR_TYPES},
+}
+
+
+def _get_node_type(node):
+    """
+    Look up the kind of ``node`` and the factory for the container
+    that walk_and_modify creates for it.
+    """
+    typ = type(node)
+    if (node_type := _node_types.get(typ)) is not None:
+        return node_type
+
+    if isinstance(node, lazy_nodes.AsdfOrderedDictNode):
+        node_type = (_MAPPING, collections.OrderedDict)
+    elif isinstance(node, lazy_nodes.AsdfDictNode):
+        node_type = (_MAPPING, dict)
+    elif isinstance(node, dict):
+        node_type = (_MAPPING, typ)
+    # don't treat namedtuple instances as tuples
+    # see: https://github.com/python/cpython/issues/52044
+    elif isinstance(node, tuple) and not hasattr(node, "_fields"):
+        node_type = (_IMMUTABLE_SEQUENCE, typ)
+    elif isinstance(node, lazy_nodes.AsdfListNode):
+        node_type = (_MUTABLE_SEQUENCE, list)
+    elif isinstance(node, list):
+        node_type = (_MUTABLE_SEQUENCE, typ)
+    else:
+        node_type = (_LEAF, None)
+
+    _node_types[typ] = node_type
+    return node_type
+
+
+class _Frame:
+    """
+    A container node whose children are being modified by
+    `_TreeWalker`.
+    """
+
+    __slots__ = ("children", "factory", "json_id", "key", "kind", "node", "pending_items", "result", "tag", "tracked")
+
+    def __init__(self, node, tracked, json_id, container, kind, factory):
+        self.node = node
+        self.tracked = tracked
+        self.json_id = json_id
+        self.kind = kind
+        self.key = None
+        self.pending_items = None
+        self.tag = container._tag if isinstance(container, tagged.Tagged) else None
+        if kind == _MAPPING:
+            self.children = iter(container.items())
+            self.result = factory()
+            if self.tag is not None:
+                self.result._tag = self.tag
+        else:
+            self.children = iter(container)
+            if kind == _MUTABLE_SEQUENCE:
+                self.result = factory()
+                if self.tag is not None:
+                    self.result._tag = self.tag
+            else:
+                # Immutable sequences are created once the contents are known
+                self.result = []
+                self.factory = factory
+
+
+_NOTHING = object()
+
+
+class _TreeWalker:
+    """
+    The implementation of walk_and_modify, which uses an explicit
+    stack of `_Frame` instead of recursion.
+    """
+
+    def __init__(self, callback, postorder, context):
+        self._callback = callback
+        self._pass_json_id = callback.__code__.co_argcount == 2
+        self._postorder = postorder
+        self._context = context
+
+    def _call(self, node, json_id):
+        result = self._callback(node, json_id) if self._pass_json_id else self._callback(node)
+
+        # If the result is a generator, generate one value to
+        # extract the true result, then register the generator
+        # to be drained later.
+        if type(result) is types.GeneratorType:
+            generator = result
+            result = next(generator)
+            self._context.add_generator(generator)
+
+        return result
+
+    def walk(self, top, json_id=None):
+        pending = self._context._pending
+        call = self._call
+        postorder = self._postorder
+
+        stack = []
+        value = self._enter(top, json_id, stack)
+        try:
+            while stack:
+                frame = stack[-1]
+                if value is not _NOTHING:
+                    # Store the modified child in the parent
+                    if frame.kind == _MAPPING:
+                        if value is not RemoveNode:
+                            frame.result[frame.key] = value
+                    else:
+                        frame.result.append(value)
+
+                if (child := next(frame.children, _NOTHING)) is _NOTHING:
+                    value = self._exit(frame)
+                    stack.pop()
+                    continue
+
+                if frame.kind == _MAPPING:
+                    frame.key, child = child
+
+                if type(child) in _SCALAR_TYPES:
+                    # A shortcut through _enter, scalars only need the callback
+                    value = call(child, frame.json_id)
+                    if not postorder and type(value) not in _SCALAR_TYPES:
+                        kind, factory = _get_node_type(value)
+                        if kind != _LEAF:
+                            stack.append(_Frame(child, False, frame.json_id, value, kind, factory))
+                            value = _NOTHING
+                elif frame.kind != _IMMUTABLE_SEQUENCE and id(child) in pending:
+                    # The child node is pending modification, which means
+                    # it must be its own ancestor.  Assign the special
+                    # PendingValue instance for now, and note that we'll
+                    # need to fill in the real value later.
+                    if frame.pending_items is None:
+                        frame.pending_items = {}
+                    if frame.kind == _MAPPING:
+                        frame.pending_items[frame.key] = child
+                        frame.result[frame.key] = PendingValue
+                    else:
+                        frame.pending_items[len(frame.result)] = child
+                        frame.result.append(PendingValue)
+                    value = _NOTHING
+                else:
+                    value = self._enter(child, frame.json_id, stack)
+        except BaseException:
+            for frame in stack:
+                if frame.tracked:
+                    pending.discard(id(frame.node))
+            raise
+
+        return value
+
+    def _enter(self, node, json_id, stack):
+        """
+        Start modifying a node.  Returns the modified node or, if the
+        node has children to modify first, pushes a frame to the stack
+        and returns ``_NOTHING``.
+        """
+        context = self._context
+        tracked = type(node) not in _SCALAR_TYPES
+        if tracked:
+            node_id = id(node)
+            if node_id in context._map:
+                # The node's modified result has already been
+                # created, all we need to do is return it.  This
+                # occurs when the tree contains multiple references
+                # to the same object id.
+                return context._map[node_id][1]
+
+            if node_id in context._pending:
+                msg = (
+                    "Unhandled cycle in tree.  This is possibly a bug "
+                    "in extension code, which should be yielding "
+                    "nodes that may contain reference cycles."
+                )
+                raise RuntimeError(msg)
+
+            # Take note of the "id" field, in case we're modifying
+            # a schema and need to know the namespace for resolving
+            # URIs.  Ignore an id that is not a string, since it may
+            # be an object defining an id property and not an id
+            # itself (this is common in metaschemas).
+            if _get_node_type(node)[0] == _MAPPING and "id" in node and isinstance(node["id"], str):
+                json_id = node["id"]
+
+            context._pending.add(node_id)
+
+        try:
+            # For a postorder modification, invoke the callback on
+            # this node's children first.  Otherwise, invoke the
+            # callback on the node first, then its children.
+            container = node if self._postorder else self._call(node, json_id)
+            kind, factory = _get_node_type(container)
+            if kind != _LEAF:
+                stack.append(_Frame(node, tracked, json_id, container, kind, factory))
+                return _NOTHING
+
+            if self._postorder:
+                container = self._call(container, json_id)
+        except BaseException:
+            if tracked:
+                context._pending.discard(node_id)
+            raise
+
+        if tracked:
+            context._pending.remove(node_id)
+            context[node] = container
+        return container
+
+    def _exit(self, frame):
+        """
+        Finish modifying the node of a frame once all of its
+        children have been modified.
+        """
+        result = frame.result
+        if frame.kind == _IMMUTABLE_SEQUENCE:
+            # Immutable sequences containing themselves are impossible
+            # to construct (well, maybe possible in a C extension, but
+            # we're not going to worry about that), so there are no
+            # pending items.
+            result = frame.factory(result)
+            if frame.tag is not None:
+                result._tag = frame.tag
+        elif frame.pending_items is not None:
+            self._context.add_generator(self._modify_pending_items(frame))
+
+        if self._postorder:
+            result = self._call(result, frame.json_id)
+
+        # Store the result in the context, in case there are
+        # additional references to the same node elsewhere in
+        # the tree.
+        if frame.tracked:
+            self._context._pending.remove(id(frame.node))
+            self._context[frame.node] = result
+
+        return result
+
+    def _modify_pending_items(self, frame):
+        """
+        Generator, drained by the context, that fills in the children
+        that were pending when the frame's node was modified.  By then
+        they are available.
+        """
+        result = frame.result
+        for key, value in frame.pending_items.items():
+            if (val := self.walk(value, frame.json_id)) is not RemoveNode or frame.kind != _MAPPING:
+                result[key] = val
+            else:
+                # The callback may have decided to delete
+                # this node after all.
+                del result[key]
+            yield
+
+
 def walk_and_modify(top, callback, postorder=True, _context=None):
     """Modify a tree by walking it with a callback function.  It also has
     the effect of doing a deep copy.
@@ -262,154 +538,11 @@ def walk_and_modify(top, callback, postorder=True, _context=None):
         msg = "Expected callback to accept one or two arguments"
         raise ValueError(msg)
 
-    def _handle_generator(result):
-        # If the result is a generator, generate one value to
-        # extract the true result, then register the generator
-        # to be drained later.
-        if isinstance(result, types.GeneratorType):
-            generator = result
-            result = next(generator)
-            _context.add_generator(generator)
-
-        return result
-
-    def _handle_callback(node, json_id):
-        result = callback(node) if callback_arity == 1 else callback(node, json_id)
-
-        return _handle_generator(result)
-
-    def _handle_mapping(node, json_id):
-        if isinstance(node, lazy_nodes.AsdfOrderedDictNode):
-            result = collections.OrderedDict()
-        elif isinstance(node, lazy_nodes.AsdfDictNode):
-            result = {}
-        else:
-            result = node.__class__()
-        if isinstance(node, tagged.Tagged):
-            result._tag = node._tag
-
-        pending_items = {}
-        for key, value in node.items():
-            if _context.is_pending(value):
-                # The child node is pending modification, which means
-                # it must be its own ancestor.  Assign the special
-                # PendingValue instance for now, and note that we'll
-                # need to fill in the real value later.
-                pending_items[key] = value
-                result[key] = PendingValue
-
-            elif (val := _recurse(value, json_id)) is not RemoveNode:
-                result[key] = val
-
-        yield result
-
-        if len(pending_items) > 0:
-            # Now that we've yielded, the pending children should
-            # be available.
-            for key, value in pending_items.items():
-                if (val := _recurse(value, json_id)) is not RemoveNode:
-                    result[key] = val
-                else:
-                    # The callback may have decided to delete
-                    # this node after all.
-                    del result[key]
-
-    def _handle_mutable_sequence(node, json_id):
-        if isinstance(node, lazy_nodes.AsdfListNode):
-            result = []
-        else:
-            result = node.__class__()
-        if isinstance(node, tagged.Tagged):
-            result._tag = node._tag
-
-        pending_items = {}
-        for i, value in enumerate(node):
-            if _context.is_pending(value):
-                # The child node is pending modification, which means
-                # it must be its own ancestor.  Assign the special
-                # PendingValue instance for now, and note that we'll
-                # need to fill in the real value later.
-                pending_items[i] = value
-                result.append(PendingValue)
-            else:
-                result.append(_recurse(value, json_id))
-
-        yield result
-
-        for i, value in pending_items.items():
-            # Now that we've yielded, the pending children should
-            # be available.
-            result[i] = _recurse(value, json_id)
-
-    def _handle_immutable_sequence(node, json_id):
-        # Immutable sequences containing themselves are impossible
-        # to construct (well, maybe possible in a C extension, but
-        # we're not going to worry about that), so we don't need
-        # to yield here.
-        contents = [_recurse(value, json_id) for value in node]
-
-        result = node.__class__(contents)
-        if isinstance(node, tagged.Tagged):
-            result._tag = node._tag
-
-        return result
-
-    def _handle_children(node, json_id):
-        if isinstance(node, (dict, lazy_nodes.AsdfDictNode)):
-            result = _handle_mapping(node, json_id)
-        # don't treat namedtuple instances as tuples
-        # see: https://github.com/python/cpython/issues/52044
-        elif isinstance(node, tuple) and not hasattr(node, "_fields"):
-            result = _handle_immutable_sequence(node, json_id)
-        elif isinstance(node, (list, lazy_nodes.AsdfListNode)):
-            result = _handle_mutable_sequence(node, json_id)
-        else:
-            result = node
-
-        return _handle_generator(result)
-
-    def _recurse(node, json_id=None):
-        if node in _context:
-            # The node's modified result has already been
-            # created, all we need to do is return it.  This
-            # occurs when the tree contains multiple references
-            # to the same object id.
-            return _context[node]
-
-        # Inform the context that we're going to start modifying
-        # this node.
-        with _context.pending(node):
-            # Take note of the "id" field, in case we're modifying
-            # a schema and need to know the namespace for resolving
-            # URIs.  Ignore an id that is not a string, since it may
-            # be an object defining an id property and not an id
-            # itself (this is common in metaschemas).
-            if isinstance(node, (dict, lazy_nodes.AsdfDictNode)) and "id" in node and isinstance(node["id"], str):
-                json_id = node["id"]
-
-            if postorder:
-                # If this is a postorder modification, invoke the
-                # callback on this node's children first.
-                result = _handle_children(node, json_id)
-                result = _handle_callback(result, json_id)
-            else:
-                # Otherwise, invoke the callback on the node first,
-                # then its children.
-                result = _handle_callback(node, json_id)
-                result = _handle_children(result, json_id)
-
-        # Store the result in the context, in case there are
-        # additional references to the same node elsewhere in
-        # the tree.
-        _context[node] = result
-
-        return result
-
     if _context is None:
         _context = _TreeModificationContext()
 
     with _context:
-        return _recurse(top)
+        return _TreeWalker(callback, postorder, _context).walk(top)
         # Generators will be drained here, if this is the outermost
         # call to walk_and_modify.
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import re
 import warnings
 from collections import OrderedDict
 from types import GeneratorType
@@ -145,6 +146,293 @@ def represent_numpy_str(dumper, data):
 
 AsdfDumper.add_representer(np.str_, represent_numpy_str)
 AsdfDumper.add_representer(np.bytes_, AsdfDumper.represent_binary)
+AsdfDumper.add_representer(tagged._InlineNumericArray, lambda dumper, data: dumper.represent_list(data.tolist()))
+
+
+_BOOL_TAG = "tag:yaml.org,2002:bool"
+_INT_TAG = "tag:yaml.org,2002:int"
+_FLOAT_TAG = "tag:yaml.org,2002:float"
+
+
+def _format_inline_array(array):
+    """
+    Format every value of a boolean, integer or float array as the
+    plain scalar that the representer would produce for it.
+
+    Returns
+    -------
+    values, tag : numpy.ndarray, str
+        Array of strings with the shape of ``array`` and the YAML
+        tag shared by all values.
+    """
+    if array.dtype.kind == "b":
+        return np.where(array, "true", "false"), _BOOL_TAG
+
+    if array.dtype.kind in "iu":
+        return array.astype(str), _INT_TAG
+
+    # numpy formats float64 values with the shortest repr, like
+    # float.__repr__, which is what represent_float starts from.
+    array = array.astype(np.float64)
+    values = array.astype(str)
+    # represent_float inserts a '.0' before the exponent of repr
+    # strings like '1e+16' so they resolve as floats in YAML 1.1
+    needs_point = np.char.find(values, ".") < 0
+    if needs_point.any():
+        values[needs_point] = np.char.replace(values[needs_point], "e", ".0e", count=1)
+    if not np.isfinite(array).all():
+        values[np.isnan(array)] = ".nan"
+        values[array == np.inf] = ".inf"
+        values[array == -np.inf] = "-.inf"
+    return values, _FLOAT_TAG
+
+
+_ANCHOR_TEMPLATE = "id%03d"
+_MAPPING_TAG = yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG
+_SEQUENCE_TAG = yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG
+_PLAIN_SCALAR_TYPES = frozenset([str, float, bool, type(None)])
+_EMITTER_CONTAINER_TYPES = frozenset([dict, list, tuple, OrderedDict, tagged.TaggedDict, tagged.TaggedList])
+
+
+class _TreeEmitter:
+    """
+    Emit a tagged tree as YAML by feeding events directly to an
+    `AsdfDumper`.
+
+    ``yaml.dump`` first represents the whole tree as a graph of
+    ``yaml.Node`` objects, walks that graph to find the nodes that
+    need anchors and then walks it once more to emit events.  Here the
+    objects that need anchors are found by a single scan of the tagged
+    tree, which also applies the per-node content validators from
+    `asdf.schema` and checks that every object can be represented.
+    Events are then emitted while walking the tree, with only scalars
+    represented as (transient) nodes.  The resulting YAML is identical
+    to the output of ``yaml.dump``.
+    """
+
+    def __init__(self, dumper, content_validators=()):
+        self._dumper = dumper
+        self._content_validators = content_validators
+        self._anchors = {}
+        self._emitted = set()
+        self._representable_types = {}
+
+    def _is_representable(self, typ):
+        if typ not in self._representable_types:
+            multi_representers = self._dumper.yaml_multi_representers
+            self._representable_types[typ] = typ in self._dumper.yaml_representers or any(
+                base in multi_representers for base in typ.__mro__
+            )
+        return self._representable_types[typ]
+
+    def _mapping_items(self, mapping):
+        # Match the item order produced by represent_mapping
+        items = list(mapping.items())
+        if self._dumper.sort_keys:
+            try:
+                items = sorted(items)
+            except TypeError:
+                pass
+
+        property_order = getattr(mapping, "property_order", None)
+        if property_order:
+            values = dict(items)
+            ordered_items = [(key, values[key]) for key in property_order if key in values]
+            property_order = set(property_order)
+            ordered_items.extend(item for item in items if item[0] not in property_order)
+            items = ordered_items
+
+        return items
+
+    @staticmethod
+    def _is_container(obj):
+        return type(obj) in _EMITTER_CONTAINER_TYPES
+
+    def _children(self, obj):
+        """
+        Return the (child, is_key) pairs of a container in the order
+        they will be emitted.
+        """
+        typ = type(obj)
+        if typ is OrderedDict or typ is dict or typ is tagged.TaggedDict:
+            items = obj.items() if typ is OrderedDict else self._mapping_items(obj)
+            return [child for key, value in items for child in ((key, True), (value, False))]
+        return [(child, False) for child in obj]
+
+    def scan(self, tree):
+        """
+        Validate the contents of the tree and determine which objects
+        need anchors, visiting objects in the order they will be
+        emitted.
+        """
+        dumper = self._dumper
+        anchors = {}
+        last_anchor_id = 0
+
+        # Mapping keys are pushed as (key, True) so that the content
+        # validators only see values, like `asdf.treeutil.walk`.
+        stack = [(tree, False)]
+        while stack:
+            obj, is_key = stack.pop()
+
+            if type(obj) in _PLAIN_SCALAR_TYPES:
+                # Never aliased, and no content validator applies to these
+                continue
+
+            if not is_key:
+                for validator in self._content_validators:
+                    validator(obj, False)
+
+            if not dumper.ignore_aliases(obj):
+                obj_id = id(obj)
+                if obj_id in anchors:
+                    # Like the yaml serializer, anchors are numbered in
+                    # the order in which repeated objects are found.
+                    if anchors[obj_id] is None:
+                        last_anchor_id += 1
+                        anchors[obj_id] = _ANCHOR_TEMPLATE % last_anchor_id
+                    continue
+                anchors[obj_id] = None
+
+            if self._is_container(obj):
+                stack.extend(reversed(self._children(obj)))
+            elif not self._is_representable(type(obj)):
+                msg = f"cannot represent an object: {obj!r}"
+                raise yaml.representer.RepresenterError(msg, obj)
+
+        self._anchors = {obj_id: anchor for obj_id, anchor in anchors.items() if anchor is not None}
+
+    def emit(self, tree, version=None, tags=None):
+        """
+        Emit the tree as a single explicit YAML document.
+        """
+        dumper = self._dumper
+        dumper.open()
+        dumper.emit(yaml.DocumentStartEvent(explicit=True, version=version, tags=tags))
+        self._emit(tree)
+        dumper.emit(yaml.DocumentEndEvent(explicit=True))
+        dumper.close()
+
+    def _represent_child(self, obj):
+        # Represent scalars (and any type without a fast path) up front
+        # so the parent can choose its flow style like represent_mapping
+        # and represent_sequence do.  Containers are emitted later.
+        if self._is_container(obj) or type(obj) is tagged._InlineNumericArray:
+            return None
+        return self._dumper.represent_data(obj)
+
+    @staticmethod
+    def _is_plain(node):
+        return isinstance(node, yaml.ScalarNode) and not node.style
+
+    def _emit(self, obj, node=None):
+        dumper = self._dumper
+
+        anchor = self._anchors.get(id(obj))
+        if anchor is not None:
+            if id(obj) in self._emitted:
+                dumper.emit(yaml.AliasEvent(anchor))
+                return
+            self._emitted.add(id(obj))
+
+        typ = type(obj)
+        if node is not None:
+            self._emit_node(node, anchor)
+        elif typ is tagged.TaggedDict or typ is dict:
+            if typ is tagged.TaggedDict:
+                tag = obj._tag
+                flow_style = _flow_style_map.get(obj.flow_style, None)
+            else:
+                tag = _MAPPING_TAG
+                flow_style = None
+            items = self._mapping_items(obj)
+            nodes = [(self._represent_child(key), self._represent_child(value)) for key, value in items]
+            if flow_style is None:
+                flow_style = all(self._is_plain(key) and self._is_plain(value) for key, value in nodes)
+            dumper.emit(yaml.MappingStartEvent(anchor, tag, tag == _MAPPING_TAG, flow_style=flow_style))
+            for (key, value), (key_node, value_node) in zip(items, nodes):
+                self._emit(key, key_node)
+                self._emit(value, value_node)
+            dumper.emit(yaml.MappingEndEvent())
+        elif typ is tagged.TaggedList or typ is list or typ is tuple:
+            if typ is tagged.TaggedList:
+                tag = obj._tag
+                flow_style = _flow_style_map.get(obj.flow_style, None)
+            else:
+                tag = _SEQUENCE_TAG
+                flow_style = None
+            nodes = [self._represent_child(item) for item in obj]
+            if flow_style is None:
+                flow_style = all(self._is_plain(item) for item in nodes)
+            dumper.emit(yaml.SequenceStartEvent(anchor, tag, tag == _SEQUENCE_TAG, flow_style=flow_style))
+            for item, item_node in zip(obj, nodes):
+                self._emit(item, item_node)
+            dumper.emit(yaml.SequenceEndEvent())
+        elif typ is OrderedDict:
+            # See represent_ordered_mapping
+            dumper.emit(yaml.SequenceStartEvent(anchor, YAML_OMAP_TAG, False, flow_style=dumper.default_flow_style))
+            for key, value in obj.items():
+                dumper.emit(yaml.MappingStartEvent(None, YAML_OMAP_TAG, False, flow_style=False))
+                self._emit(key, self._represent_child(key))
+                self._emit(value, self._represent_child(value))
+                dumper.emit(yaml.MappingEndEvent())
+            dumper.emit(yaml.SequenceEndEvent())
+        elif typ is tagged._InlineNumericArray:
+            self._emit_inline_array(obj, anchor)
+        else:
+            self._emit_node(dumper.represent_data(obj), anchor)
+
+    def _emit_inline_array(self, obj, anchor=None):
+        """
+        Emit inline ndarray data as the nested sequences that
+        represent_list would produce for ``obj.tolist()``, formatting
+        all values at once.
+        """
+        dumper = self._dumper
+        values, tag = _format_inline_array(obj.array)
+        # Rows of scalars are written in flow style, everything
+        # above them in block style (unless the schema says otherwise).
+        flow_style = _flow_style_map.get(obj.flow_style, None)
+        if flow_style is None:
+            flow_style = values.ndim == 1
+        implicit = (True, False)
+
+        def emit_rows(rows, anchor=None, flow_style=False):
+            dumper.emit(yaml.SequenceStartEvent(anchor, _SEQUENCE_TAG, True, flow_style=flow_style))
+            if rows.ndim == 1:
+                for value in rows.tolist():
+                    dumper.emit(yaml.ScalarEvent(None, tag, implicit, value))
+            else:
+                for row in rows:
+                    emit_rows(row, flow_style=row.ndim == 1)
+            dumper.emit(yaml.SequenceEndEvent())
+
+        emit_rows(values, anchor, flow_style)
+
+    def _emit_node(self, node, anchor=None):
+        """
+        Emit a node returned by the representer, mirroring
+        ``yaml.serializer.Serializer.serialize_node``.
+        """
+        dumper = self._dumper
+        if isinstance(node, yaml.ScalarNode):
+            detected_tag = dumper.resolve(yaml.ScalarNode, node.value, (True, False))
+            default_tag = dumper.resolve(yaml.ScalarNode, node.value, (False, True))
+            implicit = (node.tag == detected_tag), (node.tag == default_tag)
+            dumper.emit(yaml.ScalarEvent(anchor, node.tag, implicit, node.value, style=node.style))
+        elif isinstance(node, yaml.SequenceNode):
+            implicit = node.tag == dumper.resolve(yaml.SequenceNode, node.value, True)
+            dumper.emit(yaml.SequenceStartEvent(anchor, node.tag, implicit, flow_style=node.flow_style))
+            for item in node.value:
+                self._emit_node(item)
+            dumper.emit(yaml.SequenceEndEvent())
+        elif isinstance(node, yaml.MappingNode):
+            implicit = node.tag == dumper.resolve(yaml.MappingNode, node.value, True)
+            dumper.emit(yaml.MappingStartEvent(anchor, node.tag, implicit, flow_style=node.flow_style))
+            for key, value in node.value:
+                self._emit_node(key)
+                self._emit_node(value)
+            dumper.emit(yaml.MappingEndEvent())
 
 
 class _IgnoreCustomTagsLoader(_yaml_base_loader):
@@ -243,6 +531,100 @@ AsdfLoader.add_constructor(None, AsdfLoader.construct_undefined)
 AsdfLoader.add_constructor(YAML_TAG_PREFIX + "omap", AsdfLoader.construct_yaml_omap)
 
 
+_NDARRAY_TAG_PREFIX = STSCI_SCHEMA_TAG_BASE + "/core/ndarray-"
+# Subsets of the YAML 1.1 int and float forms that numpy parses to the
+# same value as the yaml constructors (no '_', no base 60, octal or hex).
+_INLINE_INT_PATTERN = re.compile(r"[-+]?(?:0|[1-9][0-9]*)")
+_INLINE_FLOAT_PATTERN = re.compile(
+    r"[-+]?(?:[0-9]+\.[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?|[-+]?\.(?:inf|Inf|INF)|\.(?:nan|NaN|NAN)"
+)
+
+
+def _parse_inline_array(node):
+    """
+    Parse a sequence node of (nested) sequences of plain booleans,
+    integers or floats into an array in one go.
+
+    Returns `None` if the node is ragged, empty, contains anything
+    else or contains values that numpy might parse differently than
+    the yaml constructors.
+    """
+    shape = []
+    rows = [node]
+    while isinstance(rows[0], yaml.SequenceNode):
+        length = len(rows[0].value)
+        if length == 0 or any(not isinstance(row, yaml.SequenceNode) or len(row.value) != length for row in rows):
+            return None
+        shape.append(length)
+        rows = [item for row in rows for item in row.value]
+
+    if any(not isinstance(item, yaml.ScalarNode) for item in rows):
+        return None
+
+    tag = rows[0].tag
+    if any(item.tag != tag for item in rows):
+        return None
+
+    values = [item.value for item in rows]
+    if tag == _BOOL_TAG:
+        values = np.char.lower(np.array(values))
+        bool_values = yaml.constructor.SafeConstructor.bool_values
+        if not np.isin(values, list(bool_values)).all():
+            return None
+        array = np.isin(values, [value for value, flag in bool_values.items() if flag])
+    elif tag == _INT_TAG:
+        if not all(_INLINE_INT_PATTERN.fullmatch(value) for value in values):
+            return None
+        values = np.array(values)
+        try:
+            array = values.astype(np.int64)
+        except OverflowError:
+            if any(value.startswith("-") for value in values.tolist()):
+                return None
+            try:
+                array = values.astype(np.uint64)
+            except OverflowError:
+                return None
+    elif tag == _FLOAT_TAG:
+        if not all(_INLINE_FLOAT_PATTERN.fullmatch(value) for value in values):
+            return None
+        values = np.char.replace(np.char.lower(np.array(values)), ".inf", "inf")
+        array = np.char.replace(values, ".nan", "nan").astype(np.float64)
+    else:
+        return None
+
+    return array.reshape(shape)
+
+
+class _AsdfTreeLoader(AsdfLoader):
+    """
+    The loader used by `load_tree`, which parses inline ndarray data
+    of plain numbers in bulk into an
+    `asdf.tagged._InlineNumericArray` and marks tagged nodes that are
+    referenced more than once.
+    """
+
+    def construct_object(self, node, deep=False):
+        obj = self.constructed_objects.get(node)
+        if isinstance(obj, tagged.Tagged):
+            # an alias to a node that was already constructed
+            obj._aliased = True
+        return super().construct_object(node, deep=deep)
+
+    def _construct_tagged_mapping(self, node):
+        if node.tag.startswith(_NDARRAY_TAG_PREFIX):
+            for key_node, value_node in node.value:
+                if (
+                    isinstance(key_node, yaml.ScalarNode)
+                    and key_node.value == "data"
+                    and isinstance(value_node, yaml.SequenceNode)
+                    and value_node not in self.constructed_objects
+                    and (array := _parse_inline_array(value_node)) is not None
+                ):
+                    self.constructed_objects[value_node] = tagged._InlineNumericArray(array)
+        return super()._construct_tagged_mapping(node)
+
+
 def custom_tree_to_tagged_tree(tree, ctx, _serialization_context=None) -> Tagged:
     """
     Convert a tree, possibly containing custom data types that aren't
@@ -396,7 +778,7 @@ def load_tree(stream: Reader) -> TaggedDict[TreeKey, Any]:
     """
     # The following call to yaml.load is safe because we're
     # using a loader that inherits from pyyaml's SafeLoader.
-    return yaml.load(stream, Loader=AsdfLoader)  # noqa: S506
+    return yaml.load(stream, Loader=_AsdfTreeLoader)  # noqa: S506
 
 
 def dump_tree(tree, fd, ctx, tree_finalizer=None, _serialization_context=None):
@@ -432,7 +814,8 @@ def dump_tree(tree, fd, ctx, tree_finalizer=None, _serialization_context=None):
     tree = custom_tree_to_tagged_tree(tree, ctx, _serialization_context=_serialization_context)
     if tree_finalizer is not None:
         tree_finalizer(tree)
-    schema.validate(tree, ctx)
+    # The per-node content checks are applied by the emitter's scan
+    schema.validate(tree, ctx, _validate_contents=False)
 
     # add yaml %TAG definitions from extensions
     if _serialization_context:
@@ -441,18 +824,19 @@ def dump_tree(tree, fd, ctx, tree_finalizer=None, _serialization_context=None):
                 if key not in tags:
                     tags[key] = val
 
+    dumper = AsdfDumper(
+        fd,
+        explicit_start=True,
+        explicit_end=True,
+        version=_YAML_VERSION,
+        allow_unicode=True,
+        encoding="utf-8",
+        tags=tags,
+    )
     try:
-        yaml.dump_all(
-            [tree],
-            stream=fd,
-            Dumper=AsdfDumper,
-            explicit_start=True,
-            explicit_end=True,
-            version=_YAML_VERSION,
-            allow_unicode=True,
-            encoding="utf-8",
-            tags=tags,
-        )
+        emitter = _TreeEmitter(dumper, schema._get_content_validators(ctx))
+        emitter.scan(tree)
+        emitter.emit(tree, version=_YAML_VERSION, tags=tags)
     except yaml.representer.RepresenterError as err:
         if len(err.args) < 2:
             raise err
@@ -464,3 +848,5 @@ def dump_tree(tree, fd, ctx, tree_finalizer=None, _serialization_context=None):
             "a Converter for this type to allow the tree to be serialized."
         )
         raise AsdfSerializationError(msg, obj) from err
+    finally:
+        dumper.dispose()
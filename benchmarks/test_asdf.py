@@ -36,3 +36,16 @@ def test_dump(tree, benchmark):
 
 def test_load(tree_bytes, benchmark):
     benchmark(asdf.loads, tree_bytes)
+
+
+def test_dump_inline(tree, benchmark):
+    benchmark(asdf.dumps, tree, all_array_storage="inline")
+
+
+def test_load_inline(tree, benchmark):
+    tree_bytes = asdf.dumps(tree, all_array_storage="inline")
+    benchmark(asdf.loads, tree_bytes)
+
+
+def test_info(asdf_file, benchmark, capsys):
+    benchmark(asdf_file.info)
@@ -0,0 +1,26 @@
+import io
+
+import numpy as np
+import pytest
+
+import asdf
+
+
+@pytest.fixture(params=[1_000, 10_000, 100_000], ids=lambda n: f"{n}_arrays")
+def many_arrays_tree(request):
+    return {f"a{i}": np.full(3, i) for i in range(request.param)}
+
+
+@pytest.fixture
+def many_arrays_bytes(many_arrays_tree):
+    return asdf.dumps(many_arrays_tree)
+
+
+def test_write_to_many_arrays(many_arrays_tree, benchmark):
+    af = asdf.AsdfFile(many_arrays_tree)
+    benchmark(af.write_to, io.BytesIO())
+
+
+def test_update_many_arrays(many_arrays_bytes, benchmark):
+    af = asdf.open(io.BytesIO(many_arrays_bytes), mode="rw")
+    benchmark(af.update)
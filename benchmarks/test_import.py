@@ -0,0 +1,27 @@
+import subprocess
+import sys
+
+# Upper limit, in microseconds, on the time spent importing asdf (as
+# reported by "python -X importtime") excluding interpreter startup.
+IMPORT_TIME_BUDGET = 50_000
+
+
+def _import_time():
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import asdf"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    # The last line reports the cumulative time for the top-level package:
+    # "import time:  self [us] | cumulative | asdf"
+    return int(result.stderr.splitlines()[-1].split("|")[1])
+
+
+def test_import(benchmark):
+    benchmark(subprocess.run, [sys.executable, "-c", "import asdf"], check=True)
+
+
+def test_import_time_budget():
+    import_time = min(_import_time() for _ in range(5))
+    assert import_time < IMPORT_TIME_BUDGET, f"import asdf took {import_time} us"
@@ -0,0 +1,11 @@
+import pytest
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+def test_search(asdf_file, benchmark, use_index):
+    asdf_file.search(use_index=use_index)
+
+    def search():
+        return asdf_file.search("a", use_index=use_index).search(type_=int).paths
+
+    benchmark(search)
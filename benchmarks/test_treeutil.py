@@ -3,3 +3,7 @@ import asdf
 
 def test_walk(tree, benchmark):
     benchmark(asdf.treeutil.walk, tree, lambda x: None)
+
+
+def test_walk_and_modify(tree, benchmark):
+    benchmark(asdf.treeutil.walk_and_modify, tree, lambda x: x)
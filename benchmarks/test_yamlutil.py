@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 import asdf
@@ -19,3 +21,10 @@ def test_custom_tree_to_tagged_tree(tree, ctx_asdf_file, benchmark):
 
 def test_tagged_tree_to_tagged_tree(tagged_tree, ctx_asdf_file, benchmark):
     benchmark(asdf.yamlutil.tagged_tree_to_custom_tree, tagged_tree, ctx_asdf_file)
+
+
+def test_dump_tree(tree, ctx_asdf_file, benchmark):
+    def dump_tree():
+        asdf.yamlutil.dump_tree(asdf.tags.core.AsdfObject(tree), io.BytesIO(), ctx_asdf_file)
+
+    benchmark(dump_tree)